@@ -0,0 +1,13 @@
+"""
+benchmarks for find-kedro, run each one as a module from the repository root
+
+``` console
+python -m benchmarks.suite --output baseline.json
+python -m benchmarks.bench_jobs
+python -m benchmarks.bench_metadata
+```
+
+`suite` times every discovery phase over synthetic projects made by
+`synthetic.make_project` and compares the results against a saved baseline.
+`bench_metadata` compares the memory pipelines hold with that of a `NodeTable`.
+"""
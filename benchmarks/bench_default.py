@@ -0,0 +1,74 @@
+"""
+bench_default
+
+Times `_generate_pipelines` against the previous `__default__` assembly, which
+flattened every module pipeline's nodes into a set, as the number of nodes
+grows from 1k to 100k.
+
+``` console
+python -m benchmarks.bench_default --sizes 1000 10000 100000
+```
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from kedro.pipeline import Pipeline, node
+from kedro.pipeline.node import Node
+
+from find_kedro.core import _generate_pipelines
+from find_kedro.discovery import _flatten
+
+
+def passthrough(x: int) -> int:
+    return x
+
+
+def make_nodes(total: int, nodes_per_module: int = 100) -> Dict[str, List[Node]]:
+    """chains of nodes grouped into modules, with every module sharing one node"""
+    shared = node(passthrough, "shared_in", "shared_out", name="shared")
+    modules: Dict[str, List[Node]] = {}
+    for index in range(total):
+        module = f"module_{index // nodes_per_module}"
+        modules.setdefault(module, [shared]).append(
+            node(passthrough, f"d{index}", f"d{index}_out", name=f"n{index}")
+        )
+    return modules
+
+
+def previous_generate_pipelines(nodes: Dict[str, List[Node]]) -> Dict[str, Pipeline]:
+    pipelines = {key: Pipeline(value) for key, value in nodes.items()}
+    pipelines["__default__"] = Pipeline(
+        set(_flatten([p.nodes for p in pipelines.values()]))
+    )
+    return pipelines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'previous':>10} {'current':>10} {'speedup':>8}")
+    for size in args.sizes:
+        nodes = make_nodes(size)
+
+        start = time.perf_counter()
+        previous = previous_generate_pipelines(nodes)
+        previous_nodes = previous["__default__"].nodes
+        previous_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        current = _generate_pipelines(nodes)
+        current_nodes = current["__default__"].nodes
+        current_time = time.perf_counter() - start
+
+        assert set(previous_nodes) == set(current_nodes)
+        print(
+            f"{size:>8} {previous_time:>9.2f}s {current_time:>9.2f}s "
+            f"{previous_time / current_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
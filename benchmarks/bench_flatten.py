@@ -0,0 +1,73 @@
+"""
+bench_flatten
+
+Times `_flatten` against the previous recursive flattener on the shapes
+matched variables usually take: a flat list of nodes, lists nested a few
+levels deep, and a module level dict with many items.  Both descend into any
+iterable that is not a string.
+
+``` console
+python -m benchmarks.bench_flatten --size 100000
+```
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, Generator, Iterable
+
+from kedro.pipeline import Pipeline, node
+
+from find_kedro.discovery import _flatten
+
+
+def passthrough(x: int) -> int:
+    return x
+
+
+def previous_flatten(items: Iterable) -> Generator:
+    for x in items:
+        if isinstance(x, Iterable) and not isinstance(x, (str, bytes)):
+            for sub_x in previous_flatten(x):
+                yield sub_x
+        else:
+            yield x
+
+
+def make_shapes(size: int) -> Dict[str, Any]:
+    nodes = [
+        node(passthrough, f"d{index}", f"d{index}_out", name=f"n{index}")
+        for index in range(size)
+    ]
+    nested: Any = nodes
+    for depth in range(5):
+        nested = [nested[: len(nested) // 2], Pipeline([]), nested[len(nested) // 2 :]]
+    return {
+        "flat list": [nodes],
+        "nested lists": [nested],
+        "dict": [{f"key{index}": index for index in range(size)}],
+    }
+
+
+def timed(flatten: Callable[[Iterable], Generator], items: Any) -> float:
+    start = time.perf_counter()
+    for _ in flatten(items):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'shape':>14} {'previous':>10} {'current':>10} {'speedup':>8}")
+    for shape, items in make_shapes(args.size).items():
+        previous_time = timed(previous_flatten, items)
+        current_time = timed(_flatten, items)
+        print(
+            f"{shape:>14} {previous_time:>9.3f}s {current_time:>9.3f}s "
+            f"{previous_time / current_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+bench_jobs
+
+Compares serial discovery against `find_kedro(jobs=N)` on a synthetic
+500 module project where every module spends some time importing.
+
+``` console
+python -m benchmarks.bench_jobs --modules 500 --import-cost 0.01 --jobs 8
+```
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Mapping, Tuple
+
+from benchmarks.synthetic import make_project
+from find_kedro import find_kedro
+
+
+def summarize(pipelines: Mapping) -> Dict[str, List[Tuple]]:
+    return {
+        key: [(n.name, n.inputs, n.outputs) for n in pipeline.nodes]
+        for key, pipeline in pipelines.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=500)
+    parser.add_argument("--nodes-per-module", type=int, default=5)
+    parser.add_argument("--import-cost", type=float, default=0.01)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        make_project(
+            directory,
+            modules=args.modules,
+            nodes_per_module=args.nodes_per_module,
+            import_cost=args.import_cost,
+        )
+        pipelines_directory = os.path.join(directory, "pipelines")
+
+        start = time.perf_counter()
+        serial = find_kedro(directory=pipelines_directory)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = find_kedro(directory=pipelines_directory, jobs=args.jobs)
+        parallel_time = time.perf_counter() - start
+
+    assert summarize(serial) == summarize(parallel), "parallel output differs"
+    print(f"modules:  {args.modules}")
+    print(f"serial:   {serial_time:.2f}s")
+    print(f"jobs={args.jobs}:  {parallel_time:.2f}s")
+    print(f"speedup:  {serial_time / parallel_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
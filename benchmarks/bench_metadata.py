@@ -0,0 +1,81 @@
+"""
+bench_metadata
+
+Compares the memory held by the pipelines `find_kedro` returns with that held
+by the `NodeTable` from `find_kedro_metadata` for the same synthetic project,
+along with the size of each once pickled.
+
+Pipelines keep their nodes, functions, and through them the modules they came
+from alive, while the table only keeps strings and numbers.  Both are measured
+once discovery has dropped the project's modules from `sys.modules`.
+
+``` console
+python -m benchmarks.bench_metadata --modules 2000 --nodes-per-module 50
+```
+"""
+import argparse
+import gc
+import pickle
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Tuple
+
+from benchmarks.synthetic import make_project
+from find_kedro import find_kedro
+from find_kedro.metadata import find_kedro_metadata
+
+
+def retained(discover: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    runs discover and measures the memory its result holds once discovery ends
+
+    Returns
+        tuple -- the result and the traced bytes it keeps alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        result = discover()
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, end - start
+
+
+def pickled_size(value: Any) -> str:
+    try:
+        return f"{len(pickle.dumps(value)) / 1e6:.1f}MB"
+    except Exception as error:  # pipelines of lambdas can not be pickled
+        return type(error).__name__
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--nodes-per-module", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as project:
+        make_project(
+            project, modules=args.modules, nodes_per_module=args.nodes_per_module
+        )
+        directory = Path(project) / "pipelines"
+        pipelines, pipelines_bytes = retained(lambda: find_kedro(directory=directory))
+        table, table_bytes = retained(lambda: find_kedro_metadata(directory=directory))
+
+    print(f"{len(table)} nodes in {len(table.modules)} modules")
+    print(f"{'result':>10} {'retained':>10} {'pickled':>10}")
+    print(
+        f"{'pipelines':>10} {pipelines_bytes / 1e6:>8.1f}MB {pickled_size(pipelines):>10}"
+    )
+    print(f"{'table':>10} {table_bytes / 1e6:>8.1f}MB {pickled_size(table):>10}")
+    print(f"{'ratio':>10} {pipelines_bytes / max(table_bytes, 1):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
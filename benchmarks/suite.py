@@ -0,0 +1,263 @@
+"""
+suite
+
+Runs find-kedro's discovery phase by phase over a set of synthetic projects
+and writes the results as json, optionally comparing them against a baseline
+from an earlier run.
+
+Each phase is timed separately, keeping the best of several repeats: walking
+the tree for files, the ast prefilter, importing modules, discovering their
+nodes, and generating pipelines.  Peak memory of each phase is measured with
+`tracemalloc` in one extra run, so tracing does not slow the timed repeats.
+
+``` console
+python -m benchmarks.suite --output baseline.json
+python -m benchmarks.suite --baseline baseline.json --output current.json
+python -m benchmarks.suite --scenario heavy --modules 1000 --repeat 5
+```
+
+Comparing against a baseline exits with status 1 when any phase is slower than
+the baseline by more than `--threshold`, ignoring differences of a few
+milliseconds.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import find_kedro
+from benchmarks.synthetic import expected_nodes, make_project
+from find_kedro import core, discovery
+from find_kedro.prefilter import prefilter_files
+
+PHASES = ("walk", "prefilter", "import", "discovery", "generation")
+
+PATTERNS: core.raw_pattern_type = ["*node*", "*pipeline*"]
+
+# phases this many seconds slower or less are never reported as regressions
+NOISE_SECONDS = 0.005
+
+# keyword arguments for `make_project`
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "list": {"modules": 200, "nodes_per_module": 5, "shape": "list"},
+    "node": {"modules": 200, "nodes_per_module": 5, "shape": "node"},
+    "pipeline": {"modules": 200, "nodes_per_module": 5, "shape": "pipeline"},
+    "create_pipeline": {
+        "modules": 200,
+        "nodes_per_module": 5,
+        "shape": "create_pipeline",
+    },
+    "wide": {"modules": 20, "nodes_per_module": 500, "fan_in": 3, "fan_out": 3},
+    "deep": {"modules": 200, "nodes_per_module": 5, "depth": 8},
+    "heavy": {"modules": 100, "nodes_per_module": 5, "import_cost": 0.005},
+}
+
+
+def run_phases(
+    directory: Path, phase: Optional[Callable[[str], Any]] = None
+) -> Dict[str, Any]:
+    """
+    discovers pipelines under directory the way `find_kedro` does serially
+
+    Arguments
+        directory {Path} -- directory holding the pipeline modules
+        phase {callable} -- context manager factory wrapping each phase by name
+
+    Returns
+        dict -- pipelines keyed by module key
+    """
+    phase = phase or (lambda name: nullcontext())
+    file_patterns = discovery._cleanse_inputs(PATTERNS)
+    patterns = discovery._cleanse_inputs(PATTERNS, is_file_pattern_type=False)
+    with phase("walk"):
+        files = core._discover_files(directory, file_patterns)
+    with phase("prefilter"):
+        files, _ = prefilter_files(files, patterns)
+    keyed_files = {discovery._module_key(file, directory): file for file in files}
+    with phase("import"):
+        modules = {
+            key: discovery._import(path, directory) for key, path in keyed_files.items()
+        }
+    with phase("discovery"):
+        nodes = {}
+        for key, module in modules.items():
+            module_nodes = discovery._discover_nodes(module, patterns)
+            if module_nodes != []:
+                nodes[key] = module_nodes
+    with phase("generation"):
+        pipelines = core._generate_pipelines(nodes)
+    return pipelines
+
+
+def run_scenario(config: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    generates a project for config and benchmarks discovering it
+
+    Returns
+        dict -- best wall time and peak memory of every phase
+    """
+    with tempfile.TemporaryDirectory() as project:
+        make_project(project, **config)
+        directory = Path(project) / "pipelines"
+        sys.path.append(str(directory))
+        try:
+            timings: Dict[str, List[float]] = {name: [] for name in PHASES}
+            for _ in range(repeat):
+                pipelines = run_phases(directory, _Timer(timings))
+            peaks: Dict[str, int] = {}
+            tracemalloc.start()
+            try:
+                run_phases(directory, _PeakMemory(peaks))
+            finally:
+                tracemalloc.stop()
+        finally:
+            sys.path.remove(str(directory))
+
+    found = len(pipelines["__default__"].nodes)
+    expected = expected_nodes(config["modules"], config["nodes_per_module"])
+    assert found == expected, f"found {found} nodes, expected {expected}"
+    wall = {name: min(times) for name, times in timings.items()}
+    return {
+        "config": config,
+        "nodes": found,
+        "wall": {**wall, "total": sum(wall.values())},
+        "peak_memory": peaks,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    prints the change in wall time of every phase against a baseline
+
+    Returns
+        list -- "scenario.phase" of every phase slower than threshold allows
+    """
+    regressions = []
+    print(
+        f"\n{'scenario':>16} {'phase':>10} {'baseline':>10} {'current':>10} {'change':>8}"
+    )
+    for scenario, result in results["scenarios"].items():
+        if scenario not in baseline.get("scenarios", {}):
+            continue
+        if baseline["scenarios"][scenario]["config"] != result["config"]:
+            print(f"{scenario:>16} skipped, the scenario changed since the baseline")
+            continue
+        before = baseline["scenarios"][scenario]["wall"]
+        for name, seconds in result["wall"].items():
+            if name not in before or before[name] <= 0:
+                continue
+            change = seconds / before[name] - 1
+            flag = ""
+            if change > threshold and seconds - before[name] > NOISE_SECONDS:
+                regressions.append(f"{scenario}.{name}")
+                flag = " slower"
+            print(
+                f"{scenario:>16} {name:>10} {before[name]:>9.3f}s {seconds:>9.3f}s "
+                f"{change:>+7.0%}{flag}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scenario", choices=list(SCENARIOS), action="append", dest="scenarios"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--modules", type=int, help="overrides every scenario")
+    parser.add_argument("--nodes-per-module", type=int, help="overrides every scenario")
+    parser.add_argument("--output", type=Path, help="file to write json results to")
+    parser.add_argument("--baseline", type=Path, help="json results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "find_kedro": find_kedro.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scenarios": {},
+    }
+    print(f"{'scenario':>16} {'nodes':>7} " + " ".join(f"{p:>10}" for p in PHASES))
+    for name in args.scenarios or list(SCENARIOS):
+        config = dict(SCENARIOS[name])
+        if args.modules is not None:
+            config["modules"] = args.modules
+        if args.nodes_per_module is not None:
+            config["nodes_per_module"] = args.nodes_per_module
+        result = run_scenario(config, args.repeat)
+        results["scenarios"][name] = result
+        print(
+            f"{name:>16} {result['nodes']:>7} "
+            + " ".join(f"{result['wall'][p]:>9.3f}s" for p in PHASES)
+        )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True))
+    if args.baseline is not None:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.threshold
+        )
+        if regressions:
+            print(f"\nslower than the baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+class _Timer:
+    """appends the wall time of each phase to timings"""
+
+    def __init__(self, timings: Dict[str, List[float]]) -> None:
+        self.timings = timings
+
+    def __call__(self, name: str) -> "_Timer":
+        self.name = name
+        return self
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.timings[self.name].append(time.perf_counter() - self.start)
+
+
+class _PeakMemory:
+    """
+    records the peak traced memory allocated during each phase, and the peak
+    of the whole run as total
+    """
+
+    def __init__(self, peaks: Dict[str, int]) -> None:
+        self.peaks = peaks
+        self.peaks["total"] = 0
+
+    def __call__(self, name: str) -> "_PeakMemory":
+        self.name = name
+        return self
+
+    def __enter__(self) -> None:
+        self.start, _ = tracemalloc.get_traced_memory()
+        # tracemalloc.reset_peak is only available from python 3.9
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.clear_traces()
+            self.start = 0
+
+    def __exit__(self, *exc: Any) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        self.peaks[self.name] = peak - self.start
+        self.peaks["total"] = max(self.peaks["total"], peak)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+synthetic
+
+Generates synthetic kedro projects for benchmarking find-kedro.
+
+Modules can hold their nodes in any of the shapes find-kedro discovers, sit
+several packages deep, connect nodes with several inputs and outputs, and
+spend cpu time on import to stand in for heavy dependencies.
+
+``` python
+from benchmarks.synthetic import make_project
+
+make_project("/tmp/project", modules=500, nodes_per_module=5, import_cost=0.01)
+make_project("/tmp/project", shape="create_pipeline", depth=3, fan_in=2, fan_out=3)
+```
+"""
+from pathlib import Path
+from typing import List, Union
+
+# ways a module can hold its nodes
+SHAPES = ("list", "node", "pipeline", "create_pipeline")
+
+MODULE_TEMPLATE = """\
+import time
+
+from kedro.pipeline import Pipeline, node
+
+# simulate a heavy module level import such as pandas or pyspark, counting cpu
+# time so that workers waiting on a busy cpu do not finish early
+_end = time.process_time() + {import_cost}
+while time.process_time() < _end:
+    pass
+
+
+def passthrough(*args):
+    return {returns}
+
+
+{nodes}
+"""
+
+SHAPE_TEMPLATES = {
+    "list": "nodes = [\n{nodes}\n]",
+    "node": "{nodes}",
+    "pipeline": "pipeline = Pipeline(\n    [\n{nodes}\n    ]\n)",
+    "create_pipeline": (
+        "def create_pipeline(**kwargs):\n    return Pipeline(\n        [\n{nodes}\n"
+        "        ]\n    )"
+    ),
+}
+
+NODE_TEMPLATE = "node(passthrough, {inputs}, {outputs}, name={name!r})"
+
+
+def make_project(
+    directory: Union[str, Path],
+    modules: int = 500,
+    nodes_per_module: int = 5,
+    import_cost: float = 0.0,
+    modules_per_package: int = 50,
+    depth: int = 1,
+    fan_in: int = 1,
+    fan_out: int = 1,
+    shape: str = "list",
+) -> Path:
+    """
+    writes a project of node modules under directory
+
+    Arguments
+        directory {Path} -- directory to write the project into
+        modules {int} -- number of node modules
+        nodes_per_module {int} -- number of chained nodes in each module
+        import_cost {float} -- seconds of cpu work each module does on import
+        modules_per_package {int} -- modules placed in each package directory
+        depth {int} -- number of nested directories each package is made of
+        fan_in {int} -- number of datasets each node reads
+        fan_out {int} -- number of datasets each node writes
+        shape {str} -- how modules hold their nodes, one of `SHAPES`
+
+    Returns
+        Path -- directory containing the project
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"shape must be one of {SHAPES}, got {shape!r}")
+    directory = Path(directory)
+    returns = "args[0]" if fan_out == 1 else f"[args[0]] * {fan_out}"
+    for module in range(modules):
+        package = directory / "pipelines" / f"package_{module // modules_per_package}"
+        for level in range(1, depth):
+            package = package / f"level_{level}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"nodes_{module}.py").write_text(
+            MODULE_TEMPLATE.format(
+                import_cost=import_cost,
+                returns=returns,
+                nodes=_module_nodes(module, nodes_per_module, fan_in, fan_out, shape),
+            )
+        )
+    return directory
+
+
+def expected_nodes(modules: int, nodes_per_module: int) -> int:
+    """number of nodes in `__default__` of a project made by `make_project`"""
+    return modules * nodes_per_module
+
+
+def _module_nodes(
+    module: int, nodes_per_module: int, fan_in: int, fan_out: int, shape: str
+) -> str:
+    nodes = []
+    for index in range(nodes_per_module):
+        definition = NODE_TEMPLATE.format(
+            inputs=_datasets(_inputs(module, index, fan_in, fan_out)),
+            outputs=_datasets(_outputs(module, index, fan_out)),
+            name=f"m{module}_n{index}",
+        )
+        if shape == "node":
+            nodes.append(f"node_{index} = {definition}")
+        elif shape == "create_pipeline":
+            nodes.append(f"            {definition},")
+        elif shape == "pipeline":
+            nodes.append(f"        {definition},")
+        else:
+            nodes.append(f"    {definition},")
+    return SHAPE_TEMPLATES[shape].format(nodes="\n".join(nodes))
+
+
+def _outputs(module: int, index: int, fan_out: int) -> List[str]:
+    return [f"m{module}_d{index}_{output}" for output in range(fan_out)]
+
+
+def _inputs(module: int, index: int, fan_in: int, fan_out: int) -> List[str]:
+    """reads outputs of the closest earlier nodes, or raw datasets before them"""
+    inputs = []
+    for position in range(fan_in):
+        upstream = index - 1 - position // fan_out
+        if upstream < 0:
+            inputs.append(f"m{module}_raw{index}_{position}")
+        else:
+            inputs.append(f"m{module}_d{upstream}_{position % fan_out}")
+    return inputs
+
+
+def _datasets(names: List[str]) -> str:
+    return repr(names[0]) if len(names) == 1 else repr(names)
@@ -1,4 +1,57 @@
+"""
+find-kedro
+
+Names are imported from their modules on first access, so importing the
+package, or running `find-kedro --version`, does not import kedro.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "0.1.1"
 
-__all__ = ["find_kedro"]
-from find_kedro.core import find_kedro
+__all__ = [
+    "find_kedro",
+    "find_kedro_async",
+    "find_kedro_fingerprints",
+    "find_kedro_metadata",
+    "invalidate_cache",
+    "iter_find_kedro",
+    "NodeTable",
+    "PipelineRegistry",
+    "Profile",
+]
+
+# public names and the modules they are imported from
+_LAZY_NAMES = {
+    "find_kedro": "find_kedro.core",
+    "find_kedro_async": "find_kedro.aio",
+    "find_kedro_fingerprints": "find_kedro.fingerprints",
+    "find_kedro_metadata": "find_kedro.metadata",
+    "invalidate_cache": "find_kedro.cache",
+    "iter_find_kedro": "find_kedro.stream",
+    "NodeTable": "find_kedro.metadata",
+    "PipelineRegistry": "find_kedro.registry",
+    "Profile": "find_kedro.profiling",
+}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from find_kedro.aio import find_kedro_async
+    from find_kedro.cache import invalidate_cache
+    from find_kedro.core import find_kedro
+    from find_kedro.fingerprints import find_kedro_fingerprints
+    from find_kedro.metadata import NodeTable, find_kedro_metadata
+    from find_kedro.profiling import Profile
+    from find_kedro.registry import PipelineRegistry
+    from find_kedro.stream import iter_find_kedro
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_NAMES])
@@ -0,0 +1,138 @@
+"""
+aio
+
+This module provides `find_kedro_async`, which discovers pipelines without
+blocking the asyncio event loop.
+
+The file walk and every module import run on an executor.  Pipelines are
+yielded as `(module_key, Pipeline)` in the order their modules finish
+importing, and `__default__` is yielded last, once every module has finished.
+Closing the iterator early, or cancelling the task iterating it, cancels the
+imports that have not started yet.
+
+``` python
+from find_kedro import find_kedro_async
+
+async def browse():
+    async for key, pipeline in find_kedro_async(directory="src"):
+        print(key, len(pipeline.nodes))
+```
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+from find_kedro import core, discovery
+from find_kedro.factories import FactoryCalls
+from find_kedro.filters import compile_path_filter
+from find_kedro.imports import ModuleRegistry
+
+
+async def find_kedro_async(
+    file_patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    directory: Union[str, Path] = ".",
+    verbose: bool = False,
+    cache_dir: Optional[Union[str, Path]] = None,
+    prefilter: bool = True,
+    include: Optional[discovery.raw_pattern_type] = None,
+    exclude: Optional[discovery.raw_pattern_type] = None,
+    jobs: int = 4,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Tuple[str, Pipeline]]:
+    """
+    yields the pipeline of each module as soon as the module is imported
+
+    Arguments
+        file_patterns {list} -- list of file globbing patterns
+        patterns {list} -- list of variable globbing patterns
+        directory {str} -- directory to look for pipeline modules in
+        verbose {bool} -- prints extra information
+        cache_dir {str} -- directory to cache file discovery results in
+        prefilter {bool} -- skip importing files without pattern matched names
+        include {list} -- path globs to include, see `find_kedro`
+        exclude {list} -- path globs to exclude, see `find_kedro`
+        jobs {int} -- number of modules imported at once, ignored when an
+            executor is given
+        executor {Executor} -- thread pool to walk and import on, a pool of
+            jobs threads is made and shut down when not given
+
+    Yields
+        tuple -- module key and pipeline of every module holding nodes, in
+            completion order, then `__default__`
+    """
+    directory = Path(directory)
+    cleansed_file_patterns = discovery._cleanse_inputs(file_patterns, verbose=verbose)
+    cleansed_patterns = discovery._cleanse_inputs(
+        patterns, verbose=verbose, is_file_pattern_type=False
+    )
+    owned = executor is None
+    pool = ThreadPoolExecutor(max_workers=jobs) if executor is None else executor
+    loop = asyncio.get_running_loop()
+    pending: Dict["asyncio.Future[Tuple[List[Node], Pipeline]]", str] = {}
+    modules = ModuleRegistry()
+    try:
+        keyed_files = await loop.run_in_executor(
+            pool,
+            partial(
+                core._find_module_files,
+                directory,
+                cleansed_file_patterns,
+                cleansed_patterns,
+                verbose=verbose,
+                cache_dir=cache_dir,
+                prefilter=prefilter,
+                path_filter=compile_path_filter(include, exclude),
+            ),
+        )
+        for key, path in keyed_files.items():
+            future = loop.run_in_executor(
+                pool,
+                _discover_module,
+                path,
+                directory,
+                cleansed_patterns,
+                verbose,
+                modules,
+            )
+            pending[future] = key
+        nodes: Dict[str, List[Node]] = {}
+        while pending:
+            done, _ = await asyncio.wait(
+                list(pending), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                key = pending.pop(future)
+                nodes[key], pipeline = future.result()
+                if nodes[key]:
+                    yield key, pipeline
+        yield "__default__", discovery._default_pipeline(
+            [nodes[key] for key in keyed_files]
+        )
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=False)
+        modules.release_all()
+
+
+def _discover_module(
+    path: Path,
+    directory: Path,
+    patterns: List[str],
+    verbose: bool,
+    modules: ModuleRegistry,
+) -> Tuple[List[Node], Pipeline]:
+    """imports a module, returning its nodes and their pipeline"""
+    module = discovery._import(path, directory, verbose=verbose, modules=modules)
+    nodes = discovery._discover_nodes(
+        module, patterns, verbose=verbose, factories=FactoryCalls()
+    )
+    discovery._vprint("imported module", verbose, path=str(path), nodes=len(nodes))
+    return nodes, Pipeline(nodes)
@@ -0,0 +1,360 @@
+"""
+budget
+
+This module keeps slow modules from stalling discovery.
+
+A soft budget, `find_kedro(import_budget=...)`, only measures: modules that
+take longer to import are listed in the profile's slow modules and logged, and
+can be left out of the pipelines with skip_slow.  A quarantine file records
+them so later runs do not import them again until their contents change.
+
+A hard timeout, `find_kedro(import_timeout=...)`, imports every module in a
+worker process that is killed when a module takes too long, so a module that
+hangs on a connection can not hang the whole run.  Nodes are rebuilt from the
+worker's descriptions the same way the process backend rebuilds them.
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(
+    import_budget=2, import_timeout=30, quarantine=".find-kedro-quarantine.json"
+)
+```
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+from find_kedro import parallel as _parallel
+from find_kedro.factories import FactoryCalls
+from find_kedro.profiling import Profile
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_VERSION = 1
+
+
+class Quarantine:
+    """
+    modules that were too slow to import, skipped until their contents change
+
+    Arguments
+        path {Path} -- json file the quarantine is kept in
+        directory {Path} -- directory quarantined paths are relative to
+    """
+
+    def __init__(self, path: Union[str, Path], directory: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.directory = Path(directory)
+        self.modules: Dict[str, Dict[str, Any]] = self._read()
+        self.changed = False
+
+    def entry(self, file: Path) -> Optional[Dict[str, Any]]:
+        """the quarantine entry of file, or None when it is not quarantined or
+        has changed since"""
+        entry = self.modules.get(self._relative(file))
+        try:
+            if entry is not None and entry["sha256"] == discovery._hash_file(file):
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def add(self, file: Path, import_time: float, timed_out: bool = False) -> None:
+        """quarantines file as it is now"""
+        self.modules[self._relative(file)] = {
+            "sha256": discovery._hash_file(file),
+            "import_time": import_time,
+            "timed_out": timed_out,
+        }
+        self.changed = True
+
+    def save(self) -> None:
+        """writes the quarantine atomically if anything was added"""
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": QUARANTINE_VERSION, "modules": self.modules},
+                indent=2,
+                sort_keys=True,
+            )
+        )
+        os.replace(str(tmp), str(self.path))
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            quarantine = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(quarantine, dict) or (
+            quarantine.get("version") != QUARANTINE_VERSION
+        ):
+            return {}
+        return dict(quarantine.get("modules", {}))
+
+    def _relative(self, file: Path) -> str:
+        return Path(os.path.relpath(file, self.directory)).as_posix()
+
+
+def skip_quarantined(
+    keyed_files: Dict[str, Path],
+    quarantine: Quarantine,
+    profile: Profile,
+    verbose: bool = False,
+) -> Dict[str, Path]:
+    """
+    leaves out quarantined files that have not changed, listing them as slow
+
+    Arguments
+        keyed_files {dict} -- files to import keyed by module key
+        quarantine {Quarantine} -- modules to leave out
+        profile {Profile} -- the skipped modules are added to its slow list
+        verbose {bool} -- prints extra information
+
+    Returns
+        dict -- keyed_files without the quarantined files
+    """
+    kept = {}
+    for key, path in keyed_files.items():
+        entry = quarantine.entry(path)
+        if entry is None:
+            kept[key] = path
+        else:
+            profile.slow.append(
+                _slow(key, path, entry["import_time"], entry["timed_out"], True, True)
+            )
+    discovery._vprint(
+        "skipped quarantined modules",
+        verbose,
+        skipped=[key for key in keyed_files if key not in kept],
+    )
+    return kept
+
+
+def check_budget(
+    nodes: Dict[str, List[Node]],
+    keyed_files: Dict[str, Path],
+    budget: float,
+    profile: Profile,
+    skip_slow: bool = False,
+    quarantine: Optional[Quarantine] = None,
+) -> Dict[str, List[Node]]:
+    """
+    lists modules whose import took longer than budget as slow
+
+    Arguments
+        nodes {dict} -- lists of nodes keyed by module key
+        keyed_files {dict} -- files that were imported keyed by module key
+        budget {float} -- seconds each module may take to import
+        profile {Profile} -- holds the import time of each module, slow
+            modules are added to its slow list
+        skip_slow {bool} -- leave the nodes of slow modules out
+        quarantine {Quarantine} -- slow modules are added to it
+
+    Returns
+        dict -- nodes, without those of slow modules when skip_slow
+    """
+    kept = dict(nodes)
+    # modules that timed out are already listed
+    listed = {module["module"] for module in profile.slow}
+    for key, path in keyed_files.items():
+        import_time = profile.modules.get(key, {}).get("import_time", 0.0)
+        if import_time <= budget or key in listed:
+            continue
+        logger.warning(
+            "module %s took %.2fs to import, over the %.2fs budget",
+            key,
+            import_time,
+            budget,
+        )
+        if quarantine is not None:
+            quarantine.add(path, import_time)
+        if skip_slow:
+            kept.pop(key, None)
+        profile.slow.append(
+            _slow(key, path, import_time, False, skip_slow, quarantine is not None)
+        )
+    return kept
+
+
+def discover_nodes_with_timeout(
+    keyed_files: Dict[str, Path],
+    directory: Path,
+    patterns: List[str],
+    timeout: float,
+    preload: Optional[List[str]] = None,
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    quarantine: Optional[Quarantine] = None,
+    factories: Optional[FactoryCalls] = None,
+) -> Dict[str, List[Node]]:
+    """
+    imports each module in a worker process that is killed after timeout
+
+    Modules that time out are left out, listed as slow, and quarantined.  The
+    worker is replaced after it is killed.
+
+    Arguments
+        keyed_files {dict} -- files to import keyed by module key
+        directory {Path} -- directory the modules are imported from
+        patterns {List[str]} -- cleansed variable patterns
+        timeout {float} -- seconds each module may take before it is killed
+        preload {List[str]} -- packages the forkserver imports once up front
+        verbose {bool} -- prints extra information
+        profile {Profile} -- records the import time of each module
+        quarantine {Quarantine} -- modules that timed out are added to it
+        factories {FactoryCalls} -- its kwargs are passed to create_pipeline
+            factories, which run in the worker
+
+    Returns
+        dict -- lists of nodes keyed by module key, in the order of keyed_files
+    """
+    profile = profile or Profile()
+    directory = Path(directory).resolve()
+    worker = _Worker(_parallel._get_context(preload))
+    nodes: Dict[str, List[Node]] = {}
+    factory_kwargs = {} if factories is None else factories.kwargs
+    try:
+        with profile.phase("import"):
+            for key, file in keyed_files.items():
+                path = str(Path(file).resolve())
+                task = (key, path, str(directory), list(patterns), factory_kwargs)
+                start = time.perf_counter()
+                result = worker.describe(task, timeout)
+                if result is None:
+                    elapsed = time.perf_counter() - start
+                    logger.warning(
+                        "module %s did not import within %.2fs, skipping it",
+                        key,
+                        timeout,
+                    )
+                    profile.record_module(key, file, import_time=elapsed)
+                    if quarantine is not None:
+                        quarantine.add(file, elapsed, timed_out=True)
+                    profile.slow.append(
+                        _slow(key, file, elapsed, True, True, quarantine is not None)
+                    )
+                    continue
+                _, descriptions, import_time = result
+                module = _parallel.DeferredModule(
+                    path, str(directory), patterns, factory_kwargs
+                )
+                module_nodes = [
+                    _parallel.rebuild_node(description, module)
+                    for description in descriptions
+                ]
+                profile.record_module(
+                    key, file, import_time=import_time, nodes=len(module_nodes)
+                )
+                if module_nodes != []:
+                    nodes[key] = module_nodes
+    finally:
+        worker.close()
+    discovery._vprint(
+        "nodes discovered with an import timeout", verbose, timeout=timeout
+    )
+    return nodes
+
+
+class _Worker:
+    """a worker process describing one module at a time, killed on timeout"""
+
+    def __init__(self, context: Any) -> None:
+        self.context = context
+        self.process: Any = None
+        self.connection: Any = None
+
+    def describe(
+        self, task: _parallel.module_task_type, timeout: float
+    ) -> Optional[_parallel.described_module_type]:
+        """
+        describes the module of task, or returns None when it timed out
+
+        Exceptions raised by the import are raised again here, and a worker
+        that exits or whose pipe breaks raises RuntimeError.
+        """
+        if self.process is None:
+            self._start()
+        try:
+            self.connection.send(task)
+            if not self.connection.poll(timeout):
+                self._kill()
+                return None
+            status, value = self.connection.recv()
+        except (EOFError, OSError):
+            self._kill()
+            raise RuntimeError(f"worker exited while importing {task[1]}")
+        if status == "error":
+            raise value
+        return value  # type: ignore
+
+    def close(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            else:
+                self.process.join(timeout=5)
+        self._kill()
+
+    def _start(self) -> None:
+        self.connection, child = self.context.Pipe()
+        self.process = self.context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def _kill(self) -> None:
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join()
+            self.connection.close()
+        self.process = None
+        self.connection = None
+
+
+def _serve(connection: Any) -> None:
+    """runs in the worker, describing modules until it is sent None"""
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        try:
+            connection.send(("ok", _parallel._describe_module(task)))
+        except BaseException as error:
+            try:
+                connection.send(("error", error))
+            except Exception:
+                connection.send(("error", RuntimeError(repr(error))))
+
+
+def _slow(
+    key: str,
+    file: Path,
+    import_time: float,
+    timed_out: bool,
+    skipped: bool,
+    quarantined: bool,
+) -> Dict[str, Any]:
+    """an entry of `Profile.slow`"""
+    return {
+        "module": key,
+        "file": str(file),
+        "import_time": import_time,
+        "timed_out": timed_out,
+        "skipped": skipped,
+        "quarantined": quarantined,
+    }
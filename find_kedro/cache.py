@@ -0,0 +1,174 @@
+"""
+cache
+
+This module provides an opt-in, on-disk cache of file discovery results.
+
+Each entry stores the files that `_discover_files` found along with the
+modification time of every directory that was walked.  Creating, deleting, or
+renaming a file changes its parent directory's mtime, so when every recorded
+directory still has the same mtime the walk can be skipped entirely.
+
+``` python
+from find_kedro import find_kedro, invalidate_cache
+
+pipelines = find_kedro(cache_dir=".find-kedro-cache")
+invalidate_cache(".find-kedro-cache")
+```
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+CACHE_VERSION = 1
+
+# directories modified this close to the walk may change again within the same
+# mtime tick, so results that depend on them are not written to the cache
+RACY_SECONDS = 2
+
+
+def _cache_key(
+    directory: Path,
+    patterns: List[str],
+    filters: Optional[Dict[str, List[str]]] = None,
+) -> str:
+    """stable key for a directory and the file patterns and filters used to walk it"""
+    key: List = [str(Path(directory).resolve()), list(patterns)]
+    if filters:
+        key.append(filters)
+    raw = json.dumps(key, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_file(
+    cache_dir: Union[str, Path],
+    directory: Path,
+    patterns: List[str],
+    filters: Optional[Dict[str, List[str]]] = None,
+) -> Path:
+    return Path(cache_dir) / f"{_cache_key(directory, patterns, filters)}.json"
+
+
+def load_discovered_files(
+    cache_dir: Union[str, Path],
+    directory: Path,
+    patterns: List[str],
+    filters: Optional[Dict[str, List[str]]] = None,
+    pruned: Optional[Counter] = None,
+) -> Optional[List[Path]]:
+    """
+    returns the cached files for directory, or None when there is no valid entry
+
+    Arguments
+        cache_dir {Path} -- directory the cache entries are stored in
+        directory {Path} -- directory that was walked
+        patterns {List[str]} -- cleansed file patterns used for the walk
+        filters {dict} -- include and exclude globs used for the walk
+        pruned {Counter} -- when given, updated with what the cached walk pruned
+
+    Returns
+        list -- files discovered by the cached walk, or None on a cache miss
+    """
+    try:
+        entry = json.loads(
+            _cache_file(cache_dir, directory, patterns, filters).read_text()
+        )
+        if entry.get("version") != CACHE_VERSION:
+            return None
+        for relative, mtime in entry["directories"].items():
+            if os.stat(Path(directory) / relative).st_mtime_ns != mtime:
+                return None
+        files = [Path(directory) / relative for relative in entry["files"]]
+        entry_pruned = Counter(entry.get("pruned", {}))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        # unreadable, malformed, or stale entries are all cache misses
+        return None
+    if pruned is not None:
+        pruned.update(entry_pruned)
+    return files
+
+
+def save_discovered_files(
+    cache_dir: Union[str, Path],
+    directory: Path,
+    patterns: List[str],
+    files: List[Path],
+    directory_mtimes: Dict[str, int],
+    walk_started: float,
+    filters: Optional[Dict[str, List[str]]] = None,
+    pruned: Optional[Counter] = None,
+) -> bool:
+    """
+    writes a cache entry for directory unless one of its directories is racy
+
+    Arguments
+        cache_dir {Path} -- directory the cache entries are stored in
+        directory {Path} -- directory that was walked
+        patterns {List[str]} -- cleansed file patterns used for the walk
+        files {List[Path]} -- files discovered by the walk
+        directory_mtimes {dict} -- `st_mtime_ns` of each walked directory,
+            keyed by its path relative to directory
+        walk_started {float} -- `time.time()` taken before the walk began
+        filters {dict} -- include and exclude globs used for the walk
+        pruned {Counter} -- directories and modules the walk pruned
+
+    Returns
+        bool -- True if the entry was written
+    """
+    racy_ns = int((walk_started - RACY_SECONDS) * 1e9)
+    if any(mtime >= racy_ns for mtime in directory_mtimes.values()):
+        return False
+    entry = {
+        "version": CACHE_VERSION,
+        "directory": str(Path(directory).resolve()),
+        "patterns": list(patterns),
+        "filters": filters,
+        "pruned": dict(pruned or {}),
+        "directories": directory_mtimes,
+        "files": [os.path.relpath(file, directory) for file in files],
+    }
+    cache_file = _cache_file(cache_dir, directory, patterns, filters)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(str(tmp), str(cache_file))
+    except OSError:
+        return False
+    return True
+
+
+def invalidate_cache(
+    cache_dir: Union[str, Path], directory: Optional[Union[str, Path]] = None
+) -> int:
+    """
+    removes cache entries from cache_dir
+
+    Arguments
+        cache_dir {Path} -- directory the cache entries are stored in
+        directory {Path} -- only remove entries for this directory, all entries
+            are removed when not given
+
+    Returns
+        int -- number of entries removed
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return 0
+    resolved = str(Path(directory).resolve()) if directory is not None else None
+    removed = 0
+    for cache_file in cache_dir.glob("*.json"):
+        if resolved is not None:
+            try:
+                if json.loads(cache_file.read_text()).get("directory") != resolved:
+                    continue
+            except (OSError, ValueError):
+                pass
+        try:
+            cache_file.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -4,7 +4,7 @@ cli
 This module provides a command line interface into find-kedro
 
 ```
-Usage: find-kedro [OPTIONS]
+Usage: find-kedro [OPTIONS] [COMMAND] [ARGS]...
 
 Options:
   --file-patterns TEXT       glob-style file patterns for Python node module
@@ -14,33 +14,91 @@ Options:
                              or list object discovery
 
   -d, --directory DIRECTORY  Path to save the static site to
+  --package TEXT             import pipeline modules from this installed
+                             package instead of walking directory
+
+  --include TEXT             only walk paths relative to directory that match
+                             these globs
+
+  --exclude TEXT             never walk or import paths relative to directory
+                             that match these globs
+
+  --cache-dir DIRECTORY      directory to cache file discovery results in
+  --no-cache                 bypass the file discovery cache
+  --no-prefilter             import every matched file, even when none of its
+                             names match patterns
+
+  -j, --jobs INTEGER         import modules with this many workers
+  --backend [process|thread] how workers import modules when jobs is set
+  --preload TEXT             packages for worker processes to import up front
+  -w, --watch                keep running and print pipelines again whenever
+                             a module is created, modified, or deleted
+
+  --manifest FILE            load pipelines from a manifest unless it is stale
+  --import-budget FLOAT      list modules taking longer than this many seconds
+                             to import as slow
+
+  --import-timeout FLOAT     kill and leave out modules taking longer than
+                             this many seconds to import
+
+  --skip-slow                leave modules over the import budget out of the
+                             pipelines
+
+  --quarantine FILE          skip slow modules found by earlier runs until
+                             they change
+
+  --format [json|ndjson|names|counts]
+                             how pipelines are printed, names prints a
+                             pipeline and node name per line, counts the
+                             number of nodes in each pipeline
+
+  --color / --no-color       highlight json output, by default only when
+                             printing to a terminal
+
+  --metadata                 print a record of each node's module, name,
+                             datasets, tags, and source location instead of
+                             pipelines
+
+  --fingerprints             print a stable hash of each pipeline's nodes and
+                             their functions instead of pipelines
+
+  --profile                  print the time spent in each phase and the
+                             slowest modules to stderr
+
+  --profile-format [text|json]
+                             format of the --profile report
+
   --version                  Prints version and exits
   -v, --verbose              Prints extra information for debugging
   --help                     Show this message and exit.
+
+Commands:
+  manifest  build discovery manifests for trees that never change once...
 ```
 
 """
+import json
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Mapping, Optional, Tuple
 
 import click
-from pygments import highlight
-from pygments.formatters import TerminalFormatter
-from pygments.lexers import JsonLexer
 
-from find_kedro.core import find_kedro
+# kedro and pygments are only imported once they are needed, keeping
+# --version and --help fast
+if TYPE_CHECKING:  # pragma: no cover
+    from kedro.pipeline import Pipeline
 
-__version__ = "0.1.1"
+    from find_kedro.metadata import NodeTable
+    from find_kedro.registry import Changes
 
+__version__ = "0.1.1"
 
-# @click.group(name="Find-Kedro")
-# def cli():
-# pass
+OUTPUT_FORMATS = ("json", "ndjson", "names", "counts")
 
 
-# @cli.command()
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--file-patterns",
     type=str,
@@ -62,6 +120,146 @@ __version__ = "0.1.1"
     type=click.Path(exists=False, file_okay=False),
     help="Path to save the static site to",
 )
+@click.option(
+    "--package",
+    default=None,
+    type=str,
+    help="import pipeline modules from this installed package instead of walking directory",
+)
+@click.option(
+    "--include",
+    type=str,
+    multiple=True,
+    help="only walk paths relative to directory that match these globs",
+)
+@click.option(
+    "--exclude",
+    type=str,
+    multiple=True,
+    help="never walk or import paths relative to directory that match these globs",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(exists=False, file_okay=False),
+    help="directory to cache file discovery results in",
+)
+@click.option(
+    "--no-cache",
+    default=False,
+    is_flag=True,
+    help="bypass the file discovery cache",
+)
+@click.option(
+    "--no-prefilter",
+    default=False,
+    is_flag=True,
+    help="import every matched file, even when none of its names match patterns",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=None,
+    type=int,
+    help="import modules with this many workers",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["process", "thread"]),
+    default="process",
+    help="how workers import modules when jobs is set",
+)
+@click.option(
+    "--preload",
+    type=str,
+    multiple=True,
+    help="packages for worker processes to import up front",
+)
+@click.option(
+    "--watch",
+    "-w",
+    default=False,
+    is_flag=True,
+    help=(
+        "keep running and print pipelines again whenever a module is created, "
+        "modified, or deleted"
+    ),
+)
+@click.option(
+    "--manifest",
+    default=None,
+    type=click.Path(exists=False, dir_okay=False),
+    help="load pipelines from a manifest unless it is stale",
+)
+@click.option(
+    "--import-budget",
+    default=None,
+    type=float,
+    help="list modules taking longer than this many seconds to import as slow",
+)
+@click.option(
+    "--import-timeout",
+    default=None,
+    type=float,
+    help="kill and leave out modules taking longer than this many seconds to import",
+)
+@click.option(
+    "--skip-slow",
+    default=False,
+    is_flag=True,
+    help="leave modules over the import budget out of the pipelines",
+)
+@click.option(
+    "--quarantine",
+    default=None,
+    type=click.Path(exists=False, dir_okay=False),
+    help="skip slow modules found by earlier runs until they change",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="json",
+    help=(
+        "how pipelines are printed, names prints a pipeline and node name per "
+        "line, counts the number of nodes in each pipeline"
+    ),
+)
+@click.option(
+    "--color/--no-color",
+    default=None,
+    help="highlight json output, by default only when printing to a terminal",
+)
+@click.option(
+    "--metadata",
+    default=False,
+    is_flag=True,
+    help=(
+        "print a record of each node's module, name, datasets, tags, and source "
+        "location instead of pipelines"
+    ),
+)
+@click.option(
+    "--fingerprints",
+    default=False,
+    is_flag=True,
+    help=(
+        "print a stable hash of each pipeline's nodes and their functions instead "
+        "of pipelines"
+    ),
+)
+@click.option(
+    "--profile",
+    default=False,
+    is_flag=True,
+    help="print the time spent in each phase and the slowest modules to stderr",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="format of the --profile report",
+)
 @click.option(
     "--verbose",
     "-v",
@@ -70,7 +268,37 @@ __version__ = "0.1.1"
     help="Prints extra information for debugging",
 )
 @click.version_option(__version__, "-V", "--version", help="Prints version and exits")
-def cli(file_patterns: str, patterns: str, directory: Path, verbose: bool) -> None:
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    file_patterns: str,
+    patterns: str,
+    directory: Path,
+    package: Optional[str],
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    cache_dir: Optional[str],
+    no_cache: bool,
+    no_prefilter: bool,
+    jobs: Optional[int],
+    backend: str,
+    preload: Tuple[str, ...],
+    watch: bool,
+    manifest: Optional[str],
+    import_budget: Optional[float],
+    import_timeout: Optional[float],
+    skip_slow: bool,
+    quarantine: Optional[str],
+    output_format: str,
+    color: Optional[bool],
+    metadata: bool,
+    fingerprints: bool,
+    profile: bool,
+    profile_format: str,
+    verbose: bool,
+) -> None:
+    if ctx.invoked_subcommand is not None:
+        return
     if verbose:
         click.echo("python version: {}".format(sys.version))
         click.echo("current directory: {}".format(os.getcwd()))
@@ -80,25 +308,350 @@ def cli(file_patterns: str, patterns: str, directory: Path, verbose: bool) -> No
         click.echo("file_patterns: {}".format(file_patterns))
         click.echo("patterns: {}".format(patterns))
         click.echo("directory: {}".format(directory))
+        click.echo("package: {}".format(package))
+        click.echo("include: {}".format(include))
+        click.echo("exclude: {}".format(exclude))
+        click.echo("cache_dir: {}".format(cache_dir))
+        click.echo("no_cache: {}".format(no_cache))
+        click.echo("no_prefilter: {}".format(no_prefilter))
+        click.echo("jobs: {}".format(jobs))
+        click.echo("backend: {}".format(backend))
+        click.echo("preload: {}".format(preload))
+        click.echo("watch: {}".format(watch))
+        click.echo("manifest: {}".format(manifest))
+        click.echo("import_budget: {}".format(import_budget))
+        click.echo("import_timeout: {}".format(import_timeout))
+        click.echo("skip_slow: {}".format(skip_slow))
+        click.echo("quarantine: {}".format(quarantine))
+        click.echo("format: {}".format(output_format))
+        click.echo("color: {}".format(color))
+        click.echo("metadata: {}".format(metadata))
+        click.echo("fingerprints: {}".format(fingerprints))
+        click.echo("profile: {}".format(profile))
+        click.echo("profile_format: {}".format(profile_format))
         click.echo("version: {}".format(__version__))
         click.echo("verbose: {}".format(verbose))
 
+    if metadata and fingerprints:
+        raise click.UsageError("--metadata and --fingerprints can not be combined")
+    if watch:
+        ignored = [
+            flag
+            for flag, value in [
+                ("--package", package),
+                ("--cache-dir", cache_dir),
+                ("--jobs", jobs),
+                ("--manifest", manifest),
+                ("--import-budget", import_budget),
+                ("--import-timeout", import_timeout),
+                ("--skip-slow", skip_slow),
+                ("--quarantine", quarantine),
+                ("--profile", profile),
+            ]
+            if value is not None and value is not False
+        ]
+        if ignored:
+            raise click.UsageError(
+                "--watch can not be combined with {}".format(", ".join(ignored))
+            )
+        _watch(
+            file_patterns,
+            patterns,
+            directory,
+            not no_prefilter,
+            verbose,
+            output_format,
+            color,
+            metadata,
+            include,
+            exclude,
+            fingerprints,
+        )
+        return
+
+    from find_kedro.core import find_kedro
+    from find_kedro.profiling import Profile
+
+    report = Profile()
     pipelines = find_kedro(
         file_patterns=file_patterns,
         patterns=patterns,
         directory=directory,
         verbose=verbose,
+        cache_dir=None if no_cache else cache_dir,
+        prefilter=not no_prefilter,
+        jobs=jobs,
+        backend=backend,
+        preload=list(preload),
+        profile=report,
+        manifest=manifest,
+        include=list(include),
+        exclude=list(exclude),
+        import_budget=import_budget,
+        import_timeout=import_timeout,
+        skip_slow=skip_slow,
+        quarantine=quarantine,
+        package=package,
     )
-    import json
+    _echo_pipelines(pipelines, output_format, color, metadata, fingerprints)
+    if profile:
+        click.echo(
+            report.to_json() if profile_format == "json" else report.format(),
+            err=True,
+        )
+
+
+@cli.group(name="manifest")
+def manifest_group() -> None:
+    """build discovery manifests for trees that never change once deployed"""
+
+
+@manifest_group.command(name="build")
+@click.option(
+    "--file-patterns",
+    type=str,
+    multiple=True,
+    default=["*node*", "*pipeline*"],
+    help="glob-style file patterns for Python node module discovery",
+)
+@click.option(
+    "--patterns",
+    type=str,
+    multiple=True,
+    default=["*node*", "*pipeline*"],
+    help="prefixes or glob names for Python pipeline, node, or list object discovery",
+)
+@click.option(
+    "--directory",
+    "-d",
+    default=".",
+    type=click.Path(exists=True, file_okay=False),
+    help="directory to look for pipeline modules in",
+)
+@click.option(
+    "--output",
+    "-o",
+    default="find-kedro-manifest.json",
+    type=click.Path(dir_okay=False),
+    help="file to write the manifest to",
+)
+@click.option(
+    "--no-prefilter",
+    default=False,
+    is_flag=True,
+    help="import every matched file, even when none of its names match patterns",
+)
+@click.option(
+    "--verbose",
+    "-v",
+    default=False,
+    is_flag=True,
+    help="Prints extra information for debugging",
+)
+def manifest_build(
+    file_patterns: str,
+    patterns: str,
+    directory: str,
+    output: str,
+    no_prefilter: bool,
+    verbose: bool,
+) -> None:
+    """writes the modules, attributes, and file hashes pipelines come from"""
+    from find_kedro.manifest import build_manifest, write_manifest
 
+    manifest = build_manifest(
+        file_patterns=file_patterns,
+        patterns=patterns,
+        directory=directory,
+        prefilter=not no_prefilter,
+        verbose=verbose,
+    )
+    write_manifest(manifest, output)
     click.echo(
-        highlight(
-            json.dumps(
-                {p: [node.name for node in pipelines[p].nodes] for p in pipelines},
-                sort_keys=True,
-                indent=2,
-            ),
-            JsonLexer(),
-            TerminalFormatter(),
+        "wrote {} modules and {} file hashes to {}".format(
+            len(manifest["modules"]), len(manifest["hashes"]), output
+        ),
+        err=True,
+    )
+
+
+def _echo_pipelines(
+    pipelines: Mapping[str, "Pipeline"],
+    output_format: str = "json",
+    color: Optional[bool] = None,
+    metadata: bool = False,
+    fingerprints: bool = False,
+) -> None:
+    """
+    prints pipelines one at a time in sorted order, so a whole project is never
+    held as a single string
+
+    Arguments
+        pipelines {dict} -- pipelines to print
+        output_format {str} -- one of `OUTPUT_FORMATS`
+        color {bool} -- highlight json, defaults to whether stdout is a terminal
+        metadata {bool} -- print a record of each node in module order instead
+        fingerprints {bool} -- print the fingerprint of each pipeline instead
+    """
+    if color is None:
+        color = sys.stdout.isatty()
+    chunks: Iterator[str]
+    if metadata:
+        from find_kedro.metadata import node_table
+
+        table_writers: Dict[str, Callable[["NodeTable"], Iterator[str]]] = {
+            "json": _metadata_json_chunks,
+            "ndjson": _metadata_ndjson_chunks,
+            "names": _metadata_names_chunks,
+            "counts": _metadata_counts_chunks,
+        }
+        chunks = table_writers[output_format](node_table(pipelines))
+    elif fingerprints:
+        from find_kedro.fingerprints import pipeline_fingerprints
+
+        chunks = _fingerprint_chunks(pipeline_fingerprints(pipelines), output_format)
+    else:
+        writers: Dict[str, Callable[[Mapping[str, "Pipeline"]], Iterator[str]]] = {
+            "json": _json_chunks,
+            "ndjson": _ndjson_chunks,
+            "names": _names_chunks,
+            "counts": _counts_chunks,
+        }
+        chunks = writers[output_format](pipelines)
+    if color and output_format in ("json", "ndjson"):
+        from pygments import highlight
+        from pygments.formatters import TerminalFormatter
+        from pygments.lexers import JsonLexer
+
+        lexer, formatter = JsonLexer(), TerminalFormatter()
+        chunks = (highlight(chunk, lexer, formatter) for chunk in chunks)
+    for chunk in chunks:
+        click.echo(chunk, nl=not chunk.endswith("\n"), color=color)
+
+
+def _json_chunks(pipelines: Mapping[str, "Pipeline"]) -> Iterator[str]:
+    """the same text as json.dumps(..., indent=2, sort_keys=True) in pieces"""
+    keys = sorted(pipelines)
+    if not keys:
+        yield "{}"
+        return
+    yield "{"
+    for index, key in enumerate(keys):
+        names = json.dumps([n.name for n in pipelines[key].nodes], indent=2)
+        separator = "," if index < len(keys) - 1 else ""
+        yield "  {}: {}{}".format(
+            json.dumps(key), names.replace("\n", "\n  "), separator
         )
+    yield "}"
+
+
+def _ndjson_chunks(pipelines: Mapping[str, "Pipeline"]) -> Iterator[str]:
+    for key in sorted(pipelines):
+        names = [n.name for n in pipelines[key].nodes]
+        yield json.dumps({"pipeline": key, "nodes": names})
+
+
+def _names_chunks(pipelines: Mapping[str, "Pipeline"]) -> Iterator[str]:
+    for key in sorted(pipelines):
+        for n in pipelines[key].nodes:
+            yield "{}\t{}".format(key, n.name)
+
+
+def _counts_chunks(pipelines: Mapping[str, "Pipeline"]) -> Iterator[str]:
+    for key in sorted(pipelines):
+        yield "{}\t{}".format(key, _node_count(pipelines[key]))
+
+
+def _metadata_json_chunks(table: "NodeTable") -> Iterator[str]:
+    """the same text as json.dumps([...records], indent=2) in pieces"""
+    if not len(table):
+        yield "[]"
+        return
+    yield "["
+    for index, record in enumerate(table):
+        text = json.dumps(record._asdict(), indent=2)
+        separator = "," if index < len(table) - 1 else ""
+        yield "  {}{}".format(text.replace("\n", "\n  "), separator)
+    yield "]"
+
+
+def _metadata_ndjson_chunks(table: "NodeTable") -> Iterator[str]:
+    for record in table:
+        yield json.dumps(record._asdict())
+
+
+def _metadata_names_chunks(table: "NodeTable") -> Iterator[str]:
+    for record in table:
+        yield "{}\t{}".format(record.module, record.name)
+
+
+def _metadata_counts_chunks(table: "NodeTable") -> Iterator[str]:
+    counts: Dict[str, int] = {}
+    for module in table.column("module"):
+        counts[module] = counts.get(module, 0) + 1
+    for module, count in counts.items():
+        yield "{}\t{}".format(module, count)
+
+
+def _fingerprint_chunks(
+    fingerprints: Mapping[str, str], output_format: str
+) -> Iterator[str]:
+    """fingerprints as json, ndjson, or a pipeline and fingerprint per line"""
+    if output_format == "json":
+        yield json.dumps(fingerprints, indent=2, sort_keys=True)
+        return
+    for key in sorted(fingerprints):
+        if output_format == "ndjson":
+            yield json.dumps({"pipeline": key, "fingerprint": fingerprints[key]})
+        else:
+            yield "{}\t{}".format(key, fingerprints[key])
+
+
+def _node_count(pipeline: "Pipeline") -> int:
+    """counts nodes without sorting them, node names are unique in a pipeline"""
+    nodes_by_name = getattr(pipeline, "_nodes_by_name", None)
+    if nodes_by_name is not None:
+        return len(nodes_by_name)
+    return len(pipeline.nodes)
+
+
+def _watch(
+    file_patterns: str,
+    patterns: str,
+    directory: Path,
+    prefilter: bool,
+    verbose: bool,
+    output_format: str = "json",
+    color: Optional[bool] = None,
+    metadata: bool = False,
+    include: Tuple[str, ...] = (),
+    exclude: Tuple[str, ...] = (),
+    fingerprints: bool = False,
+) -> None:
+    """prints pipelines, then prints them again after every change"""
+    from find_kedro.registry import PipelineRegistry
+
+    registry = PipelineRegistry(
+        file_patterns=file_patterns,
+        patterns=patterns,
+        directory=directory,
+        prefilter=prefilter,
+        verbose=verbose,
+        include=list(include),
+        exclude=list(exclude),
     )
+    _echo_pipelines(registry.pipelines, output_format, color, metadata, fingerprints)
+
+    def on_change(changes: "Changes", pipelines: Mapping[str, "Pipeline"]) -> None:
+        click.echo(
+            "created: {}, modified: {}, deleted: {}".format(
+                changes.created, changes.modified, changes.deleted
+            ),
+            err=True,
+        )
+        _echo_pipelines(pipelines, output_format, color, metadata, fingerprints)
+
+    try:
+        registry.watch(callback=on_change)
+    except KeyboardInterrupt:
+        pass
@@ -1,16 +1,40 @@
-import importlib
-import importlib.util
 import os
 import sys
-from fnmatch import fnmatch
+import time
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, Generator, Iterable, List, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 
-from colorama import Fore
-from kedro.pipeline import Pipeline, node
+from kedro.pipeline import Pipeline
 from kedro.pipeline.node import Node
 
-raw_pattern_type = Union[List[Union[str, float, int]], str, float, int]
+from find_kedro.cache import load_discovered_files, save_discovered_files
+from find_kedro.discovery import (
+    _cleanse_inputs,
+    _compile_file_patterns,
+    _default_pipeline,
+    _discover_nodes,
+    _import,
+    _module_key,
+    _vprint,
+    _walk_files,
+    raw_pattern_type,
+)
+from find_kedro.imports import ModuleRegistry
+
+# several feature modules share their names with arguments of find_kedro
+from find_kedro import budget as _budget
+from find_kedro import factories as _factories
+from find_kedro import filters as _filters
+from find_kedro import lazy as _lazy
+from find_kedro import manifest as _manifest
+from find_kedro import packages as _packages
+from find_kedro import parallel as _parallel
+from find_kedro import prefilter as _prefilter
+from find_kedro.profiling import Profile
+
+# ways to import modules when jobs is greater than one
+BACKENDS = ("process", "thread")
 
 
 def find_kedro(
@@ -18,25 +42,94 @@ def find_kedro(
     patterns: raw_pattern_type = ["*node*", "*pipeline*"],
     directory: Union[str, Path] = ".",
     verbose: bool = False,
-) -> Dict[str, Pipeline]:
+    cache_dir: Optional[Union[str, Path]] = None,
+    prefilter: bool = True,
+    jobs: Optional[int] = None,
+    preload: Optional[List[str]] = None,
+    lazy: bool = False,
+    backend: str = "process",
+    profile: Union[bool, Profile] = False,
+    manifest: Optional[Union[str, Path]] = None,
+    include: Optional[raw_pattern_type] = None,
+    exclude: Optional[raw_pattern_type] = None,
+    import_budget: Optional[float] = None,
+    import_timeout: Optional[float] = None,
+    skip_slow: bool = False,
+    quarantine: Optional[Union[str, Path]] = None,
+    package: Optional[str] = None,
+    factory_kwargs: Optional[Dict[str, Any]] = None,
+    cache_factories: bool = False,
+) -> Mapping[str, Pipeline]:
     """
     collect kedro nodes into a single dictionary of pipelines
 
     Each module will become a pipeline with a key of its name,
     All modules will be combined together to create the '__default' pipeine
 
+    Modules are imported as submodules of a package rooted at directory, so the
+    `__init__.py` files of directories above each module run first, and any
+    error they raise other than ImportError is raised here.  The modules are
+    removed from `sys.modules` again before returning, so dropping the result
+    frees them.
+
     Arguments
         file_patterns {list} -- list of file globbing patterns
         patterns {list} -- list of variable globbing file_patterns
         directory {str} -- directory to look for pipeline modules in
         verbose {bool} -- prints extra information
+        cache_dir {str} -- directory to cache file discovery results in, the
+            tree is only walked again when one of its directories changes
+        prefilter {bool} -- parse each file first and skip importing files that
+            do not define any name matching patterns
+        jobs {int} -- import modules with this many workers, see backend
+        preload {list} -- packages for the worker forkserver to import up front
+        lazy {bool} -- return a read-only `LazyPipelines` mapping that imports
+            each module only when its key is accessed, jobs is ignored and
+            import_budget, import_timeout, and quarantine cannot be used
+        backend {str} -- "process" imports modules in worker processes and
+            imports node functions in this process on first call, "thread"
+            reads and compiles sources in threads and then executes each
+            module in order without changing the working directory
+        profile {bool} -- print a `Profile` of every phase to stderr, or pass
+            a `Profile` to have it filled in instead
+        manifest {str} -- manifest built by `find-kedro manifest build`, only
+            its modules and attributes are imported, without walking the tree,
+            unless it is stale, when discovery falls back to walking, lazy and
+            jobs are ignored while the manifest is used, and import_timeout and
+            quarantine cannot be used
+        include {list} -- path globs relative to directory, only files and
+            directories matching one are walked, see `filters`
+        exclude {list} -- path globs relative to directory that are never
+            walked or imported
+        import_budget {float} -- seconds each module should take to import,
+            slower modules are logged and listed in the profile, see `budget`
+        import_timeout {float} -- seconds each module may take to import before
+            it is killed and left out, modules are then imported one at a
+            time in a worker process and jobs and backend are ignored
+        skip_slow {bool} -- leave modules over import_budget out of the
+            pipelines
+        quarantine {str} -- json file of slow and timed out modules, which
+            are not imported again until their contents change
+        package {str} -- dotted name of an installed package to import
+            pipeline modules from through the import system instead of
+            walking directory, see `packages`, directory, cache_dir,
+            prefilter, jobs, backend, and manifest are ignored, and lazy,
+            import_timeout, and quarantine cannot be used
+        factory_kwargs {dict} -- keyword arguments passed to each
+            create_pipeline factory that accepts them, see `factories`
+        cache_factories {bool} -- keep what create_pipeline factories return
+            across discoveries in this process and run them again only when
+            their source, keyword arguments, or environment change, by
+            default each factory runs once per discovery
 
     Returns
-        {dict} -- dictionary of pipelines
+        {dict} -- dictionary of pipelines, a `LazyPipelines` mapping when lazy
     """
     _vprint("find kedro start", verbose, main=True)
+    _check_options(
+        backend, lazy, manifest, package, import_budget, import_timeout, quarantine
+    )
     directory = Path(directory)
-    sys.path.append(str(directory))
     # file_patterns, patterns = _cleanse_inputs(file_patterns, patterns, verbose=verbose)
     cleansed_file_patterns = _cleanse_inputs(
         file_patterns, verbose=verbose, is_file_pattern_type=True
@@ -45,97 +138,324 @@ def find_kedro(
         patterns, verbose=verbose, is_file_pattern_type=False
     )
 
-    nodes_files = _discover_files(directory, cleansed_file_patterns, verbose=verbose)
-
-    if len(nodes_files) == 0:
-        _vprint("no modules found, Exiting Now", verbose)
-        return {"__default__": Pipeline([])}
-    modules = {}
-    for nodes_file in nodes_files:
-        key = (
-            str(nodes_file)
-            .replace(f"{directory}{os.sep}", "")
-            .replace(os.sep, ".")
-            .replace(".py", "")
-        )
-        modules[key] = _import(nodes_file, directory)
-    _vprint("modules found with file pattern match", verbose, modules=modules)
+    path_filter = _filters.compile_path_filter(include, exclude)
 
-    nodes = {}
+    report = profile if isinstance(profile, Profile) else Profile()
+    modules = ModuleRegistry()
+    factories = _factories.FactoryCalls(
+        factory_kwargs,
+        report.factories,
+        _factories.FACTORIES if cache_factories else None,
+    )
+    try:
+        if package is not None:
+            keyed_modules = _packages.find_package_modules(
+                package,
+                cleansed_file_patterns,
+                verbose=verbose,
+                path_filter=path_filter,
+            )
+            nodes = _packages.discover_package_nodes(
+                keyed_modules,
+                cleansed_patterns,
+                verbose=verbose,
+                profile=report,
+                factories=factories,
+            )
+            if import_budget is not None:
+                package_files = {
+                    key: Path(report.modules[key]["file"] or name)
+                    for key, name in keyed_modules.items()
+                }
+                nodes = _budget.check_budget(
+                    nodes, package_files, import_budget, report, skip_slow
+                )
+            with report.phase("generation"):
+                pipelines = _generate_pipelines(nodes, verbose=verbose, profile=report)
+            _vprint("find kedro end", verbose, main=True)
+            _print_profile(profile, report)
+            return pipelines
+        if manifest is not None:
+            manifest_nodes = _manifest.load_manifest_nodes(
+                manifest,
+                directory,
+                cleansed_file_patterns,
+                cleansed_patterns,
+                verbose=verbose,
+                profile=report,
+                modules=modules,
+                path_filter=path_filter,
+                factories=factories,
+            )
+            if manifest_nodes is not None:
+                if import_budget is not None:
+                    manifest_files = {
+                        key: Path(report.modules[key]["file"]) for key in report.modules
+                    }
+                    manifest_nodes = _budget.check_budget(
+                        manifest_nodes,
+                        manifest_files,
+                        import_budget,
+                        report,
+                        skip_slow,
+                    )
+                with report.phase("generation"):
+                    pipelines = _generate_pipelines(
+                        manifest_nodes, verbose=verbose, profile=report
+                    )
+                _report_duplicates(modules, report, verbose)
+                _vprint("find kedro end", verbose, main=True)
+                _print_profile(profile, report)
+                return pipelines
+            _vprint(
+                "manifest unusable, discovering instead", verbose, manifest=manifest
+            )
 
-    for module in modules:
-        module_nodes = _discover_nodes(
-            modules[module], cleansed_patterns, verbose=verbose
+        keyed_files = _find_module_files(
+            directory,
+            cleansed_file_patterns,
+            cleansed_patterns,
+            verbose=verbose,
+            cache_dir=cache_dir,
+            prefilter=prefilter,
+            path_filter=path_filter,
+            profile=report,
         )
-        if module_nodes != []:
-            nodes[module] = module_nodes
-    _vprint("module found with nodes pattern match", verbose, nodes=nodes)
-
-    pipelines = _generate_pipelines(nodes, verbose=verbose)
-    _vprint("find kedro end", verbose, main=True)
-    return pipelines
-
+        quarantined = None
+        if quarantine is not None:
+            quarantined = _budget.Quarantine(quarantine, directory)
+            keyed_files = _budget.skip_quarantined(
+                keyed_files, quarantined, report, verbose=verbose
+            )
+        if lazy:
+            _vprint("find kedro end", verbose, main=True)
+            _print_profile(profile, report)
+            return _lazy.LazyPipelines(
+                keyed_files,
+                directory,
+                cleansed_patterns,
+                verbose,
+                factories=factories,
+            )
 
-def _vprint(
-    title: str, verbose: bool = False, main: bool = False, **kwargs: Any
-) -> None:
-    if verbose:
-        if main:
-            print(
-                f"\n\n{Fore.BLUE}―――――― {Fore.YELLOW}{title.upper()}{Fore.BLUE} ――――――{Fore.RESET}\n\n"
+        if len(keyed_files) == 0:
+            _vprint("no modules found, Exiting Now", verbose)
+            pipelines = {"__default__": Pipeline([])}
+            _print_profile(profile, report)
+            return pipelines
+        if import_timeout is not None:
+            nodes = _budget.discover_nodes_with_timeout(
+                keyed_files,
+                directory,
+                cleansed_patterns,
+                import_timeout,
+                preload=preload,
+                verbose=verbose,
+                profile=report,
+                quarantine=quarantined,
+                factories=factories,
+            )
+        elif jobs is not None and jobs > 1 and backend == "thread":
+            nodes = _parallel.discover_nodes_threaded(
+                keyed_files,
+                directory,
+                cleansed_patterns,
+                jobs,
+                verbose=verbose,
+                profile=report,
+                modules=modules,
+                factories=factories,
+            )
+        elif jobs is not None and jobs > 1:
+            nodes = _parallel.discover_nodes_parallel(
+                keyed_files,
+                directory,
+                cleansed_patterns,
+                jobs,
+                preload=preload,
+                verbose=verbose,
+                profile=report,
+                factories=factories,
             )
         else:
-            print(Fore.LIGHTBLACK_EX, "―" * 30, Fore.RESET)
-            print(f"{Fore.YELLOW}{title}{Fore.RESET}")
-        for kwarg in kwargs:
-            print(f"{Fore.CYAN}{kwarg}: {Fore.GREEN}{kwargs[kwarg]}{Fore.RESET}")
+            nodes = _discover_modules(
+                keyed_files,
+                directory,
+                cleansed_patterns,
+                verbose,
+                profile=report,
+                modules=modules,
+                factories=factories,
+            )
+        if import_budget is not None:
+            nodes = _budget.check_budget(
+                nodes, keyed_files, import_budget, report, skip_slow, quarantined
+            )
+        if quarantined is not None:
+            quarantined.save()
+        _vprint("module found with nodes pattern match", verbose, nodes=nodes)
+
+        with report.phase("generation"):
+            pipelines = _generate_pipelines(nodes, verbose=verbose, profile=report)
+        _report_duplicates(modules, report, verbose)
+        _vprint("find kedro end", verbose, main=True)
+        _print_profile(profile, report)
+        return pipelines
+    finally:
+        # drops the modules from sys.modules so they are freed with the result
+        modules.release_all()
+
+
+def _check_options(
+    backend: str,
+    lazy: bool,
+    manifest: Optional[Union[str, Path]],
+    package: Optional[str],
+    import_budget: Optional[float],
+    import_timeout: Optional[float],
+    quarantine: Optional[Union[str, Path]],
+) -> None:
+    """raises ValueError for `find_kedro` options that cannot be combined"""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if lazy and (import_budget is not None or import_timeout is not None or quarantine):
+        raise ValueError(
+            "lazy cannot be combined with import_budget, import_timeout, "
+            "or quarantine, which need every module imported up front"
+        )
+    if package is not None and (lazy or import_timeout is not None or quarantine):
+        raise ValueError(
+            "package cannot be combined with lazy, import_timeout, or "
+            "quarantine, which need modules walked from directory"
+        )
+    if manifest is not None and (import_timeout is not None or quarantine):
+        raise ValueError(
+            "manifest cannot be combined with import_timeout or quarantine, "
+            "which need modules imported one at a time in a worker"
+        )
 
 
-def _cleanse_inputs(
-    patterns: raw_pattern_type, verbose: bool = False, is_file_pattern_type: bool = True
-) -> List[str]:
+def _find_module_files(
+    directory: Path,
+    file_patterns: List[str],
+    patterns: List[str],
+    verbose: bool = False,
+    cache_dir: Optional[Union[str, Path]] = None,
+    prefilter: bool = True,
+    path_filter: Optional[_filters.PathFilter] = None,
+    profile: Optional[Profile] = None,
+) -> Dict[str, Path]:
     """
-    normalizes user input and ensures that inputs are properly typed.
+    walks directory for the modules to import, keyed by their module key
 
-    Arguments:
-        file_patterns {Union[List[str, float, int], str, float, int]} -- file patterns that find-kedro will use to match files.
-        patterns {Union[List[str, float, int], str, float, int]} -- file patterns that find-kedro will use to match variables.
+    Arguments
+        directory {Path} -- directory to look for pipeline modules in
+        file_patterns {List[str]} -- cleansed file patterns
+        patterns {List[str]} -- cleansed variable patterns
         verbose {bool} -- prints extra information
+        cache_dir {Path} -- directory to cache file discovery results in
+        prefilter {bool} -- skip files that define no name matching patterns
+        path_filter {PathFilter} -- include and exclude globs
+        profile {Profile} -- records the walk and prefilter phases, and the
+            files the prefilter skipped
 
+    Returns
+        dict -- files to import keyed by module key, in sorted file order
     """
+    profile = profile or Profile()
+    pruned: Counter = Counter()
+    with profile.phase("walk"):
+        nodes_files = _discover_files(
+            directory,
+            file_patterns,
+            verbose=verbose,
+            cache_dir=cache_dir,
+            path_filter=path_filter,
+            pruned=pruned,
+        )
+    if path_filter is not None:
+        profile.pruned["directories"] += pruned["directories"]
+        profile.pruned["modules"] += pruned["modules"]
+        _vprint(
+            "pruned by include and exclude",
+            verbose,
+            directories=pruned["directories"],
+            modules=pruned["modules"],
+        )
 
-    _vprint("raw inputs", verbose, patterns=patterns)
-    # force List[str] type
-    if not isinstance(patterns, Iterable):
-        patterns = str(patterns)
-    if type(patterns) == str:
-        patterns = list(patterns)
-
-    str_patterns = [str(pattern) for pattern in _flatten(patterns)]
-
-    if is_file_pattern_type:
-        cleansed_patterns = [
-            pattern + ".py" if pattern[-3:] != ".py" else pattern
-            for pattern in str_patterns
-        ]
-        cleansed_patterns = [
-            "**/" + pattern if pattern[:3] != "**/" else pattern
-            for pattern in str_patterns
-        ]
-    else:
-        cleansed_patterns = str_patterns
+    if prefilter:
+        with profile.phase("prefilter"):
+            nodes_files, skipped_files = _prefilter.prefilter_files(
+                nodes_files, patterns
+            )
+        profile.prefiltered.extend(str(f) for f in skipped_files)
+        _vprint(
+            "skipped imports with no pattern matched names",
+            verbose,
+            num_skipped=len(skipped_files),
+            files_skipped=[str(f) for f in skipped_files],
+        )
+
+    return {_module_key(f, directory): f for f in nodes_files}
+
+
+def _report_duplicates(modules: ModuleRegistry, report: Profile, verbose: bool) -> None:
+    """adds files that were executed more than once to report"""
+    report.duplicates = modules.duplicates()
+    if report.duplicates:
+        _vprint("files executed more than once", verbose, duplicates=report.duplicates)
 
-    _vprint("cleansed inputs", verbose, patterns=cleansed_patterns)
-    return cleansed_patterns
 
+def _print_profile(profile: Union[bool, Profile], report: Profile) -> None:
+    """prints report to stderr when profile was requested with True"""
+    if profile is True:
+        print(report.format(), file=sys.stderr)
 
-def _generate_pipelines(nodes: Dict, verbose: bool = False) -> Dict[str, Pipeline]:
+
+def _discover_modules(
+    keyed_files: Dict[str, Path],
+    directory: Path,
+    patterns: List[str],
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    modules: Optional[ModuleRegistry] = None,
+    factories: Optional[_factories.FactoryCalls] = None,
+) -> Dict[str, List[Node]]:
+    """imports each module in turn and discovers the nodes it holds"""
+    profile = profile or Profile()
+    imported = {}
+    with profile.phase("import"):
+        for key, nodes_file in keyed_files.items():
+            start = time.perf_counter()
+            imported[key] = _import(nodes_file, directory, modules=modules)
+            profile.record_module(
+                key, nodes_file, import_time=time.perf_counter() - start
+            )
+    _vprint("modules found with file pattern match", verbose, modules=imported)
+
+    nodes = {}
+
+    with profile.phase("discovery"):
+        for module in imported:
+            module_nodes = _discover_nodes(
+                imported[module], patterns, verbose=verbose, factories=factories
+            )
+            profile.record_module(module, nodes=len(module_nodes))
+            if module_nodes != []:
+                nodes[module] = module_nodes
+    return nodes
+
+
+def _generate_pipelines(
+    nodes: Dict, verbose: bool = False, profile: Optional[Profile] = None
+) -> Dict[str, Pipeline]:
     """
     generates a dictionary of pipelines to use in ProjectContet
 
     Arguments:
         nodes {dict} -- dictionary of lists of nodes to turn into pipelines
         verbose {bool} -- prints extra information
+        profile {Profile} -- adds time spent constructing pipelines to it
 
     Returns:
         dict -- dictionary of pipelines with each .py file as its own pipeline,
@@ -147,17 +467,25 @@ def _generate_pipelines(nodes: Dict, verbose: bool = False) -> Dict[str, Pipelin
     """
     pipelines = {}
     _vprint("nodes for generating pipelines", verbose, nodes=nodes)
+    start = time.perf_counter()
     for _node in nodes:
         pipelines[_node] = Pipeline(nodes[_node])
-    pipelines["__default__"] = Pipeline(
-        set(_flatten([p.nodes for p in pipelines.values()]))
-    )
+    # kedro sorts `__default__` again, the order of each module pipeline does
+    # not order nodes that depend on nodes of other modules
+    pipelines["__default__"] = _default_pipeline(list(nodes.values()))
+    if profile is not None:
+        profile.pipeline_construction += time.perf_counter() - start
     _vprint("generated pipelines", verbose, pipelines=pipelines)
     return pipelines
 
 
 def _discover_files(
-    directory: Path, patterns: List[str], verbose: bool = False
+    directory: Path,
+    patterns: List[str],
+    verbose: bool = False,
+    cache_dir: Optional[Union[str, Path]] = None,
+    path_filter: Optional[_filters.PathFilter] = None,
+    pruned: Optional[Counter] = None,
 ) -> List[Path]:
     """
     looks for filename patterns within the given directory using fnmatch, which
@@ -172,23 +500,40 @@ def _discover_files(
         *nodes will match ['de_nodes']
         nodes* will match ['ds_nodes_raw']
 
+    The directory tree is walked once with `os.scandir`, every file name is
+    checked against all patterns at once, and excluded directories such as
+    `__pycache__` are pruned before they are descended into.
+
+    When a cache_dir is given, the walk is skipped if no directory in the tree
+    changed since the results were cached.
+
     Arguments
         directory {Path} -- directory to start looking for nodes from
         patterns {Lit[str]} -- list of patterns to match files with
+        cache_dir {Path} -- directory to store discovery results in
+        path_filter {PathFilter} -- include and exclude globs, see `_walk_files`
+        pruned {Counter} -- when given, counts the directories and modules
+            path_filter pruned
 
     Returns
-        list -- list of files that match the pattern within the given directory
+        list -- sorted list of files that match the pattern within the given directory
     """
-    files: List[Path] = list()
-    for pattern in patterns:
-        globbed = [
-            file
-            for file in list(directory.glob(str(pattern)))
-            if fnmatch(file.name, pattern.replace("**/", ""))
-        ]
-        files = [*files, *globbed]
-    files = [file for file in files if "__pycache__" not in str(file)]
-    files = list(set(files))
+    if cache_dir is None:
+        files = _walk_files(
+            directory,
+            _compile_file_patterns(patterns),
+            path_filter=path_filter,
+            pruned=pruned,
+        )
+    else:
+        files = _cached_walk_files(
+            directory,
+            patterns,
+            cache_dir,
+            verbose=verbose,
+            path_filter=path_filter,
+            pruned=pruned,
+        )
     _vprint(
         "pattern matched modules",
         verbose & len(files) > 0,
@@ -199,111 +544,51 @@ def _discover_files(
     return files
 
 
-def _discover_nodes(
-    module: str, patterns: List[str], verbose: bool = False
-) -> List[Node]:
-    """
-    looks for variables with patterns within the given module
-
-    returns a flat list of node objects
-    """
-    nodes: List[Union[List, Node, Pipeline, List[Node]]] = []
-    for pattern in patterns:
-        nodes = [
-            *nodes,
-            *list(
-                [
-                    getattr(module, var)
-                    for var in dir(module)
-                    if fnmatch(var, str(pattern))
-                ]
-            ),
-        ]
-    # remove kedro.pipeline.nodes
-    nodes = [_node for _node in nodes if _node != node]
-    _vprint("discovered patterns", verbose, nodes=nodes)
-
-    def assert_pipeline_types(pipeline: Any) -> Union[Node, Pipeline, None]:
-        if isinstance(pipeline, Node):
-            return pipeline
-        if isinstance(pipeline, Pipeline):
-            return pipeline
-        if callable(pipeline) and pipeline.__name__ == "create_pipeline":
-            return pipeline()
-        else:
-            return None
-
-    def pipeline_to_nodes(pipeline: Union[Node, Pipeline]) -> List[Node]:
-        if isinstance(pipeline, Pipeline):
-            return pipeline.nodes
-        else:
-            return [pipeline]
-
-    asserted_nodes = [assert_pipeline_types(n) for n in list(_flatten(nodes))]
-    _vprint("asserted_nodes", verbose, nodes=asserted_nodes)
-    not_none_nodes = [n for n in list(_flatten(asserted_nodes)) if n is not None]
-    _vprint("not_none_nodes", verbose, nodes=not_none_nodes)
-    listed_nodes = list(_flatten([pipeline_to_nodes(n) for n in not_none_nodes]))
-    listed_nodes = list(_flatten([pipeline_to_nodes(n) for n in not_none_nodes]))
-    _vprint("listed_nodes", verbose, nodes=listed_nodes)
-    deduped_nodes = list(_flatten(list(set(listed_nodes))))
-    _vprint("deduped_nodes", verbose, nodes=deduped_nodes)
-
-    return deduped_nodes
-
-
-def _flatten(items: Iterable) -> Generator:
-    """Yield items from any nested iterable"""
-    for x in items:
-        if isinstance(x, Iterable) and not isinstance(x, (str, bytes)):
-            for sub_x in _flatten(x):
-                yield sub_x
-        else:
-            yield x
-
-
-def _make_path_relative(path: Path, directory: Path) -> Path:
-    """removes directory from path, and any leading anchors"""
-    relative = Path(str(path.absolute()).replace(str(directory.absolute()), ""))
-    if str(relative)[: len(os.sep)] == os.sep:
-        relative = Path(str(relative)[len(os.sep) :])
-    return relative
-
-
-def _import(
-    path: Path, directory: Path, verbose: bool = False
-) -> Any:  # unsure how to type module
-    """dynamically imports module given a path"""
-    cwd = os.getcwd()
-    os.chdir(directory)
-    name = path.name
-    # path = str(path).replace(str(directory) + "/", "")
-    path = _make_path_relative(path, directory)
+def _cached_walk_files(
+    directory: Path,
+    patterns: List[str],
+    cache_dir: Union[str, Path],
+    verbose: bool = False,
+    path_filter: Optional[_filters.PathFilter] = None,
+    pruned: Optional[Counter] = None,
+) -> List[Path]:
+    """walks directory unless a valid entry exists in the discovery cache"""
+    filters = None
+    if path_filter is not None:
+        filters = {"include": path_filter.include, "exclude": path_filter.exclude}
+    cached = load_discovered_files(cache_dir, directory, patterns, filters, pruned)
+    if cached is not None:
+        _vprint("discovery cache hit", verbose, cache_dir=cache_dir)
+        return cached
+    # a cache_dir inside directory changes whenever an entry is written, so it
+    # is created before the walk and left out of it
     try:
-        spec = importlib.util.spec_from_file_location(name, path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)  # type: ignore
-    except (ModuleNotFoundError, ValueError, AttributeError):
-        module = _use_importmodule(
-            str(path).replace(os.sep, ".").replace(".py", ""), verbose=verbose  # type: ignore
-        )
-    os.chdir(cwd)
-
-    return module
-
-
-def _use_importmodule(path: Path, verbose: bool = False) -> Any:
-    """
-    relative imports do not work well with importlib.util.spec_from_file_location,
-    and require a sys.path.append to be imported correctly.  For this reason
-    importlib.import_module is the second option.
-    """
-
-    # Not sure if this is needed, but it was never hit in a test
-    # if path[0] == ".":
-    #     path = path[1:]
-
-    sys.path.append(os.getcwd())
-    mod = importlib.import_module(str(path))
-    sys.path.pop()  # clean up path, do not permananatly change users path
-    return mod
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    skipped = os.path.relpath(Path(cache_dir).resolve(), Path(directory).resolve())
+    directory_mtimes: Dict[str, int] = {}
+    walk_pruned: Counter = Counter()
+    walk_started = time.time()
+    files = _walk_files(
+        directory,
+        _compile_file_patterns(patterns),
+        directory_mtimes,
+        path_filter=path_filter,
+        pruned=walk_pruned,
+        skipped=None if skipped.startswith("..") else os.path.join(".", skipped),
+    )
+    if pruned is not None:
+        pruned.update(walk_pruned)
+    saved = save_discovered_files(
+        cache_dir,
+        directory,
+        patterns,
+        files,
+        directory_mtimes,
+        walk_started,
+        filters=filters,
+        pruned=walk_pruned,
+    )
+    _vprint("discovery cache miss", verbose, cache_dir=cache_dir, saved=saved)
+    return files
@@ -0,0 +1,643 @@
+"""
+discovery
+
+This module holds the pieces every way of discovering pipelines shares:
+cleansing patterns, walking the tree for module files, importing a module as
+part of its project package, and collecting the nodes held by the variables
+that match.  `find_kedro` and the feature modules build on it, and it imports
+none of them.
+"""
+import hashlib
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from fnmatch import translate
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from colorama import Fore
+from kedro.pipeline import Pipeline, node
+from kedro.pipeline.node import Node
+
+from find_kedro.imports import PROJECT_PREFIX, ModuleRegistry
+
+if TYPE_CHECKING:
+    from find_kedro.factories import FactoryCalls
+    from find_kedro.filters import PathFilter
+
+raw_pattern_type = Union[List[Union[str, float, int]], str, float, int]
+
+
+# containers `_flatten` checks for before falling back to any iterable
+FLATTEN_CONTAINERS = (list, tuple, set, frozenset)
+
+
+# directories that are never descended into while looking for modules
+EXCLUDED_DIRECTORIES = frozenset(
+    {
+        "__pycache__",
+        ".git",
+        ".hg",
+        ".svn",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ipynb_checkpoints",
+    }
+)
+
+
+def _module_key(nodes_file: Path, directory: Path) -> str:
+    """dotted pipeline name of a module file relative to directory"""
+    return (
+        str(nodes_file)
+        .replace(f"{directory}{os.sep}", "")
+        .replace(os.sep, ".")
+        .replace(".py", "")
+    )
+
+
+def _vprint(
+    title: str, verbose: bool = False, main: bool = False, **kwargs: Any
+) -> None:
+    if verbose:
+        if main:
+            print(
+                f"\n\n{Fore.BLUE}―――――― {Fore.YELLOW}{title.upper()}{Fore.BLUE} ――――――{Fore.RESET}\n\n"
+            )
+        else:
+            print(Fore.LIGHTBLACK_EX, "―" * 30, Fore.RESET)
+            print(f"{Fore.YELLOW}{title}{Fore.RESET}")
+        for kwarg in kwargs:
+            print(f"{Fore.CYAN}{kwarg}: {Fore.GREEN}{kwargs[kwarg]}{Fore.RESET}")
+
+
+def _cleanse_inputs(
+    patterns: raw_pattern_type, verbose: bool = False, is_file_pattern_type: bool = True
+) -> List[str]:
+    """
+    normalizes user input and ensures that inputs are properly typed.
+
+    Arguments:
+        file_patterns {Union[List[str, float, int], str, float, int]} -- file patterns that find-kedro will use to match files.
+        patterns {Union[List[str, float, int], str, float, int]} -- file patterns that find-kedro will use to match variables.
+        verbose {bool} -- prints extra information
+
+    """
+
+    _vprint("raw inputs", verbose, patterns=patterns)
+    # force List[str] type
+    if not isinstance(patterns, Iterable):
+        patterns = str(patterns)
+    if type(patterns) == str:
+        patterns = list(patterns)
+
+    str_patterns = [str(pattern) for pattern in _flatten(patterns)]
+
+    if is_file_pattern_type:
+        cleansed_patterns = [
+            pattern + ".py" if pattern[-3:] != ".py" else pattern
+            for pattern in str_patterns
+        ]
+        cleansed_patterns = [
+            "**/" + pattern if pattern[:3] != "**/" else pattern
+            for pattern in str_patterns
+        ]
+    else:
+        cleansed_patterns = str_patterns
+
+    _vprint("cleansed inputs", verbose, patterns=cleansed_patterns)
+    return cleansed_patterns
+
+
+def _default_pipeline(module_nodes: List[List[Node]]) -> Pipeline:
+    """combines the nodes of every module into a single deduplicated pipeline"""
+    return Pipeline(_merge_nodes(module_nodes))
+
+
+def _merge_nodes(module_nodes: Iterable[Iterable[Node]]) -> List[Node]:
+    """
+    merges lists of nodes in a single pass, keeping the first of any duplicates
+
+    Nodes are deduplicated by identity.  Only when two distinct node objects
+    share a name are they compared for equality, so nodes are never hashed.
+    Nodes keep the order of module_nodes.
+
+    Arguments
+        module_nodes {list} -- lists of nodes, one for each module
+
+    Returns
+        list -- deduplicated nodes
+    """
+    merged: List[Node] = []
+    seen: Set[int] = set()
+    by_name: Dict[str, List[Node]] = {}
+    for nodes in module_nodes:
+        for _node in nodes:
+            if id(_node) in seen:
+                continue
+            seen.add(id(_node))
+            same_name = by_name.setdefault(_node.name, [])
+            if any(_node == other for other in same_name):
+                continue
+            same_name.append(_node)
+            merged.append(_node)
+    return merged
+
+
+def _compile_file_patterns(patterns: List[str]) -> Callable[[str], bool]:
+    """
+    combines every file pattern into a single precompiled matcher
+
+    Patterns are matched against the file name only, leading `**/` anchors are
+    dropped.
+
+    Arguments
+        patterns {List[str]} -- list of patterns to match files with
+
+    Returns
+        callable -- returns True when a file name matches any of the patterns
+    """
+    return _compile_patterns(
+        tuple(str(pattern).replace("**/", "") for pattern in patterns)
+    )
+
+
+@lru_cache(maxsize=128)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    combines glob patterns into a single cached regex matcher
+
+    Names are normalized with `os.path.normcase` just like `fnmatch`.
+
+    Arguments
+        patterns {Tuple[str]} -- glob patterns
+
+    Returns
+        callable -- returns True when a name matches any of the patterns
+    """
+    if not patterns:
+        return lambda name: False
+    regex = re.compile(
+        "|".join(
+            f"(?:{translate(os.path.normcase(str(pattern)))})" for pattern in patterns
+        )
+    )
+
+    def matcher(name: str) -> bool:
+        return regex.match(os.path.normcase(name)) is not None
+
+    return matcher
+
+
+def _walk_files(
+    directory: Path,
+    matcher: Callable[[str], bool],
+    directory_mtimes: Optional[Dict[str, int]] = None,
+    path_filter: Optional["PathFilter"] = None,
+    pruned: Optional[Counter] = None,
+    skipped: Optional[str] = None,
+) -> List[Path]:
+    """
+    walks the directory tree once, collecting python files accepted by matcher
+
+    Only files ending in `.py` are collected, since only they can be imported.
+    Symlinked directories are followed, as `Path.glob` follows them, but each
+    directory is entered once, so a symlink loop ends the walk rather than
+    repeating it.  Directories listed in `EXCLUDED_DIRECTORIES` are never
+    entered.  Directories path_filter excludes, or that none of its include
+    globs could match anything beneath, are pruned without being entered.
+
+    Arguments
+        directory {Path} -- directory to start walking from
+        matcher {callable} -- file name matcher from `_compile_file_patterns`
+        directory_mtimes {dict} -- when given, filled with the `st_mtime_ns` of
+            every walked directory keyed by its path relative to directory
+        path_filter {PathFilter} -- include and exclude globs for relative paths
+        pruned {Counter} -- when given, counts the directories pruned and the
+            matching modules left out by path_filter
+        skipped {str} -- path of a directory relative to directory, such as
+            `./.cache`, that is neither walked nor recorded
+
+    Returns
+        list -- sorted list of matching files
+    """
+    if pruned is None:
+        pruned = Counter()
+    files: List[Path] = []
+    # directories still to walk, with whether path_filter includes all of them
+    stack = [(str(directory), ".", path_filter is None)]
+    # (device, inode) of every directory entered, which ends symlink loops
+    entered: Set[Tuple[int, int]] = set()
+    while stack:
+        current, relative, included = stack.pop()
+        try:
+            stat = os.stat(current)
+            if (stat.st_dev, stat.st_ino) in entered:
+                continue
+            entered.add((stat.st_dev, stat.st_ino))
+            if directory_mtimes is not None:
+                directory_mtimes[relative] = stat.st_mtime_ns
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name, reverse=True)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if entry.name in EXCLUDED_DIRECTORIES:
+                        continue
+                    child = os.path.join(relative, entry.name)
+                    if child == skipped:
+                        continue
+                    child_included = included
+                    if path_filter is not None:
+                        path = _filter_path(child)
+                        child_included = included or path_filter.includes_directory(
+                            path
+                        )
+                        if path_filter.excludes_directory(path) or not (
+                            child_included or path_filter.may_include(path)
+                        ):
+                            pruned["directories"] += 1
+                            continue
+                    stack.append((entry.path, child, child_included))
+                elif (
+                    entry.name.endswith(".py")
+                    and matcher(entry.name)
+                    and entry.is_file()
+                ):
+                    if path_filter is not None and not path_filter.accepts_file(
+                        _filter_path(os.path.join(relative, entry.name)), included
+                    ):
+                        pruned["modules"] += 1
+                        continue
+                    files.append(Path(entry.path))
+            except OSError:
+                continue
+    return sorted(files)
+
+
+def _filter_path(relative: str) -> str:
+    """turns a `_walk_files` relative path such as ./a/b into a/b for filters"""
+    return relative[2:].replace(os.sep, "/")
+
+
+def _discover_nodes(
+    module: str,
+    patterns: List[str],
+    verbose: bool = False,
+    factories: Optional["FactoryCalls"] = None,
+) -> List[Node]:
+    """
+    looks for variables with patterns within the given module
+
+    returns a flat list of node objects in the order their variables were
+    defined, create_pipeline factories are run through factories when given
+    """
+    start = time.perf_counter()
+    matches = _match_variables(module, patterns)
+    _vprint(
+        "discovered patterns",
+        verbose,
+        nodes=[value for _, value in matches],
+        match_time=time.perf_counter() - start,
+    )
+    deduped_nodes = _merge_nodes(
+        [_collect_nodes(value, factories) for _, value in matches]
+    )
+    _vprint("deduped_nodes", verbose, nodes=deduped_nodes)
+
+    return deduped_nodes
+
+
+def _match_variables(module: Any, patterns: List[str]) -> List[Tuple[str, Any]]:
+    """
+    returns module level variables whose names match any pattern
+
+    The module namespace is iterated once, in definition order, and
+    `kedro.pipeline.node` itself is never matched.
+
+    Arguments
+        module {module} -- module to search
+        patterns {List[str]} -- cleansed variable patterns
+
+    Returns
+        list -- (name, value) pairs of matched variables
+    """
+    matcher = _compile_patterns(tuple(patterns))
+    return [
+        (name, value)
+        for name, value in list(vars(module).items())
+        if matcher(name) and value is not node
+    ]
+
+
+def _collect_nodes(
+    value: Any, factories: Optional["FactoryCalls"] = None
+) -> List[Node]:
+    """
+    returns the nodes held by a matched variable
+
+    Nodes, pipelines, and containers of them are collected, and functions named
+    create_pipeline are called for the pipeline they return, through factories
+    when given, which skips factories that returned them before.
+    """
+    collected: List[Node] = []
+    for item in _flatten([value]):
+        asserted = _assert_pipeline_types(item, factories)
+        if asserted is None:
+            continue
+        # create_pipeline may return a pipeline or any container of nodes
+        collected.extend(n for n in _flatten([asserted]) if isinstance(n, Node))
+    return collected
+
+
+def _assert_pipeline_types(
+    pipeline: Any, factories: Optional["FactoryCalls"] = None
+) -> Any:
+    if isinstance(pipeline, Node):
+        return pipeline
+    if isinstance(pipeline, Pipeline):
+        return pipeline
+    if callable(pipeline) and getattr(pipeline, "__name__", None) == "create_pipeline":
+        return pipeline() if factories is None else factories.call(pipeline)
+    else:
+        return None
+
+
+def _flatten(items: Iterable) -> Generator:
+    """
+    Yield items from nested iterables and pipelines
+
+    Every iterable other than a string is descended into, including
+    generators, using an explicit stack rather than recursion, and pipelines
+    are descended into through their nodes.  Each iterable is visited at most
+    once, which guards against cycles.
+    """
+    stack = [iter(items)]
+    # keep visited iterables alive so their ids are not reused
+    seen: Dict[int, Any] = {id(items): items}
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, Node):
+                yield item
+                continue
+            if isinstance(item, FLATTEN_CONTAINERS):
+                children: Iterable = item
+            elif isinstance(item, Pipeline):
+                children = item.nodes
+            elif isinstance(item, Iterable) and not isinstance(
+                item, (str, bytes, bytearray)
+            ):
+                children = item
+            else:
+                yield item
+                continue
+            if id(item) not in seen:
+                seen[id(item)] = item
+                stack.append(iter(children))
+                break
+        else:
+            stack.pop()
+
+
+def _import(
+    path: Path,
+    directory: Path,
+    verbose: bool = False,
+    code: Optional[CodeType] = None,
+    modules: Optional[ModuleRegistry] = None,
+) -> Any:  # unsure how to type module
+    """
+    imports the module at path as a submodule of the package rooted at directory
+
+    Every call executes the module again, unless modules already holds a
+    module executed from the same file during this discovery, such as one
+    another module imported through the project package.  Nothing changes the
+    working directory, and directory is only on `sys.path` while the module
+    executes, so discovery is safe to run from several threads at once.  The
+    module is registered in `sys.modules` while it executes under the import
+    system's lock for its name, so calls executing the same name take turns,
+    and a module importing it waits until it has finished.  Modules whose
+    parent packages can not be imported, such as files in directories with dots
+    in their names, are executed on their own without a package or a
+    `sys.modules` entry.
+
+    Arguments
+        path {Path} -- file to import
+        directory {Path} -- root of the project path belongs to
+        verbose {bool} -- prints extra information
+        code {CodeType} -- code from `_compile_source` to execute instead of
+            reading path
+        modules {ModuleRegistry} -- modules executed earlier in the same
+            discovery
+
+    Returns
+        module -- executed module
+    """
+    path = Path(os.path.abspath(path))
+    directory = Path(os.path.abspath(directory))
+    with _scoped_sys_path(directory):
+        qualified = _qualified_name(path, directory)
+        if qualified is None:
+            _vprint("importing module without a package", verbose, path=path)
+            return _exec_module(path, path.name, code, modules, registered=False)
+        with _module_lock(qualified):
+            return _exec_module(path, qualified, code, modules, registered=True)
+
+
+def _exec_module(
+    path: Path,
+    name: str,
+    code: Optional[CodeType],
+    modules: Optional[ModuleRegistry],
+    registered: bool,
+) -> Any:
+    """executes path as a new module named name, see `_import`"""
+    if modules is not None:
+        existing = modules.get(path, name)
+        if existing is not None:
+            return existing
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    if modules is not None:
+        modules.add(path, module)
+    if registered:
+        # relative imports of the module need it registered, and other
+        # threads importing it wait on the module lock while it initializes
+        spec._initializing = True  # type: ignore
+        sys.modules[name] = module
+    try:
+        if code is None:
+            spec.loader.exec_module(module)  # type: ignore
+        else:
+            exec(code, module.__dict__)
+    except BaseException:
+        if registered and sys.modules.get(name) is module:
+            del sys.modules[name]
+        raise
+    finally:
+        spec._initializing = False  # type: ignore
+    return module
+
+
+@contextmanager
+def _module_lock(name: str) -> Generator[None, None, None]:
+    """
+    holds the import system's lock for name, the lock an import of name waits
+    on while the module is initializing
+
+    Like the import system, a lock that would deadlock two threads importing
+    each other's modules is skipped, accepting a partially executed module.
+    """
+    lock = importlib._bootstrap._get_module_lock(name)  # type: ignore
+    try:
+        lock.acquire()
+    except importlib._bootstrap._DeadlockError:  # type: ignore
+        yield
+        return
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def _qualified_name(path: Path, directory: Path) -> Optional[str]:
+    """
+    returns the name path is imported as within the package rooted at directory,
+    importing its parent packages, or None when they can not be imported
+
+    Importing the parent packages runs their `__init__.py` files.  An
+    ImportError falls back to executing the module without a package, any
+    other error is raised.
+    """
+    try:
+        relative = path.relative_to(directory)
+    except ValueError:
+        return None
+    parts = [*relative.parent.parts, relative.stem]
+    if any(not part or "." in part for part in parts):
+        return None
+    name = ".".join([_project_package(directory), *parts])
+    try:
+        importlib.import_module(name.rpartition(".")[0])
+    except ImportError:
+        return None
+    return name
+
+
+_project_lock = threading.Lock()
+
+
+def _project_package(directory: Path) -> str:
+    """
+    returns the name of an empty package rooted at directory, creating it once
+
+    Modules found under directory are imported as its submodules, so relative
+    imports resolve within the project, and two projects' `nodes.py` files
+    never share a `sys.modules` entry.
+    """
+    directory = Path(os.path.abspath(directory))
+    digest = hashlib.sha1(str(directory).encode("utf-8")).hexdigest()[:12]
+    name = f"{PROJECT_PREFIX}{digest}"
+    with _project_lock:
+        if name not in sys.modules:
+            spec = importlib.machinery.ModuleSpec(name, None, is_package=True)
+            spec.submodule_search_locations = [str(directory)]
+            sys.modules[name] = importlib.util.module_from_spec(spec)
+    return name
+
+
+_sys_path_lock = threading.Lock()
+
+
+# sys.path entries added by `_scoped_sys_path`, with the number of blocks using them
+_sys_path_users: Counter = Counter()
+
+
+@contextmanager
+def _scoped_sys_path(directory: Union[str, Path]) -> Generator[None, None, None]:
+    """
+    puts directory on `sys.path` for the duration of the block
+
+    Concurrent blocks for the same directory share one entry, which is removed
+    when the last of them exits.  Entries that were already on `sys.path` are
+    left alone.
+    """
+    entry = os.path.abspath(directory)
+    with _sys_path_lock:
+        owned = _sys_path_users[entry] > 0 or entry not in sys.path
+        if owned:
+            if _sys_path_users[entry] == 0:
+                sys.path.append(entry)
+            _sys_path_users[entry] += 1
+    try:
+        yield
+    finally:
+        if owned:
+            with _sys_path_lock:
+                _sys_path_users[entry] -= 1
+                if _sys_path_users[entry] == 0:
+                    del _sys_path_users[entry]
+                    if entry in sys.path:
+                        sys.path.remove(entry)
+
+
+def _read_source(path: Path) -> bytes:
+    """reads the source of a module, the first phase of `_exec_code`"""
+    return Path(path).read_bytes()
+
+
+def _hash_file(path: Path) -> str:
+    """sha256 of a file's contents, how manifests and quarantines spot edits"""
+    return hashlib.sha256(_read_source(path)).hexdigest()
+
+
+def _compile_source(source: bytes, path: Path) -> CodeType:
+    """compiles module source, safe to call from any thread"""
+    return compile(source, str(Path(path).absolute()), "exec", dont_inherit=True)
+
+
+def _exec_code(
+    code: CodeType,
+    path: Path,
+    directory: Path,
+    verbose: bool = False,
+    modules: Optional[ModuleRegistry] = None,
+) -> Any:
+    """
+    executes precompiled module code the same way `_import` executes files
+
+    Arguments
+        code {CodeType} -- code from `_compile_source`
+        path {Path} -- file the code was compiled from
+        directory {Path} -- directory the module is imported from
+        modules {ModuleRegistry} -- modules executed earlier in the same discovery
+
+    Returns
+        module -- executed module
+    """
+    return _import(path, directory, verbose=verbose, code=code, modules=modules)
@@ -0,0 +1,269 @@
+"""
+factories
+
+This module keeps what `create_pipeline` factories return, so each factory
+runs at most once per discovery however many variables match it.  With
+`find_kedro(cache_factories=True)` results are kept in a cache shared by every
+discovery in the process instead, so a factory runs again only when its
+source changes.
+
+A factory is identified by its file, qualified name, and line, which stay the
+same when its module is executed again, along with a hash of its bytecode, the
+keyword arguments it is called with, and a hash of the environment variables.
+Only the latest result of each factory is kept, so a factory called with
+several sets of keyword arguments in turn runs every time.  A cached result is
+only used while the factory's file and the files of every node function it
+returned have the same modification time and size they had when it ran, so
+editing a node function in another module runs the factory again.  Anything
+else a factory reads, such as a config file, is not tracked, so only cache
+factories across discoveries when their result depends on nothing but their
+source, keyword arguments, and environment.
+
+Keyword arguments given with `find_kedro(factory_kwargs=...)` are passed to
+each factory that accepts them, a factory taking `**kwargs` gets them all.
+Factories without a source file, such as ones made with `exec`, are called
+every time.
+
+``` python
+from find_kedro import Profile, find_kedro
+
+profile = Profile()
+pipelines = find_kedro(factory_kwargs={"env": "prod"}, profile=profile)
+pipelines = find_kedro(cache_factories=True)
+profile.factories
+```
+"""
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from functools import partial
+from types import CodeType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+
+# (file, qualified name, first line, bytecode hash, keyword arguments,
+# environment hash)
+factory_key_type = Tuple[str, str, int, str, str, str]
+
+
+class FactoryCache:
+    """
+    results of factories kept until their sources change
+
+    `stats` holds the calls, cache hits, and seconds spent running each
+    factory over the life of the cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: Dict[factory_key_type, threading.Lock] = {}
+        self._results: Dict[factory_key_type, Tuple[Any, Dict[str, Any]]] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def call(
+        self,
+        factory: Callable[..., Any],
+        kwargs: Optional[Dict[str, Any]] = None,
+        stats: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Any:
+        """
+        returns what factory returns when called with the kwargs it accepts,
+        running it only when nothing it depends on has changed since it ran
+
+        Arguments
+            factory {callable} -- create_pipeline function
+            kwargs {dict} -- keyword arguments offered to the factory
+            stats {dict} -- also counts the call in these stats
+
+        Returns
+            any -- pipeline or container of nodes returned by the factory
+        """
+        kwargs = _accepted_kwargs(factory, kwargs or {})
+        key = _factory_key(factory, kwargs)
+        if key is None:
+            return self._run(factory, kwargs, _factory_name(factory), stats)[0]
+        with self._lock:
+            running = self._running.setdefault(key, threading.Lock())
+        # a factory matched by several modules at once runs only once
+        with running:
+            cached = self._results.get(key)
+            if cached is not None and _unchanged(cached[1]):
+                self._count(_factory_name(factory), stats, hit=True)
+                return cached[0]
+            result, sources = self._run(factory, kwargs, _factory_name(factory), stats)
+            with self._lock:
+                # results of an earlier version of the factory, or of other
+                # kwargs, are not kept alongside the new one
+                for stale in [
+                    k for k in self._results if k[:2] == key[:2] and k != key
+                ]:
+                    del self._results[stale]
+                    self._running.pop(stale, None)
+                self._results[key] = (result, sources)
+        return result
+
+    def clear(self) -> None:
+        """forgets every result and statistic"""
+        with self._lock:
+            self._results.clear()
+            self._running.clear()
+            self.stats.clear()
+
+    def _run(
+        self,
+        factory: Callable[..., Any],
+        kwargs: Dict[str, Any],
+        name: str,
+        stats: Optional[Dict[str, Dict[str, Any]]],
+    ) -> Tuple[Any, Dict[str, Any]]:
+        start = time.perf_counter()
+        result = factory(**kwargs)
+        elapsed = time.perf_counter() - start
+        self._count(name, stats, elapsed=elapsed)
+        files = {_source_file(factory), *map(_source_file, _nodes(result))}
+        return result, {file: _stat(file) for file in files if file is not None}
+
+    def _count(
+        self,
+        name: str,
+        stats: Optional[Dict[str, Dict[str, Any]]],
+        elapsed: float = 0.0,
+        hit: bool = False,
+    ) -> None:
+        with self._lock:
+            for counts in (self.stats, stats):
+                if counts is None:
+                    continue
+                factory = counts.setdefault(name, {"calls": 0, "hits": 0, "time": 0.0})
+                factory["calls"] += 1
+                factory["hits"] += hit
+                factory["time"] += elapsed
+
+
+# the cache discoveries share with cache_factories=True
+FACTORIES = FactoryCache()
+
+
+class FactoryCalls:
+    """
+    keyword arguments and statistics for the factories of one discovery
+
+    Arguments
+        kwargs {dict} -- keyword arguments offered to every factory
+        stats {dict} -- filled with the calls, cache hits, and seconds spent
+            running each factory, keyed by file and qualified name
+        cache {FactoryCache} -- where results are kept, such as `FACTORIES`
+            to share them with other discoveries, by default they are only
+            kept for the calls made through this object
+    """
+
+    def __init__(
+        self,
+        kwargs: Optional[Dict[str, Any]] = None,
+        stats: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache: Optional[FactoryCache] = None,
+    ) -> None:
+        self.kwargs = dict(kwargs or {})
+        self.stats = {} if stats is None else stats
+        self.cache = FactoryCache() if cache is None else cache
+
+    def call(self, factory: Callable[..., Any]) -> Any:
+        """runs factory through the cache, see `FactoryCache.call`"""
+        return self.cache.call(factory, self.kwargs, self.stats)
+
+
+def _accepted_kwargs(
+    factory: Callable[..., Any], kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """the kwargs factory accepts, all of them when it takes **kwargs"""
+    if not kwargs:
+        return kwargs
+    try:
+        parameters = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):
+        return kwargs
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return kwargs
+    names = {
+        p.name
+        for p in parameters
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    }
+    return {name: value for name, value in kwargs.items() if name in names}
+
+
+def _factory_key(
+    factory: Callable[..., Any], kwargs: Dict[str, Any]
+) -> Optional[factory_key_type]:
+    code = getattr(factory, "__code__", None)
+    if code is None or _stat(code.co_filename) is None:
+        return None
+    return (
+        code.co_filename,
+        factory.__qualname__,
+        code.co_firstlineno,
+        _hash_code(code, hashlib.sha1()).hexdigest(),
+        _kwargs_key(kwargs),
+        _environment_key(),
+    )
+
+
+def _hash_code(code: CodeType, digest: Any) -> Any:
+    """adds the bytecode and constants of code and the code nested in it"""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+    return digest
+
+
+def _kwargs_key(kwargs: Dict[str, Any]) -> str:
+    return json.dumps(kwargs, sort_keys=True, default=repr)
+
+
+def _environment_key() -> str:
+    """a hash of the environment variables factories may read"""
+    digest = hashlib.sha1()
+    for name, value in sorted(os.environ.items()):
+        digest.update(f"{name}={value}\0".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()
+
+
+def _factory_name(factory: Callable[..., Any]) -> str:
+    code = getattr(factory, "__code__", None)
+    name = getattr(factory, "__qualname__", repr(factory))
+    return name if code is None else f"{code.co_filename}:{name}"
+
+
+def _nodes(result: Any) -> Any:
+    return (n for n in discovery._flatten([result]) if isinstance(n, Node))
+
+
+def _source_file(value: Any) -> Optional[str]:
+    """the file a factory or node function was defined in"""
+    func = value.func if isinstance(value, Node) else value
+    while isinstance(func, partial):
+        func = func.func
+    code = getattr(func, "__code__", None)
+    return None if code is None else code.co_filename
+
+
+def _stat(file: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _unchanged(sources: Dict[str, Any]) -> bool:
+    return all(_stat(file) == stat for file, stat in sources.items())
@@ -0,0 +1,157 @@
+"""
+filters
+
+This module provides `PathFilter`, the include and exclude globs applied while
+walking for modules with `find_kedro(include=..., exclude=...)`.
+
+Globs are matched against paths relative to the walked directory with forward
+slashes, the same way file patterns are matched, so `*` also matches across
+directories, and a leading `**/` also matches at the top of the tree.  A glob
+that matches a directory applies to everything beneath it.  Excluded
+directories, and directories that no include glob could match anything
+beneath, are pruned without being descended into, and excluded files are never
+imported.  Filters narrow the files `file_patterns` matched, they never add
+files.
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(
+    include=["pipelines/data_science/**"], exclude=["**/legacy/**"]
+)
+```
+"""
+import os
+from typing import Callable, List, Optional
+
+from find_kedro import discovery
+
+# characters that start a wildcard in a glob
+WILDCARDS = "*?["
+
+
+class PathFilter:
+    """
+    include and exclude globs matched against relative paths
+
+    Arguments
+        include {List[str]} -- only walk paths matching one of these globs, every
+            path is included when empty
+        exclude {List[str]} -- never walk paths matching one of these globs
+    """
+
+    def __init__(self, include: List[str], exclude: List[str]) -> None:
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self._include = _matcher(self.include)
+        self._include_tree = _matcher(_trees(self.include))
+        self._exclude = _matcher(self.exclude)
+        self._exclude_tree = _matcher(_trees(self.exclude))
+        self._prefixes = tuple(
+            os.path.normcase(_literal_prefix(pattern)) for pattern in self.include
+        )
+
+    def excludes_directory(self, relative: str) -> bool:
+        """True when nothing beneath the directory may be walked"""
+        return self._exclude(relative) or self._exclude_tree(relative + "/")
+
+    def includes_directory(self, relative: str) -> bool:
+        """True when everything beneath the directory is included"""
+        return (
+            not self.include
+            or self._include(relative)
+            or self._include_tree(relative + "/")
+        )
+
+    def may_include(self, relative: str) -> bool:
+        """True when an include glob could match something beneath the directory"""
+        if not self.include:
+            return True
+        directory = os.path.normcase(relative) + "/"
+        return any(
+            prefix.startswith(directory) or directory.startswith(prefix)
+            for prefix in self._prefixes
+        )
+
+    def accepts_file(self, relative: str, included: bool = False) -> bool:
+        """
+        True when a file may be imported
+
+        Arguments
+            relative {str} -- path of the file relative to the walked directory
+            included {bool} -- a directory above the file is included
+        """
+        if self._exclude(relative):
+            return False
+        return included or not self.include or self._include(relative)
+
+    def accepts_path(self, relative: str) -> bool:
+        """`accepts_file` for a file whose directories were not walked"""
+        parts = relative.split("/")
+        included = False
+        for depth in range(1, len(parts)):
+            parent = "/".join(parts[:depth])
+            if self.excludes_directory(parent):
+                return False
+            included = included or self.includes_directory(parent)
+        return self.accepts_file(relative, included)
+
+
+def compile_path_filter(
+    include: Optional[discovery.raw_pattern_type] = None,
+    exclude: Optional[discovery.raw_pattern_type] = None,
+) -> Optional[PathFilter]:
+    """
+    builds a `PathFilter` from user input
+
+    Arguments
+        include {list} -- path globs to include, or None for every path
+        exclude {list} -- path globs to exclude, or None for no path
+
+    Returns
+        PathFilter -- the filter, or None when there is nothing to filter
+    """
+    include_globs = _cleanse_globs(include)
+    exclude_globs = _cleanse_globs(exclude)
+    if not include_globs and not exclude_globs:
+        return None
+    return PathFilter(include_globs, exclude_globs)
+
+
+def _cleanse_globs(globs: Optional[discovery.raw_pattern_type]) -> List[str]:
+    if globs is None:
+        return []
+    if isinstance(globs, str):
+        globs = [globs]
+    cleansed = []
+    for glob in discovery._cleanse_inputs(globs, is_file_pattern_type=False):
+        glob = glob.replace("\\", "/")
+        while glob.startswith("./"):
+            glob = glob[2:]
+        glob = glob.rstrip("/")
+        if glob:
+            cleansed.append(glob)
+        # a leading **/ also matches at the top of the tree
+        if glob.startswith("**/") and glob[3:]:
+            cleansed.append(glob[3:])
+    return cleansed
+
+
+def _matcher(patterns: List[str]) -> Callable[[str], bool]:
+    return discovery._compile_patterns(tuple(patterns))
+
+
+def _trees(patterns: List[str]) -> List[str]:
+    """
+    globs ending in a wildcard, which match everything beneath any directory
+    they match with a trailing slash
+    """
+    return [pattern for pattern in patterns if pattern.endswith("*")]
+
+
+def _literal_prefix(pattern: str) -> str:
+    """the part of a glob before its first wildcard"""
+    for index, character in enumerate(pattern):
+        if character in WILDCARDS:
+            return pattern[:index]
+    return pattern + "/"
@@ -0,0 +1,168 @@
+"""
+fingerprints
+
+This module provides `find_kedro_fingerprints`, which discovers pipelines the
+way `find_kedro` does and returns a stable hash of each one.
+
+Runners and CI caches can compare fingerprints to skip planning or running a
+pipeline that has not changed.  A node's fingerprint covers its name, inputs,
+outputs, tags, and the bytecode of its function, and a pipeline's covers the
+fingerprints of its nodes regardless of their order.  Function hashes are
+computed once per code object and cached.
+
+Fingerprints leave out where a project is checked out and the names modules
+are imported as, so they match across machines and runs.  They do depend on
+the Python version, which compiles functions to different bytecode, and they
+do not cover module globals or closures a function reads when it runs.
+
+``` python
+from find_kedro import find_kedro_fingerprints
+
+fingerprints = find_kedro_fingerprints(directory="src")
+fingerprints["__default__"]
+```
+"""
+import hashlib
+import threading
+from functools import partial
+from types import CodeType
+from typing import Any, Callable, Dict, Mapping
+from weakref import WeakKeyDictionary
+
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+from find_kedro import core
+from find_kedro.parallel import DeferredFunction
+
+_code_lock = threading.Lock()
+_code_hashes: "WeakKeyDictionary[CodeType, str]" = WeakKeyDictionary()
+
+
+def find_kedro_fingerprints(**kwargs: Any) -> Dict[str, str]:
+    """
+    discovers pipelines like `find_kedro` and fingerprints each of them
+
+    Arguments
+        **kwargs -- any argument of `find_kedro`
+
+    Returns
+        dict -- hex fingerprints keyed by pipeline name, `__default__` included
+    """
+    return pipeline_fingerprints(core.find_kedro(**kwargs))
+
+
+def pipeline_fingerprints(pipelines: Mapping[str, Pipeline]) -> Dict[str, str]:
+    """
+    fingerprints every pipeline
+
+    Arguments
+        pipelines {dict} -- pipelines keyed by name, as returned by `find_kedro`
+
+    Returns
+        dict -- hex fingerprints keyed by pipeline name
+    """
+    return {key: pipeline_fingerprint(pipeline) for key, pipeline in pipelines.items()}
+
+
+def pipeline_fingerprint(pipeline: Pipeline) -> str:
+    """
+    hashes the fingerprints of a pipeline's nodes in sorted order, so the order
+    nodes were added or sorted in does not matter
+
+    Arguments
+        pipeline {Pipeline} -- pipeline to fingerprint
+
+    Returns
+        str -- hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    for fingerprint in sorted(node_fingerprint(n) for n in pipeline.nodes):
+        digest.update(fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+def node_fingerprint(kedro_node: Node) -> str:
+    """
+    hashes a node's name, inputs, outputs, tags, and function
+
+    Arguments
+        kedro_node {Node} -- node to fingerprint
+
+    Returns
+        str -- hex sha256 digest
+    """
+    fields = (
+        kedro_node.name,
+        getattr(kedro_node, "_inputs", kedro_node.inputs),
+        getattr(kedro_node, "_outputs", kedro_node.outputs),
+        sorted(kedro_node.tags),
+        function_fingerprint(kedro_node.func),
+    )
+    return hashlib.sha256(_stable_repr(fields).encode("utf-8")).hexdigest()
+
+
+def function_fingerprint(func: Callable[..., Any]) -> str:
+    """
+    hashes a function's qualified name and bytecode, including the functions
+    nested in it, unwrapping partials and functions found in worker processes
+
+    Arguments
+        func {callable} -- node function
+
+    Returns
+        str -- hex sha256 digest
+    """
+    if isinstance(func, DeferredFunction):
+        func = func.resolve()
+    if isinstance(func, partial):
+        inner = function_fingerprint(func.func)
+        return _hash(_stable_repr(("partial", inner, func.args, func.keywords)))
+    code = getattr(func, "__code__", None)
+    name = getattr(func, "__qualname__", type(func).__qualname__)
+    if not isinstance(code, CodeType):
+        module = getattr(func, "__module__", None) or type(func).__module__
+        return _hash(_stable_repr(("callable", module, name)))
+    return _hash(_stable_repr(("function", name, _code_hash(code))))
+
+
+def _code_hash(code: CodeType) -> str:
+    with _code_lock:
+        cached = _code_hashes.get(code)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256(code.co_code)
+    digest.update(_stable_repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            digest.update(_code_hash(const).encode("ascii"))
+        else:
+            digest.update(_stable_repr(const).encode("utf-8"))
+    with _code_lock:
+        _code_hashes[code] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def _stable_repr(value: Any) -> str:
+    """
+    a repr that is the same in every process, sets are sorted and objects
+    whose repr may hold an address are reduced to their type
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "({})".format(",".join(_stable_repr(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return "{{{}}}".format(",".join(sorted(_stable_repr(item) for item in value)))
+    if isinstance(value, dict):
+        items = sorted(
+            (_stable_repr(key), _stable_repr(item)) for key, item in value.items()
+        )
+        return "{{{}}}".format(",".join(f"{key}:{item}" for key, item in items))
+    if isinstance(value, CodeType):
+        return _code_hash(value)
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,174 @@
+"""
+imports
+
+This module provides `ModuleRegistry`, which makes sure each source file is
+executed at most once while pipelines are discovered.
+
+Modules are keyed by their resolved file path.  When `pipeline.py` imports
+`.nodes` before discovery reaches `nodes.py`, the module the import created is
+reused rather than executed again.  Files that still end up executed more than
+once, such as a module imported both through the project package and through
+an absolute import of its real package, are reported by `duplicates`.
+"""
+import os
+import sys
+import threading
+import weakref
+from collections import Counter
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Union
+
+# prefix of the packages project directories are imported as, see
+# `discovery._project_package`
+PROJECT_PREFIX = "_find_kedro_"
+
+# modules executed by any registry, which other discoveries running at the same
+# time must not reuse, even before they have finished executing
+_executed: "weakref.WeakSet[ModuleType]" = weakref.WeakSet()
+
+# registries that have not been released yet, while another one is active the
+# project modules no registry recorded may still be in use by it
+_active_lock = threading.Lock()
+_active: "weakref.WeakSet[ModuleRegistry]" = weakref.WeakSet()
+
+
+class ModuleRegistry:
+    """modules executed during a single discovery, keyed by resolved file path"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._modules: Dict[str, ModuleType] = {}
+        # names modules were executed as, kept after they are released
+        self._names: Dict[str, str] = {}
+        # modules imported before discovery started are never reused, so every
+        # discovery sees the current source of each file
+        self._before = dict(sys.modules)
+        self.executions: Counter = Counter()
+        with _active_lock:
+            _active.add(self)
+
+    def get(self, path: Union[str, Path], name: str) -> Optional[ModuleType]:
+        """
+        returns the module already executed from path during this discovery
+
+        Arguments
+            path {Path} -- file about to be executed
+            name {str} -- dotted name the file is about to be executed as
+
+        Returns
+            module -- the executed module, or None if path was not executed yet
+        """
+        key = _resolve(path)
+        with self._lock:
+            if key in self._modules:
+                return self._modules[key]
+            module = sys.modules.get(name)
+            if (
+                module is not None
+                and self._before.get(name) is not module
+                and module not in _executed
+                and not getattr(module.__spec__, "_initializing", False)
+                and _module_file(module) == key
+            ):
+                # another module imported this file through the project package
+                self._modules[key] = module
+                self._names[key] = name
+                self.executions[key] += 1
+                return module
+        return None
+
+    def add(self, path: Union[str, Path], module: ModuleType) -> None:
+        """records that path is executed as module, before it is executed"""
+        key = _resolve(path)
+        with self._lock:
+            self._modules[key] = module
+            self._names[key] = module.__name__
+            self.executions[key] += 1
+            _executed.add(module)
+
+    def release(self, path: Union[str, Path]) -> None:
+        """
+        drops every reference the registry and the import system hold to the
+        module executed from path, so it is freed once its nodes are
+
+        A module that imports path after it is released executes it again.
+        """
+        key = _resolve(path)
+        with self._lock:
+            module = self._modules.pop(key, None)
+        if module is None:
+            return
+        _unregister(module.__name__, module)
+
+    def release_all(self) -> None:
+        """
+        drops every module this registry recorded from `sys.modules`, so they
+        are freed once their nodes are
+
+        Project modules no registry recorded, such as helpers the recorded
+        modules imported, are dropped too when no other registry is active,
+        as other discoveries running at the same time may still reuse them.
+        Project packages are always kept, and modules still executing are
+        left for the discovery executing them.
+        """
+        with self._lock:
+            recorded = list(self._modules.values())
+            self._modules.clear()
+        with _active_lock:
+            _active.discard(self)
+            alone = not _active
+        for module in recorded:
+            _unregister(module.__name__, module)
+        if not alone:
+            return
+        for name, module in list(sys.modules.items()):
+            if not name.startswith(PROJECT_PREFIX) or "." not in name:
+                continue
+            if self._before.get(name) is module or hasattr(module, "__path__"):
+                continue
+            if module in _executed:
+                # recorded by a registry that is not released yet
+                continue
+            if getattr(getattr(module, "__spec__", None), "_initializing", False):
+                continue
+            _unregister(name, module)
+
+    def duplicates(self) -> Dict[str, List[str]]:
+        """
+        returns files that were executed more than once during this discovery
+
+        Returns
+            dict -- names of each module executed from a file, keyed by the file
+        """
+        with self._lock:
+            names: Dict[str, List[str]] = {
+                key: [name] for key, name in self._names.items()
+            }
+            for name, module in list(sys.modules.items()):
+                if self._before.get(name) is module:
+                    continue
+                key = _module_file(module)
+                if key in names and module is not self._modules.get(key):
+                    names[key].append(name)
+            for key, count in self.executions.items():
+                names[key].extend([names[key][0]] * (count - 1))
+        return {key: value for key, value in names.items() if len(value) > 1}
+
+
+def _unregister(name: str, module: ModuleType) -> None:
+    """removes module from `sys.modules` and from its parent package"""
+    if sys.modules.get(name) is module:
+        del sys.modules[name]
+    parent, _, child = name.rpartition(".")
+    if getattr(sys.modules.get(parent), child, None) is module:
+        delattr(sys.modules[parent], child)
+
+
+def _resolve(path: Union[str, Path]) -> str:
+    return os.path.realpath(str(path))
+
+
+def _module_file(module: ModuleType) -> Optional[str]:
+    file = getattr(module, "__file__", None)
+    return _resolve(file) if isinstance(file, str) else None
@@ -0,0 +1,108 @@
+"""
+lazy
+
+This module provides the read-only mapping returned by `find_kedro(lazy=True)`.
+
+Keys come from the file walk alone.  A module is only imported when its key is
+accessed, and `__default__` is only assembled when it is requested, which
+imports every module that has not been imported yet.  Imported modules stay in
+`sys.modules`, so a module one key imported is reused when its own key is
+accessed, until every module has been imported or the mapping is freed.
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(lazy=True)
+pipelines["pipelines.data_engineering.pipeline"]  # imports a single module
+```
+"""
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from kedro.pipeline import Pipeline
+
+from find_kedro import discovery
+from find_kedro.factories import FactoryCalls
+from find_kedro.imports import ModuleRegistry
+
+
+class LazyPipelines(Mapping):
+    """
+    mapping of module keys to pipelines that imports modules on first access
+
+    Unlike the dictionary returned by `find_kedro`, keys are known before any
+    module is imported, so a module that holds no matching nodes maps to an
+    empty pipeline rather than being left out.
+
+    create_pipeline factories are run through factories when their module is
+    imported, see `factories`.
+    """
+
+    def __init__(
+        self,
+        keyed_files: Dict[str, Path],
+        directory: Path,
+        patterns: List[str],
+        verbose: bool = False,
+        factories: Optional[FactoryCalls] = None,
+    ) -> None:
+        self._keyed_files = dict(keyed_files)
+        self._directory = directory
+        self._patterns = list(patterns)
+        self._verbose = verbose
+        self._factories = factories
+        self._nodes: Dict[str, List] = {}
+        self._pipelines: Dict[str, Pipeline] = {}
+        self._lock = threading.RLock()
+        self._modules = ModuleRegistry()
+        weakref.finalize(self, self._modules.release_all)
+
+    def __getitem__(self, key: str) -> Pipeline:
+        with self._lock:
+            if key not in self._pipelines:
+                if key == "__default__":
+                    self._pipelines[key] = self._default()
+                elif key in self._keyed_files:
+                    self._pipelines[key] = Pipeline(self._module_nodes(key))
+                else:
+                    raise KeyError(key)
+            return self._pipelines[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._keyed_files
+        yield "__default__"
+
+    def __len__(self) -> int:
+        return len(self._keyed_files) + 1
+
+    def __contains__(self, key: object) -> bool:
+        return key == "__default__" or key in self._keyed_files
+
+    def __repr__(self) -> str:
+        loaded = [key for key in self if key in self._pipelines]
+        return f"LazyPipelines(keys={list(self)}, loaded={loaded})"
+
+    @property
+    def loaded(self) -> List[str]:
+        """keys whose pipelines have already been built"""
+        return list(self._pipelines)
+
+    def _module_nodes(self, key: str) -> List:
+        if key not in self._nodes:
+            module = discovery._import(
+                self._keyed_files[key], self._directory, modules=self._modules
+            )
+            self._nodes[key] = discovery._discover_nodes(
+                module, self._patterns, verbose=self._verbose, factories=self._factories
+            )
+            discovery._vprint("lazily imported module", self._verbose, key=key)
+            if len(self._nodes) == len(self._keyed_files):
+                self._modules.release_all()
+        return self._nodes[key]
+
+    def _default(self) -> Pipeline:
+        return discovery._default_pipeline(
+            [self._module_nodes(key) for key in self._keyed_files]
+        )
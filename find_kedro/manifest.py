@@ -0,0 +1,252 @@
+"""
+manifest
+
+This module builds and loads discovery manifests for trees that do not change
+after they are deployed, such as the source inside a container image.
+
+A manifest lists every module that holds nodes, the exact attributes its nodes
+came from, and a content hash of every file the patterns matched.  Loading it
+imports only the listed modules and reads only the listed attributes, without
+walking the tree or matching names against patterns.  When any hash differs,
+or the patterns differ from the ones the manifest was built with, the manifest
+is stale and `find_kedro` falls back to normal discovery.  This is decided
+before any module is imported, so no module runs twice.  Files added after
+the manifest was built are not noticed until it is built again.
+
+``` console
+find-kedro manifest build --directory src --output find-kedro-manifest.json
+```
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(directory="src", manifest="find-kedro-manifest.json")
+```
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+from find_kedro import factories as _factories
+from find_kedro import filters as _filters
+from find_kedro import prefilter as _prefilter
+from find_kedro.imports import ModuleRegistry
+from find_kedro.profiling import Profile
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def build_manifest(
+    file_patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    directory: Union[str, Path] = ".",
+    prefilter: bool = True,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """
+    discovers pipelines the way `find_kedro` does and describes where they are
+
+    Arguments
+        file_patterns {list} -- list of file globbing patterns
+        patterns {list} -- list of variable globbing patterns
+        directory {str} -- directory to look for pipeline modules in
+        prefilter {bool} -- skip importing files without pattern matched names
+        verbose {bool} -- prints extra information
+
+    Returns
+        dict -- manifest to pass to `write_manifest`
+    """
+    directory = Path(directory)
+    cleansed_file_patterns = discovery._cleanse_inputs(file_patterns, verbose=verbose)
+    cleansed_patterns = discovery._cleanse_inputs(
+        patterns, verbose=verbose, is_file_pattern_type=False
+    )
+    files = discovery._walk_files(
+        directory, discovery._compile_file_patterns(cleansed_file_patterns)
+    )
+    candidates = files
+    if prefilter:
+        candidates, _ = _prefilter.prefilter_files(files, cleansed_patterns)
+    executed = ModuleRegistry()
+    factories = _factories.FactoryCalls()
+    modules = []
+    try:
+        for file in candidates:
+            module = discovery._import(
+                file, directory, verbose=verbose, modules=executed
+            )
+            attributes = [
+                name
+                for name, value in discovery._match_variables(module, cleansed_patterns)
+                if discovery._collect_nodes(value, factories)
+            ]
+            if attributes:
+                modules.append(
+                    {
+                        "key": discovery._module_key(file, directory),
+                        "file": _relative(file, directory),
+                        "attributes": attributes,
+                    }
+                )
+    finally:
+        executed.release_all()
+    discovery._vprint("built manifest", verbose, modules=modules)
+    return {
+        "version": MANIFEST_VERSION,
+        "file_patterns": cleansed_file_patterns,
+        "patterns": cleansed_patterns,
+        "hashes": {
+            _relative(file, directory): discovery._hash_file(file) for file in files
+        },
+        "modules": modules,
+    }
+
+
+def write_manifest(manifest: Dict[str, Any], path: Union[str, Path]) -> None:
+    """writes manifest to path atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(str(tmp), str(path))
+
+
+def load_manifest_nodes(
+    path: Union[str, Path],
+    directory: Path,
+    file_patterns: List[str],
+    patterns: List[str],
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    modules: Optional[ModuleRegistry] = None,
+    path_filter: Optional[_filters.PathFilter] = None,
+    factories: Optional[_factories.FactoryCalls] = None,
+) -> Optional[Dict[str, List[Node]]]:
+    """
+    imports the modules listed in a manifest and reads their listed attributes
+
+    Arguments
+        path {Path} -- manifest written by `write_manifest`
+        directory {Path} -- directory the manifest's files are relative to
+        file_patterns {List[str]} -- cleansed file patterns
+        patterns {List[str]} -- cleansed variable patterns
+        verbose {bool} -- prints extra information
+        profile {Profile} -- records the time and nodes of each module
+        modules {ModuleRegistry} -- modules executed earlier in the same discovery
+        path_filter {PathFilter} -- only modules it accepts are imported
+        factories {FactoryCalls} -- runs create_pipeline factories
+
+    Returns
+        dict -- lists of nodes keyed by module key, or None when the manifest is
+            missing, unreadable, or stale
+    """
+    profile = profile or Profile()
+    manifest = _read_manifest(path)
+    if manifest is None:
+        return None
+    if manifest["file_patterns"] != file_patterns or manifest["patterns"] != patterns:
+        logger.warning("manifest %s was built with other patterns", path)
+        return None
+    hashes = manifest["hashes"]
+    for relative, digest in hashes.items():
+        try:
+            stale = discovery._hash_file(directory / relative) != digest
+        except OSError:
+            stale = True
+        if stale:
+            logger.warning("manifest %s is stale, %s changed", path, relative)
+            return None
+    # everything is checked before the first import, so falling back never
+    # executes a module a second time
+    unhashed = [e["file"] for e in manifest["modules"] if e["file"] not in hashes]
+    if unhashed:
+        logger.warning("manifest %s has no hashes for %s", path, unhashed)
+        return None
+
+    nodes = {}
+    for entry in manifest["modules"]:
+        if path_filter is not None and not path_filter.accepts_path(entry["file"]):
+            profile.pruned["modules"] += 1
+            continue
+        with profile.phase("import"):
+            start = time.perf_counter()
+            module = discovery._import(
+                directory / entry["file"], directory, verbose, modules=modules
+            )
+            profile.record_module(
+                entry["key"],
+                directory / entry["file"],
+                import_time=time.perf_counter() - start,
+            )
+        with profile.phase("discovery"):
+            missing = [a for a in entry["attributes"] if not hasattr(module, a)]
+            if missing:
+                logger.warning(
+                    "manifest %s lists %s, which %s did not define",
+                    path,
+                    missing,
+                    entry["key"],
+                )
+            module_nodes = discovery._merge_nodes(
+                [
+                    discovery._collect_nodes(getattr(module, a), factories)
+                    for a in entry["attributes"]
+                    if a not in missing
+                ]
+            )
+        profile.record_module(entry["key"], nodes=len(module_nodes))
+        if module_nodes != []:
+            nodes[entry["key"]] = module_nodes
+    discovery._vprint(
+        "loaded manifest", verbose, manifest=str(path), modules=list(nodes)
+    )
+    return nodes
+
+
+def _read_manifest(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    try:
+        manifest = json.loads(Path(path).read_text())
+    except OSError:
+        logger.warning("manifest %s could not be read", path)
+        return None
+    except ValueError:
+        logger.warning("manifest %s is not valid json", path)
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        logger.warning("manifest %s was written by another version", path)
+        return None
+    if not _well_formed(manifest):
+        logger.warning("manifest %s is malformed", path)
+        return None
+    return manifest
+
+
+def _well_formed(manifest: Dict[str, Any]) -> bool:
+    """checks the shape of a manifest, so loading it fails before any import"""
+    modules = manifest.get("modules")
+    return (
+        isinstance(manifest.get("file_patterns"), list)
+        and isinstance(manifest.get("patterns"), list)
+        and isinstance(manifest.get("hashes"), dict)
+        and isinstance(modules, list)
+        and all(
+            isinstance(entry, dict)
+            and isinstance(entry.get("key"), str)
+            and isinstance(entry.get("file"), str)
+            and isinstance(entry.get("attributes"), list)
+            for entry in modules
+        )
+    )
+
+
+def _relative(path: Path, directory: Path) -> str:
+    """path relative to directory with forward slashes, as stored in manifests"""
+    return Path(os.path.relpath(path, directory)).as_posix()
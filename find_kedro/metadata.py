@@ -0,0 +1,228 @@
+"""
+metadata
+
+This module provides `find_kedro_metadata`, which discovers pipelines the way
+`find_kedro` does and returns only a description of their nodes.
+
+Listings, CI checks, and dashboards need node names, datasets, tags, module
+keys, and source locations, not live `Node` objects holding their functions
+and closures.  `NodeTable` keeps one column per field, with strings interned
+and module keys, files, and line numbers stored as compact arrays, so tables
+of many thousands of nodes are cheap to hold and to pickle.
+
+``` python
+from find_kedro import find_kedro_metadata
+
+table = find_kedro_metadata(directory="src")
+for record in table:
+    print(record.module, record.name, record.inputs, record.file, record.line)
+table.column("name")
+```
+"""
+import inspect
+import sys
+from array import array
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+from find_kedro import core
+from find_kedro.parallel import DeferredFunction
+
+# fields of every `NodeRecord`, in order
+FIELDS = ("module", "name", "inputs", "outputs", "tags", "file", "line")
+
+
+class NodeRecord(NamedTuple):
+    """description of a single node, as found in one module"""
+
+    module: str
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    tags: Tuple[str, ...]
+    file: Optional[str]
+    line: Optional[int]
+
+
+class NodeTable:
+    """
+    columnar table of the nodes of every module, one row per node and module
+
+    Rows are in the order of the modules, and of the nodes within each
+    module's pipeline.  A node held by several modules has a row for each.
+    """
+
+    __slots__ = (
+        "modules",
+        "files",
+        "names",
+        "inputs",
+        "outputs",
+        "tags",
+        "_module",
+        "_file",
+        "_line",
+        "_positions",
+    )
+
+    def __init__(self) -> None:
+        # distinct module keys and files, which the `_module` and `_file`
+        # columns index so each is stored once
+        self.modules: List[str] = []
+        self.files: List[str] = []
+        self.names: List[str] = []
+        self.inputs: List[Tuple[str, ...]] = []
+        self.outputs: List[Tuple[str, ...]] = []
+        self.tags: List[Tuple[str, ...]] = []
+        self._module = array("l")
+        self._file = array("l")  # -1 when the file is unknown
+        self._line = array("l")  # 0 when the line is unknown
+        self._positions: Dict[str, Dict[str, int]] = {"modules": {}, "files": {}}
+
+    def append(self, module: str, node: Node) -> None:
+        """adds a row describing node as found in module"""
+        file, line = _source(node.func)
+        self._module.append(self._position("modules", module))
+        self._file.append(-1 if file is None else self._position("files", file))
+        self._line.append(line or 0)
+        self.names.append(sys.intern(node.name))
+        self.inputs.append(_interned(node.inputs))
+        self.outputs.append(_interned(node.outputs))
+        self.tags.append(_interned(sorted(node.tags)))
+
+    def column(self, field: str) -> List[Any]:
+        """returns every value of field, one of `FIELDS`, in row order"""
+        if field == "module":
+            return [self.modules[index] for index in self._module]
+        if field == "file":
+            return [self.files[index] if index >= 0 else None for index in self._file]
+        if field == "line":
+            return [line or None for line in self._line]
+        columns: Dict[str, List[Any]] = {
+            "name": self.names,
+            "inputs": self.inputs,
+            "outputs": self.outputs,
+            "tags": self.tags,
+        }
+        return list(columns[field])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> NodeRecord:
+        file = self._file[index]
+        return NodeRecord(
+            module=self.modules[self._module[index]],
+            name=self.names[index],
+            inputs=self.inputs[index],
+            outputs=self.outputs[index],
+            tags=self.tags[index],
+            file=self.files[file] if file >= 0 else None,
+            line=self._line[index] or None,
+        )
+
+    def __iter__(self) -> Iterator[NodeRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NodeTable):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"NodeTable(rows={len(self)}, modules={len(self.modules)})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # positions are rebuilt from modules and files rather than pickled
+        return {
+            name: getattr(self, name) for name in self.__slots__ if name != "_positions"
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._positions = {
+            values: {value: index for index, value in enumerate(getattr(self, values))}
+            for values in ("modules", "files")
+        }
+
+    def _position(self, values: str, value: str) -> int:
+        """index of value in the modules or files list, adding it if it is new"""
+        positions = self._positions[values]
+        if value not in positions:
+            positions[value] = len(positions)
+            getattr(self, values).append(sys.intern(value))
+        return positions[value]
+
+
+def find_kedro_metadata(**kwargs: Any) -> NodeTable:
+    """
+    discovers pipelines like `find_kedro` and describes their nodes
+
+    Modules are still imported to find their nodes, but the table holds no
+    reference to the nodes or their functions once it is returned.
+
+    Arguments
+        **kwargs -- any argument of `find_kedro` except lazy
+
+    Returns
+        NodeTable -- a row for every node of every module
+    """
+    if kwargs.get("lazy"):
+        raise ValueError("find_kedro_metadata can not be lazy")
+    return node_table(core.find_kedro(**kwargs))
+
+
+def node_table(pipelines: Mapping[str, Pipeline]) -> NodeTable:
+    """
+    describes the nodes of every module pipeline, leaving out `__default__`
+
+    Arguments
+        pipelines {dict} -- pipelines keyed by module key, as returned by
+            `find_kedro`
+
+    Returns
+        NodeTable -- a row for every node of every module
+    """
+    table = NodeTable()
+    for key, pipeline in pipelines.items():
+        if key == "__default__":
+            continue
+        for node in pipeline.nodes:
+            table.append(key, node)
+    return table
+
+
+def _interned(names: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(name) for name in names)
+
+
+def _source(func: Callable) -> Tuple[Optional[str], Optional[int]]:
+    """file and first line a node function is defined on, where known"""
+    if isinstance(func, DeferredFunction):
+        return func.path, None
+    while isinstance(func, partial):
+        func = func.func
+    try:
+        func = inspect.unwrap(func)
+    except ValueError:
+        return None, None
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return None, None
+    return code.co_filename, code.co_firstlineno
@@ -0,0 +1,155 @@
+"""
+packages
+
+This module discovers pipelines in an installed package with
+`find_kedro(package=...)` rather than by walking a directory.
+
+Submodules are listed with `pkgutil.iter_modules` and imported through the
+normal import system, so packages installed from a wheel, zipped, or in a
+zipapp or read-only image work without being extracted.  File patterns are
+matched against each module's file name, `nodes.py` for `pkg.nodes` and
+`__init__.py` for a subpackage, and include and exclude globs against its path
+relative to the package, so the same patterns pick the same modules as walking
+the package's source directory.  Subpackages that are excluded, or that no
+include glob could match anything beneath, are never imported.
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(package="my_project.pipelines")
+```
+"""
+import importlib
+import pkgutil
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+from find_kedro.factories import FactoryCalls
+from find_kedro.filters import PathFilter
+from find_kedro.profiling import Profile
+
+
+def find_package_modules(
+    package: str,
+    file_patterns: List[str],
+    verbose: bool = False,
+    path_filter: Optional[PathFilter] = None,
+) -> Dict[str, str]:
+    """
+    lists the submodules of package whose file names match file_patterns
+
+    Arguments
+        package {str} -- dotted name of an importable package
+        file_patterns {List[str]} -- cleansed file globbing patterns
+        verbose {bool} -- prints extra information
+        path_filter {PathFilter} -- include and exclude globs for paths
+            relative to the package
+
+    Returns
+        dict -- module names keyed by their dotted name within package, in
+            the order the files would be walked
+    """
+    root = importlib.import_module(package)
+    if not hasattr(root, "__path__"):
+        raise ValueError(f"{package!r} is a module, not a package")
+    modules: Dict[str, str] = {}
+    _walk_package(
+        root,
+        [],
+        discovery._compile_file_patterns(file_patterns),
+        path_filter,
+        path_filter is None,
+        modules,
+    )
+    discovery._vprint(
+        "package modules found", verbose, package=package, modules=modules
+    )
+    return dict(sorted(modules.items()))
+
+
+def discover_package_nodes(
+    keyed_modules: Dict[str, str],
+    patterns: List[str],
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    factories: Optional[FactoryCalls] = None,
+) -> Dict[str, List[Node]]:
+    """
+    imports each module through the import system and discovers its nodes
+
+    Arguments
+        keyed_modules {dict} -- module names keyed by module key
+        patterns {List[str]} -- cleansed variable patterns
+        verbose {bool} -- prints extra information
+        profile {Profile} -- records the import time of each module
+        factories {FactoryCalls} -- runs create_pipeline factories
+
+    Returns
+        dict -- lists of nodes keyed by module key
+    """
+    profile = profile or Profile()
+    imported: Dict[str, Any] = {}
+    with profile.phase("import"):
+        for key, name in keyed_modules.items():
+            start = time.perf_counter()
+            imported[key] = importlib.import_module(name)
+            profile.record_module(
+                key,
+                getattr(imported[key], "__file__", None),
+                import_time=time.perf_counter() - start,
+            )
+    nodes = {}
+    with profile.phase("discovery"):
+        for key, module in imported.items():
+            module_nodes = discovery._discover_nodes(
+                module, patterns, verbose=verbose, factories=factories
+            )
+            profile.record_module(key, nodes=len(module_nodes))
+            if module_nodes != []:
+                nodes[key] = module_nodes
+    return nodes
+
+
+def _walk_package(
+    package: Any,
+    parts: List[str],
+    matcher: Callable[[str], bool],
+    path_filter: Optional[PathFilter],
+    included: bool,
+    modules: Dict[str, str],
+) -> None:
+    """adds the matching modules beneath package to modules, like `_walk_files`"""
+    for info in pkgutil.iter_modules(package.__path__):
+        name = f"{package.__name__}.{info.name}"
+        child = [*parts, info.name]
+        relative = "/".join(child)
+        if not info.ispkg:
+            if matcher(f"{info.name}.py") and (
+                path_filter is None
+                or path_filter.accepts_file(relative + ".py", included)
+            ):
+                modules[".".join(child)] = name
+            continue
+        child_included = included
+        if path_filter is not None:
+            child_included = included or path_filter.includes_directory(relative)
+            if path_filter.excludes_directory(relative) or not (
+                child_included or path_filter.may_include(relative)
+            ):
+                continue
+        if matcher("__init__.py") and (
+            path_filter is None
+            or path_filter.accepts_file(relative + "/__init__.py", child_included)
+        ):
+            modules[".".join([*child, "__init__"])] = name
+        _walk_package(
+            importlib.import_module(name),
+            child,
+            matcher,
+            path_filter,
+            child_included,
+            modules,
+        )
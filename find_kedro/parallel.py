@@ -0,0 +1,375 @@
+"""
+parallel
+
+This module imports node modules with a pool of workers.
+
+The process backend runs workers in separate processes.  Workers import each module and run `_discover_nodes` on it, then send back
+plain, picklable descriptions of the nodes they found.  The parent rebuilds
+kedro nodes from those descriptions without importing the module itself.
+Each rebuilt node's function is a `DeferredFunction` that imports its module
+in the calling process the first time the node is actually run.  The nodes
+rebuilt from one module share a `DeferredModule`, which imports it once for
+all of them, again only once its file changes, and is freed with the nodes.
+
+The thread backend is lighter and suits file systems where reading sources
+dominates, such as NFS.  Threads read and compile every source concurrently
+while the calling thread executes the compiled modules in file order.
+
+``` python
+from find_kedro import find_kedro
+
+pipelines = find_kedro(jobs=8, preload=["pandas"])
+pipelines = find_kedro(jobs=8, backend="thread")
+```
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from kedro.pipeline import node
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+from find_kedro import factories as _factories
+from find_kedro.imports import ModuleRegistry
+from find_kedro.profiling import Profile
+
+# (module key, path, directory, patterns, factory kwargs) sent to a worker
+module_task_type = Tuple[str, str, str, List[str], Dict[str, Any]]
+# (module key, node descriptions, import seconds) as returned by a worker
+described_module_type = Tuple[str, List[Dict[str, Any]], float]
+
+
+def discover_nodes_parallel(
+    nodes_files: Dict[str, Path],
+    directory: Path,
+    patterns: List[str],
+    jobs: int,
+    preload: Optional[Iterable[str]] = None,
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    factories: Optional[_factories.FactoryCalls] = None,
+) -> Dict[str, List[Node]]:
+    """
+    imports modules and discovers their nodes in a pool of worker processes
+
+    Arguments
+        nodes_files {dict} -- files to import keyed by their module key
+        directory {Path} -- directory the modules are imported from
+        patterns {List[str]} -- cleansed variable patterns
+        jobs {int} -- number of worker processes
+        preload {List[str]} -- packages the forkserver imports once up front
+        verbose {bool} -- prints extra information
+        profile {Profile} -- records the import time workers measured for each
+            module, importing and discovering all count as the import phase
+        factories {FactoryCalls} -- its kwargs are passed to create_pipeline
+            factories, which run in the workers and are not counted in its
+            stats
+
+    Returns
+        dict -- lists of nodes keyed by module key, in the order of nodes_files
+    """
+    profile = profile or Profile()
+    context = _get_context(preload)
+    # workers do not share this process's working directory
+    directory = Path(directory).resolve()
+    paths = {key: str(Path(path).resolve()) for key, path in nodes_files.items()}
+    factory_kwargs = {} if factories is None else factories.kwargs
+    tasks = [
+        (key, path, str(directory), list(patterns), factory_kwargs)
+        for key, path in paths.items()
+    ]
+    nodes: Dict[str, List[Node]] = {}
+    with profile.phase("import"), ProcessPoolExecutor(
+        max_workers=jobs, mp_context=context
+    ) as executor:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        for key, descriptions, import_time in executor.map(
+            _describe_module, tasks, chunksize=chunksize
+        ):
+            module = DeferredModule(
+                paths[key], str(directory), patterns, factory_kwargs
+            )
+            module_nodes = [
+                rebuild_node(description, module) for description in descriptions
+            ]
+            profile.record_module(
+                key, nodes_files[key], import_time=import_time, nodes=len(module_nodes)
+            )
+            if module_nodes != []:
+                nodes[key] = module_nodes
+    discovery._vprint("nodes discovered in worker processes", verbose, jobs=jobs)
+    return nodes
+
+
+def discover_nodes_threaded(
+    nodes_files: Dict[str, Path],
+    directory: Path,
+    patterns: List[str],
+    jobs: int,
+    verbose: bool = False,
+    profile: Optional[Profile] = None,
+    modules: Optional[ModuleRegistry] = None,
+    factories: Optional[_factories.FactoryCalls] = None,
+) -> Dict[str, List[Node]]:
+    """
+    reads and compiles modules in threads, then executes them in order
+
+    Modules are executed on the calling thread in the order of nodes_files
+    without changing the working directory.  Time spent reading, compiling,
+    and executing each module is reported when verbose.
+
+    Arguments
+        nodes_files {dict} -- files to import keyed by their module key
+        directory {Path} -- directory the modules are imported from
+        patterns {List[str]} -- cleansed variable patterns
+        jobs {int} -- number of threads reading and compiling sources
+        verbose {bool} -- prints extra information
+        profile {Profile} -- records the time and nodes of each module
+        modules {ModuleRegistry} -- modules executed earlier in the same discovery
+        factories {FactoryCalls} -- runs create_pipeline factories
+
+    Returns
+        dict -- lists of nodes keyed by module key, in the order of nodes_files
+    """
+    profile = profile or Profile()
+    timings: Dict[str, Dict[str, float]] = {}
+    nodes: Dict[str, List[Node]] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        compiled = {
+            key: executor.submit(_read_and_compile, path)
+            for key, path in nodes_files.items()
+        }
+        for key, path in nodes_files.items():
+            with profile.phase("import"):
+                code, timings[key] = compiled[key].result()
+                start = time.perf_counter()
+                module = discovery._exec_code(
+                    code, path, directory, verbose=verbose, modules=modules
+                )
+                timings[key]["exec"] = time.perf_counter() - start
+            with profile.phase("discovery"):
+                module_nodes = discovery._discover_nodes(
+                    module, patterns, verbose=verbose, factories=factories
+                )
+            profile.record_module(
+                key,
+                path,
+                import_time=sum(timings[key].values()),
+                nodes=len(module_nodes),
+            )
+            if module_nodes != []:
+                nodes[key] = module_nodes
+    discovery._vprint(
+        "import time per phase",
+        verbose,
+        read=sum(t["read"] for t in timings.values()),
+        compile=sum(t["compile"] for t in timings.values()),
+        exec=sum(t["exec"] for t in timings.values()),
+        per_module=timings,
+    )
+    return nodes
+
+
+def _read_and_compile(path: Path) -> Tuple[CodeType, Dict[str, float]]:
+    """reads and compiles a single module, returning the time of each phase"""
+    start = time.perf_counter()
+    source = discovery._read_source(path)
+    read = time.perf_counter()
+    code = discovery._compile_source(source, path)
+    return code, {"read": read - start, "compile": time.perf_counter() - read}
+
+
+def _get_context(preload: Optional[Iterable[str]] = None) -> Any:
+    """
+    returns a forkserver context, or spawn where forkserver is not available
+
+    The forkserver is started once per process, so preload only has an effect
+    on the first parallel discovery.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["find_kedro.core", *(preload or [])])
+    return context
+
+
+def _describe_module(task: module_task_type) -> described_module_type:
+    """imports a module inside a worker and describes the nodes it holds"""
+    key, path, directory, patterns, factory_kwargs = task
+    start = time.perf_counter()
+    module = discovery._import(Path(path), Path(directory))
+    import_time = time.perf_counter() - start
+    factories = _factories.FactoryCalls(factory_kwargs)
+    descriptions = [
+        describe_node(n)
+        for n in discovery._discover_nodes(module, patterns, factories=factories)
+    ]
+    return key, descriptions, import_time
+
+
+def describe_node(kedro_node: Node) -> Dict[str, Any]:
+    """
+    returns a picklable description of a kedro node
+
+    Arguments
+        kedro_node {Node} -- node to describe
+
+    Returns
+        dict -- everything needed to rebuild the node except for its function
+    """
+    func = kedro_node.func
+    func_name = getattr(func, "__name__", None)
+    name = getattr(kedro_node, "_name", None)
+    namespace = getattr(kedro_node, "namespace", None)
+    if name is None and func_name is None:
+        # the generated name depends on the repr of func, keep it as is
+        name = kedro_node.name
+        if namespace:
+            name = name[len(namespace) + 1 :]
+    return {
+        "name": name,
+        "full_name": kedro_node.name,
+        "func_name": func_name,
+        "func_qualname": getattr(func, "__qualname__", func_name),
+        "func_module": getattr(func, "__module__", None),
+        "func_doc": getattr(func, "__doc__", None),
+        "inputs": getattr(kedro_node, "_inputs", kedro_node.inputs),
+        "outputs": getattr(kedro_node, "_outputs", kedro_node.outputs),
+        "tags": sorted(kedro_node.tags),
+        "namespace": namespace,
+        "confirms": getattr(kedro_node, "_confirms", None),
+    }
+
+
+def rebuild_node(description: Dict[str, Any], module: "DeferredModule") -> Node:
+    """
+    rebuilds a kedro node from a description made by `describe_node`
+
+    Arguments
+        description {dict} -- node description
+        module {DeferredModule} -- module the node was discovered in, shared by
+            every node rebuilt from it
+
+    Returns
+        Node -- node running a `DeferredFunction` in place of the original
+    """
+    kwargs: Dict[str, Any] = {"name": description["name"], "tags": description["tags"]}
+    if description["namespace"]:
+        kwargs["namespace"] = description["namespace"]
+    if description["confirms"]:
+        kwargs["confirms"] = description["confirms"]
+    return node(
+        DeferredFunction(description, module),
+        description["inputs"],
+        description["outputs"],
+        **kwargs,
+    )
+
+
+class DeferredModule:
+    """
+    a module discovered in a worker process, imported in this process the
+    first time one of its nodes runs
+
+    The nodes are discovered again whenever the modification time or size of
+    the file changed since it was last imported, so a node never runs code
+    older than its file.  The modules imported are released from
+    `sys.modules` once the nodes are discovered.
+
+    Arguments
+        path {str} -- file the module was discovered in
+        directory {str} -- directory the module is imported from
+        patterns {List[str]} -- cleansed variable patterns
+        factory_kwargs {dict} -- keyword arguments the module's factories were
+            called with
+    """
+
+    def __init__(
+        self,
+        path: str,
+        directory: str,
+        patterns: List[str],
+        factory_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.path = path
+        self.directory = directory
+        self.patterns = list(patterns)
+        self.factory_kwargs = dict(factory_kwargs or {})
+        self._lock = threading.Lock()
+        self._stat: Optional[Tuple[int, int]] = None
+        self._nodes: Optional[Dict[str, Node]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        # a copy imports the module again where it runs
+        state.update(_lock=None, _stat=None, _nodes=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _lock=threading.Lock())
+
+    def node(self, name: str) -> Node:
+        """
+        imports the module if needed and returns its node named name
+
+        Arguments
+            name {str} -- full name of the node
+
+        Returns
+            Node -- node discovered in this process
+        """
+        with self._lock:
+            stat = _factories._stat(self.path)
+            if self._nodes is None or stat != self._stat:
+                self._nodes = self._discover()
+                self._stat = stat
+            return self._nodes[name]
+
+    def _discover(self) -> Dict[str, Node]:
+        modules = ModuleRegistry()
+        try:
+            module = discovery._import(
+                Path(self.path), Path(self.directory), modules=modules
+            )
+            factories = _factories.FactoryCalls(self.factory_kwargs)
+            return {
+                n.name: n
+                for n in discovery._discover_nodes(
+                    module, self.patterns, factories=factories
+                )
+            }
+        finally:
+            modules.release_all()
+
+
+class DeferredFunction:
+    """
+    stands in for a node function that was discovered in a worker process
+
+    The call is forwarded to the function of the node with the same name in
+    module, which is imported on first call.
+    """
+
+    def __init__(self, description: Dict[str, Any], module: DeferredModule) -> None:
+        self.__name__ = description["func_name"] or "<deferred>"
+        self.__qualname__ = description["func_qualname"] or self.__name__
+        self.__module__ = description["func_module"] or __name__
+        self.__doc__ = description["func_doc"]
+        self.node_name = description["full_name"]
+        self.module = module
+        self.path = module.path
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<deferred {self.__qualname__} from {self.path}>"
+
+    def resolve(self) -> Any:
+        """imports the module if needed and returns the original function"""
+        return self.module.node(self.node_name).func
@@ -0,0 +1,153 @@
+"""
+prefilter
+
+This module decides which candidate files are worth importing without
+importing them.
+
+Each file is parsed with `ast` and the names it binds at module level are
+collected: assignments, function and class definitions, imports, `global`
+declarations, and the strings listed in `__all__`.  A file only needs to be
+imported when one of those names matches a variable pattern.  Anything that
+could add names dynamically, such as a star import or a call to `globals()`,
+conservatively forces the import.
+"""
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+from find_kedro import discovery
+
+# calls that can bind module level names the parser cannot see
+DYNAMIC_NAMESPACE_CALLS = frozenset({"globals", "vars", "locals", "exec", "setattr"})
+
+# module level hooks that change what dir(module) returns
+DYNAMIC_NAMESPACE_HOOKS = frozenset({"__getattr__", "__dir__"})
+
+# names imported from these packages are library objects and never user nodes
+IGNORED_IMPORT_PACKAGES = frozenset({"kedro"})
+
+
+def prefilter_files(
+    files: List[Path], patterns: List[str], max_workers: Optional[int] = None
+) -> Tuple[List[Path], List[Path]]:
+    """
+    splits files into those that need to be imported and those that can be skipped
+
+    Files are parsed concurrently, order is preserved in both lists.
+
+    Arguments
+        files {List[Path]} -- candidate files from `_discover_files`
+        patterns {List[str]} -- cleansed variable patterns
+        max_workers {int} -- number of threads used to parse files
+
+    Returns
+        tuple -- (files to import, files skipped)
+    """
+    if not files:
+        return [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        names = list(executor.map(module_names, files))
+
+    keep, skipped = [], []
+    for file, file_names in zip(files, names):
+        if file_names is None or _any_match(file_names, patterns):
+            keep.append(file)
+        else:
+            skipped.append(file)
+    return keep, skipped
+
+
+def module_names(path: Path) -> Optional[Set[str]]:
+    """
+    collects the names a module binds at module level
+
+    Arguments
+        path {Path} -- python source file
+
+    Returns
+        set -- names bound by the module, or None if it must be imported to know
+    """
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    names: Set[str] = set()
+    for node in _module_level_nodes(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            names.update(
+                name
+                for inner in ast.walk(node)
+                if isinstance(inner, ast.Global)
+                for name in inner.names
+            )
+        elif isinstance(node, ast.Import):
+            names.update(
+                alias.asname or alias.name.split(".")[0] for alias in node.names
+            )
+        elif isinstance(node, ast.ImportFrom):
+            if any(alias.name == "*" for alias in node.names):
+                return None
+            if not node.level and _is_ignored_package(node.module):
+                continue
+            names.update(alias.asname or alias.name for alias in node.names)
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in DYNAMIC_NAMESPACE_CALLS
+        ):
+            return None
+        elif isinstance(node, ast.Assign):
+            names.update(_dunder_all(node))
+
+    if names & DYNAMIC_NAMESPACE_HOOKS:
+        return None
+    return names
+
+
+def _module_level_nodes(tree: ast.Module) -> Iterator[ast.AST]:
+    """
+    yields every node outside of function and class bodies
+
+    Definitions themselves are yielded so their names can be collected, but
+    their bodies are not descended into.
+    """
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+        ):
+            continue
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def _dunder_all(node: ast.Assign) -> List[str]:
+    """returns the string constants assigned to `__all__`"""
+    if not any(
+        isinstance(target, ast.Name) and target.id == "__all__"
+        for target in node.targets
+    ):
+        return []
+    if not isinstance(node.value, (ast.List, ast.Tuple)):
+        return []
+    # python 3.7 parses strings as ast.Str which stores its value in `s`
+    values = (
+        getattr(element, "value", getattr(element, "s", None))
+        for element in node.value.elts
+    )
+    return [value for value in values if isinstance(value, str)]
+
+
+def _is_ignored_package(module: Optional[str]) -> bool:
+    return module is not None and module.split(".")[0] in IGNORED_IMPORT_PACKAGES
+
+
+def _any_match(names: Set[str], patterns: List[str]) -> bool:
+    matcher = discovery._compile_patterns(tuple(patterns))
+    return any(matcher(name) for name in names)
@@ -0,0 +1,188 @@
+"""
+profiling
+
+This module provides `Profile`, the report filled in by `find_kedro(profile=...)`.
+
+Every phase of discovery is timed in wall and cpu time, along with how long
+each module took to import and how many nodes it held.  Cpu time is that of
+the calling process, so it leaves out time spent in worker processes.
+
+``` python
+from find_kedro import Profile, find_kedro
+
+profile = Profile()
+pipelines = find_kedro(profile=profile)
+print(profile.format(slowest=5))
+profile.to_json()
+```
+"""
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Union
+
+# phases in the order find_kedro runs them
+PHASES = ("walk", "prefilter", "import", "discovery", "generation")
+
+
+class Profile:
+    """
+    wall and cpu time of each discovery phase, and import time of each module
+
+    Arguments
+        slowest {int} -- number of slowest modules to report
+    """
+
+    def __init__(self, slowest: int = 10) -> None:
+        self.slowest = slowest
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self.pipeline_construction = 0.0
+        # names each file was executed as, for files executed more than once
+        self.duplicates: Dict[str, List[str]] = {}
+        # directories and modules left out by include and exclude globs
+        self.pruned: Dict[str, int] = {"directories": 0, "modules": 0}
+        # files the prefilter skipped for defining no name matching patterns
+        self.prefiltered: List[str] = []
+        # modules over the import budget, timed out, or quarantined
+        self.slow: List[Dict[str, Any]] = []
+        # calls, cache hits, and seconds of each create_pipeline factory
+        self.factories: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """times the block in wall and cpu time, adding to earlier runs of name"""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            times = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            times["wall"] += time.perf_counter() - wall
+            times["cpu"] += time.process_time() - cpu
+
+    def record_module(
+        self,
+        key: str,
+        file: Union[str, Path, None] = None,
+        import_time: Optional[float] = None,
+        nodes: Optional[int] = None,
+    ) -> None:
+        """records what is known about a module, leaving other fields as they are"""
+        module = self.modules.setdefault(
+            key, {"file": None, "import_time": 0.0, "nodes": 0}
+        )
+        if file is not None:
+            module["file"] = str(file)
+        if import_time is not None:
+            module["import_time"] = import_time
+        if nodes is not None:
+            module["nodes"] = nodes
+
+    def report(self, slowest: Optional[int] = None) -> Dict[str, Any]:
+        """
+        returns the profile as plain data
+
+        Arguments
+            slowest {int} -- number of slowest modules to include, defaults to
+                the number given when the profile was made
+
+        Returns
+            dict -- phases, total, modules, slowest, pipeline_construction,
+                duplicates, pruned, prefiltered, slow, and factories
+        """
+        slowest = self.slowest if slowest is None else slowest
+        ranked = sorted(
+            self.modules, key=lambda key: self.modules[key]["import_time"], reverse=True
+        )
+        return {
+            "phases": {
+                name: dict(self.phases[name])
+                for name in sorted(self.phases, key=_phase_order)
+            },
+            "total": {
+                "wall": sum(times["wall"] for times in self.phases.values()),
+                "cpu": sum(times["cpu"] for times in self.phases.values()),
+            },
+            "modules": {key: dict(module) for key, module in self.modules.items()},
+            "slowest": [
+                {"module": key, **self.modules[key]} for key in ranked[:slowest]
+            ],
+            "nodes": sum(module["nodes"] for module in self.modules.values()),
+            "pipeline_construction": self.pipeline_construction,
+            "pruned": dict(self.pruned),
+            "prefiltered": list(self.prefiltered),
+            "slow": [dict(module) for module in self.slow],
+            "factories": {
+                name: dict(factory) for name, factory in self.factories.items()
+            },
+            "duplicates": {
+                file: list(names) for file, names in self.duplicates.items()
+            },
+        }
+
+    def to_json(self, slowest: Optional[int] = None) -> str:
+        """returns `report` as json"""
+        return json.dumps(self.report(slowest), indent=2, sort_keys=True)
+
+    def format(self, slowest: Optional[int] = None) -> str:
+        """returns `report` as a human readable table"""
+        report = self.report(slowest)
+        lines = [f"{'phase':<24} {'wall':>9} {'cpu':>9}"]
+        for name, times in [*report["phases"].items(), ("total", report["total"])]:
+            lines.append(f"{name:<24} {times['wall']:>8.3f}s {times['cpu']:>8.3f}s")
+        lines.append(
+            f"{'pipeline construction':<24} {report['pipeline_construction']:>8.3f}s"
+        )
+        if any(report["pruned"].values()):
+            lines.append(
+                f"pruned {report['pruned']['directories']} directories and "
+                f"{report['pruned']['modules']} modules"
+            )
+        if report["prefiltered"]:
+            lines.append(
+                f"prefilter skipped {len(report['prefiltered'])} files "
+                "with no pattern matched names"
+            )
+            lines.extend(f"          {file}" for file in report["prefiltered"])
+        lines.append("")
+        lines.append(f"{len(report['slowest'])} slowest of {len(self.modules)} modules")
+        for module in report["slowest"]:
+            lines.append(
+                f"{module['import_time']:>8.3f}s {module['nodes']:>6} nodes  "
+                f"{module['module']}"
+            )
+        if report["slow"]:
+            lines.append("")
+            lines.append(f"{len(report['slow'])} slow modules")
+            for module in report["slow"]:
+                notes = [
+                    note
+                    for note in ("timed_out", "skipped", "quarantined")
+                    if module[note]
+                ]
+                lines.append(
+                    f"{module['import_time']:>8.3f}s {module['module']}  "
+                    + ", ".join(note.replace("_", " ") for note in notes)
+                )
+        if report["factories"]:
+            lines.append("")
+            lines.append(f"{len(report['factories'])} pipeline factories")
+            for name, factory in sorted(
+                report["factories"].items(), key=lambda item: -item[1]["time"]
+            ):
+                lines.append(
+                    f"{factory['time']:>8.3f}s {factory['calls']:>6} calls "
+                    f"{factory['hits']:>6} cached  {name}"
+                )
+        if report["duplicates"]:
+            lines.append("")
+            lines.append(f"{len(report['duplicates'])} files executed more than once")
+            for file, names in report["duplicates"].items():
+                lines.append(f"{len(names):>6}x  {file}  {', '.join(names)}")
+        return "\n".join(lines)
+
+
+def _phase_order(name: str) -> int:
+    return PHASES.index(name) if name in PHASES else len(PHASES)
@@ -0,0 +1,378 @@
+"""
+registry
+
+This module provides `PipelineRegistry`, which keeps discovered pipelines in
+memory for long running processes such as a viz server or `find-kedro --watch`.
+
+After the first discovery only modules that were created, modified, or deleted
+are imported again, along with the discovered modules that import them.  Their
+pipelines are replaced, and `__default__` is updated from the nodes that were
+added and removed rather than rebuilt from every module.  Readers always get a
+complete snapshot, a new one is swapped in atomically after each reload.
+
+A module counts as importing another when one of its globals is that module or
+was defined in it, as with `from .nodes import clean`.  Only discovered
+modules are watched, so editing a helper module that no file pattern matches
+is not noticed until a module importing it changes too.
+
+``` python
+from find_kedro import PipelineRegistry
+
+registry = PipelineRegistry(directory="src")
+registry.start()
+registry.pipelines["__default__"]
+```
+"""
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType, ModuleType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+from find_kedro import discovery
+from find_kedro.factories import FactoryCalls
+from find_kedro.filters import compile_path_filter
+from find_kedro.imports import ModuleRegistry
+from find_kedro.prefilter import prefilter_files
+from find_kedro.watch import make_watcher
+
+logger = logging.getLogger(__name__)
+
+# (st_mtime_ns, st_size) used to notice modified files
+file_state_type = Tuple[int, int]
+
+
+class Changes(NamedTuple):
+    """module keys affected by a refresh"""
+
+    created: List[str]
+    modified: List[str]
+    deleted: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.modified or self.deleted)
+
+
+class PipelineRegistry:
+    """
+    in-memory pipelines that are incrementally updated as modules change
+
+    Arguments
+        file_patterns {list} -- list of file globbing patterns
+        patterns {list} -- list of variable globbing patterns
+        directory {str} -- directory to look for pipeline modules in
+        prefilter {bool} -- skip importing files without pattern matched names
+        verbose {bool} -- prints extra information
+        include {list} -- path globs to include, see `find_kedro`
+        exclude {list} -- path globs to exclude, see `find_kedro`
+    """
+
+    def __init__(
+        self,
+        file_patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+        patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+        directory: Union[str, Path] = ".",
+        prefilter: bool = True,
+        verbose: bool = False,
+        include: Optional[discovery.raw_pattern_type] = None,
+        exclude: Optional[discovery.raw_pattern_type] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.file_patterns = discovery._cleanse_inputs(file_patterns, verbose=verbose)
+        self.patterns = discovery._cleanse_inputs(
+            patterns, verbose=verbose, is_file_pattern_type=False
+        )
+        self.prefilter = prefilter
+        self.verbose = verbose
+        self.path_filter = compile_path_filter(include, exclude)
+
+        self._lock = threading.RLock()
+        self._files: Dict[str, file_state_type] = {}
+        self._directories: List[str] = []
+        self._module_nodes: Dict[str, List[Node]] = {}
+        # resolved file of each module, and those of the modules it imports
+        self._paths: Dict[str, str] = {}
+        self._imports: Dict[str, Set[str]] = {}
+        self._module_pipelines: Dict[str, Pipeline] = {}
+        self._default_counts: Counter = Counter()
+        self._snapshot: Mapping[str, Pipeline] = MappingProxyType(
+            {"__default__": Pipeline([])}
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.refresh()
+
+    @property
+    def pipelines(self) -> Mapping[str, Pipeline]:
+        """the latest consistent, read-only snapshot of every pipeline"""
+        return self._snapshot
+
+    def refresh(self) -> Changes:
+        """
+        re-imports modules that were created or modified and drops deleted ones
+
+        Returns
+            Changes -- module keys that were created, modified, and deleted
+        """
+        with self._lock:
+            directory_mtimes: Dict[str, int] = {}
+            files = discovery._walk_files(
+                self.directory,
+                discovery._compile_file_patterns(self.file_patterns),
+                directory_mtimes,
+                path_filter=self.path_filter,
+            )
+            self._directories = [
+                os.path.normpath(os.path.join(str(self.directory), relative))
+                for relative in directory_mtimes
+            ]
+            current = {}
+            for file in files:
+                try:
+                    stat = os.stat(file)
+                except OSError:
+                    continue
+                current[discovery._module_key(file, self.directory)] = (
+                    file,
+                    (stat.st_mtime_ns, stat.st_size),
+                )
+
+            modified = [
+                key
+                for key in current
+                if key in self._files and self._files[key] != current[key][1]
+            ]
+            deleted = [key for key in self._files if key not in current]
+            changes = Changes(
+                created=[key for key in current if key not in self._files],
+                modified=modified + self._dependents(modified + deleted, current),
+                deleted=deleted,
+            )
+            if not changes:
+                return changes
+
+            # import everything and build the new pipelines on copies before
+            # touching state, so a failing module or `__default__` leaves the
+            # registry as it was and the change is retried on the next refresh
+            loaded, imports = self._load(
+                {key: current[key][0] for key in changes.created + changes.modified}
+            )
+            module_nodes = dict(self._module_nodes)
+            module_pipelines = dict(self._module_pipelines)
+            delta: Counter = Counter()
+            for key in changes.deleted:
+                _replace_module(key, [], module_nodes, module_pipelines, delta)
+            for key, nodes in loaded.items():
+                _replace_module(key, nodes, module_nodes, module_pipelines, delta)
+            pipelines = {
+                key: module_pipelines[key] for key in current if key in module_pipelines
+            }
+            pipelines["__default__"] = _update_default(
+                self._snapshot["__default__"],
+                self._default_counts,
+                delta,
+                [n for nodes in loaded.values() for n in nodes],
+            )
+
+            for key in changes.deleted:
+                del self._files[key]
+                del self._paths[key]
+                self._imports.pop(key, None)
+            for key in loaded:
+                self._files[key] = current[key][1]
+                self._paths[key] = _resolve(current[key][0])
+            self._imports.update(imports)
+            for n, count in delta.items():
+                self._default_counts[n] += count
+                if self._default_counts[n] <= 0:
+                    del self._default_counts[n]
+            self._module_nodes = module_nodes
+            self._module_pipelines = module_pipelines
+            self._snapshot = MappingProxyType(pipelines)
+            discovery._vprint("registry refreshed", self.verbose, changes=changes)
+            return changes
+
+    def _dependents(
+        self, changed: List[str], current: Dict[str, Tuple[Path, file_state_type]]
+    ) -> List[str]:
+        """keys of unchanged modules importing changed ones, directly or not"""
+        files = {self._paths[key] for key in changed if key in self._paths}
+        dependents: List[str] = []
+        while files:
+            found = [
+                key
+                for key in current
+                if key not in changed
+                and key not in dependents
+                and self._imports.get(key, set()) & files
+            ]
+            dependents.extend(found)
+            files = {self._paths[key] for key in found}
+        return dependents
+
+    def watch(
+        self,
+        callback: Optional[Callable[[Changes, Mapping[str, Pipeline]], Any]] = None,
+        interval: float = 1.0,
+        polling: bool = False,
+    ) -> None:
+        """
+        blocks, refreshing whenever the tree changes, until `stop` is called
+
+        Errors raised while importing modules are logged and the previous
+        snapshot is kept.
+
+        Arguments
+            callback {callable} -- called with the changes and the new snapshot
+                after every refresh that changed something
+            interval {float} -- seconds between checks when polling
+            polling {bool} -- poll even when inotify is available
+        """
+        watcher = make_watcher(interval=interval, polling=polling)
+        try:
+            while not self._stop.is_set():
+                watcher.update(self._directories)
+                if not watcher.wait(timeout=interval):
+                    continue
+                try:
+                    changes = self.refresh()
+                except Exception:
+                    logger.exception("failed to refresh pipelines")
+                    continue
+                if changes and callback is not None:
+                    callback(changes, self.pipelines)
+        finally:
+            watcher.close()
+
+    def start(self, **kwargs: Any) -> None:
+        """runs `watch` in a background daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.watch, kwargs=kwargs, name="find-kedro-watch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """stops watching, waiting for the background thread to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _load(
+        self, keyed_files: Dict[str, Path]
+    ) -> Tuple[Dict[str, List[Node]], Dict[str, Set[str]]]:
+        """
+        imports keyed_files fresh, returning their nodes in file order and the
+        files of the modules each one imports
+        """
+        files = list(keyed_files.values())
+        if self.prefilter:
+            files, _ = prefilter_files(files, self.patterns)
+        nodes: Dict[str, List[Node]] = {key: [] for key in keyed_files}
+        imports: Dict[str, Set[str]] = {key: set() for key in keyed_files}
+        # forgetting every file first lets a module imported by an earlier one
+        # be reused rather than executed again
+        for path in keyed_files.values():
+            _forget_module(path)
+        modules = ModuleRegistry()
+        factories = FactoryCalls()
+        for key, path in keyed_files.items():
+            if path not in files:
+                continue
+            module = discovery._import(
+                path, self.directory, verbose=self.verbose, modules=modules
+            )
+            nodes[key] = discovery._discover_nodes(
+                module, self.patterns, verbose=self.verbose, factories=factories
+            )
+            imports[key] = _imported_files(module) - {_resolve(path)}
+        return nodes, imports
+
+
+def _replace_module(
+    key: str,
+    nodes: List[Node],
+    module_nodes: Dict[str, List[Node]],
+    module_pipelines: Dict[str, Pipeline],
+    delta: Counter,
+) -> None:
+    """swaps a module's nodes, counting what it adds and removes in delta"""
+    delta.subtract(module_nodes.pop(key, []))
+    module_pipelines.pop(key, None)
+    if nodes:
+        module_nodes[key] = nodes
+        module_pipelines[key] = Pipeline(nodes)
+        delta.update(nodes)
+
+
+def _update_default(
+    default: Pipeline, counts: Counter, delta: Counter, loaded: List[Node]
+) -> Pipeline:
+    """
+    applies the nodes modules added and removed to `__default__`
+
+    Arguments
+        default {Pipeline} -- the current `__default__`
+        counts {Counter} -- how many modules hold each node of default
+        delta {Counter} -- change to counts made by the refresh
+        loaded {List[Node]} -- nodes of the modules imported again, which
+            replace equal nodes of their previous versions
+
+    Returns
+        Pipeline -- the new `__default__`
+    """
+    removed = {n for n, count in delta.items() if count < 0 and counts[n] + count <= 0}
+    if not removed and not loaded:
+        return default
+    replaced = removed.union(loaded)
+    kept = [n for n in default.nodes if n not in replaced]
+    return Pipeline(kept + list(dict.fromkeys(loaded)))
+
+
+def _imported_files(module: ModuleType) -> Set[str]:
+    """resolved files of the modules module's globals are or were defined in"""
+    files = set()
+    for value in list(vars(module).values()):
+        if not isinstance(value, ModuleType):
+            name = getattr(value, "__module__", None)
+            value = sys.modules.get(name) if isinstance(name, str) else None
+        file = getattr(value, "__file__", None)
+        if isinstance(file, str):
+            files.add(_resolve(file))
+    return files
+
+
+def _resolve(path: Union[str, Path]) -> str:
+    return os.path.realpath(str(path))
+
+
+def _forget_module(path: Path) -> None:
+    """removes modules loaded from path so the next import executes it again"""
+    path = Path(path)
+    resolved = path.resolve()
+    for name, module in list(sys.modules.items()):
+        if name.rpartition(".")[2] != path.stem:
+            continue
+        file = getattr(module, "__file__", None)
+        if file is not None and Path(file).resolve() == resolved:
+            del sys.modules[name]
@@ -0,0 +1,118 @@
+"""
+stream
+
+This module provides `iter_find_kedro`, which yields the pipeline of each
+module as soon as its nodes are discovered.
+
+`find_kedro` keeps every module and every node until the end to build
+`__default__`, so its peak memory grows with the whole project.  Here each
+module is released as soon as its nodes are found, leaving the yielded
+pipeline as the only reference to them, so memory stays bounded by what the
+caller keeps.  Modules are removed from `sys.modules` as they are released,
+unless keep_modules is set.
+
+Module globals usually reference themselves through the functions defined in
+them, so a released module is freed by the cyclic garbage collector rather
+than the moment its pipeline is dropped.  Callers that need a hard bound can
+call `gc.collect()` between pipelines.
+
+``` python
+from find_kedro import iter_find_kedro
+
+for key, pipeline in iter_find_kedro(directory="src"):
+    check(key, pipeline)
+```
+"""
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+from kedro.pipeline import Pipeline
+
+from find_kedro import core, discovery
+from find_kedro.factories import FactoryCalls
+from find_kedro.filters import compile_path_filter
+from find_kedro.imports import ModuleRegistry
+from find_kedro.profiling import Profile
+
+
+def iter_find_kedro(
+    file_patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    patterns: discovery.raw_pattern_type = ["*node*", "*pipeline*"],
+    directory: Union[str, Path] = ".",
+    verbose: bool = False,
+    cache_dir: Optional[Union[str, Path]] = None,
+    prefilter: bool = True,
+    include: Optional[discovery.raw_pattern_type] = None,
+    exclude: Optional[discovery.raw_pattern_type] = None,
+    keep_modules: bool = False,
+    profile: Optional[Profile] = None,
+) -> Iterator[Tuple[str, Pipeline]]:
+    """
+    yields the pipeline of each module in file order as soon as it is discovered
+
+    `__default__` is not yielded, it would need every node held until the end.
+
+    Arguments
+        file_patterns {list} -- list of file globbing patterns
+        patterns {list} -- list of variable globbing patterns
+        directory {str} -- directory to look for pipeline modules in
+        verbose {bool} -- prints extra information
+        cache_dir {str} -- directory to cache file discovery results in
+        prefilter {bool} -- skip importing files without pattern matched names
+        include {list} -- path globs to include, see `find_kedro`
+        exclude {list} -- path globs to exclude, see `find_kedro`
+        keep_modules {bool} -- leave modules in `sys.modules` once their nodes
+            are yielded, keeping them alive for later imports
+        profile {Profile} -- filled in with the time of each phase
+
+    Yields
+        tuple -- module key and pipeline of every module holding nodes
+    """
+    profile = profile or Profile()
+    directory = Path(directory)
+    cleansed_file_patterns = discovery._cleanse_inputs(file_patterns, verbose=verbose)
+    cleansed_patterns = discovery._cleanse_inputs(
+        patterns, verbose=verbose, is_file_pattern_type=False
+    )
+    keyed_files = core._find_module_files(
+        directory,
+        cleansed_file_patterns,
+        cleansed_patterns,
+        verbose=verbose,
+        cache_dir=cache_dir,
+        prefilter=prefilter,
+        path_filter=compile_path_filter(include, exclude),
+        profile=profile,
+    )
+    modules = ModuleRegistry()
+    factories = FactoryCalls()
+    try:
+        for key, path in keyed_files.items():
+            with profile.phase("import"):
+                start = time.perf_counter()
+                module = discovery._import(
+                    path, directory, verbose=verbose, modules=modules
+                )
+                profile.record_module(
+                    key, path, import_time=time.perf_counter() - start
+                )
+            with profile.phase("discovery"):
+                nodes = discovery._discover_nodes(
+                    module, cleansed_patterns, verbose=verbose, factories=factories
+                )
+            del module
+            if not keep_modules:
+                modules.release(path)
+            profile.record_module(key, nodes=len(nodes))
+            if nodes:
+                with profile.phase("generation"):
+                    pipeline = Pipeline(nodes)
+                del nodes
+                yield key, pipeline
+                del pipeline
+        core._report_duplicates(modules, profile, verbose)
+    finally:
+        if not keep_modules:
+            # modules the released ones imported
+            modules.release_all()
@@ -0,0 +1,156 @@
+"""
+watch
+
+This module provides file system watchers used by `PipelineRegistry`.
+
+`InotifyWatcher` blocks on Linux inotify events for every watched directory and
+needs no extra dependencies.  `PollingWatcher` simply waits for an interval
+and is used everywhere inotify is not available.  Watchers only signal that
+something may have changed; the registry works out what actually did.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sys
+import time
+from typing import Any, Iterable, Optional
+
+# inotify event masks, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+
+class PollingWatcher:
+    """signals a possible change every interval seconds"""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+
+    def update(self, directories: Iterable[str]) -> None:
+        """polling does not need to know which directories to watch"""
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        waits for the polling interval, or timeout if it is shorter
+
+        Returns
+            bool -- True when the tree should be checked for changes
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """signals a change when inotify reports an event in a watched directory"""
+
+    def __init__(self, debounce: float = 0.05) -> None:
+        self.debounce = debounce
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set = set()
+
+    def update(self, directories: Iterable[str]) -> None:
+        """
+        watches every directory that is not watched yet
+
+        Directories that disappeared are dropped by the kernel automatically.
+        """
+        for directory in directories:
+            if directory in self._watched:
+                continue
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), WATCH_MASK
+            )
+            if wd >= 0:
+                self._watched.add(directory)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        blocks until an event arrives or timeout passes
+
+        Events arriving shortly after the first one are drained with it, so an
+        editor saving several files triggers a single reload.
+
+        Returns
+            bool -- True if any event was received
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        time.sleep(self.debounce)
+        self._drain()
+        # directories may have been removed and recreated
+        self._watched.clear()
+        return True
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    return
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                raise
+
+
+def make_watcher(interval: float = 1.0, polling: bool = False) -> Any:
+    """
+    returns an `InotifyWatcher` where available, otherwise a `PollingWatcher`
+
+    Arguments
+        interval {float} -- seconds between checks when polling
+        polling {bool} -- always poll, even when inotify is available
+
+    Returns
+        watcher -- object with `update`, `wait`, and `close` methods
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval)
+
+
+def _load_libc() -> Any:
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    libc = ctypes.CDLL(name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
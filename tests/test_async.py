@@ -0,0 +1,103 @@
+"""
+tests discovering pipelines from asyncio without blocking the event loop
+"""
+import asyncio
+
+from find_kedro import find_kedro, find_kedro_async
+from util import File, make_files_and_cd
+
+
+def slow_module(index, seconds=0.0):
+    return File(
+        f"pipelines/nodes_{index}.py",
+        f"""\
+        import time
+        from pathlib import Path
+        from kedro.pipeline import node
+
+        with open(Path(__file__).with_name("imported.txt"), "a") as log:
+            log.write("{index}\\n")
+        time.sleep({seconds})
+
+        nodes = [node(lambda x: x, "in_{index}", "out_{index}", name="n{index}")]
+        """,
+    )
+
+
+async def collect(**kwargs):
+    return [item async for item in find_kedro_async(**kwargs)]
+
+
+def test_yields_every_pipeline_then_default(tmpdir):
+    make_files_and_cd(tmpdir, [slow_module(index) for index in range(5)])
+    results = asyncio.run(collect(directory="."))
+    expected = find_kedro(directory=".")
+    assert results[-1][0] == "__default__"
+    assert sorted(key for key, _ in results) == sorted(expected)
+    for key, pipeline in results:
+        assert pipeline.nodes == expected[key].nodes
+
+
+def test_yields_in_completion_order(tmpdir):
+    make_files_and_cd(tmpdir, [slow_module(0, 0.5), slow_module(1)])
+    results = asyncio.run(collect(directory=".", jobs=2))
+    assert [key for key, _ in results] == [
+        "pipelines.nodes_1",
+        "pipelines.nodes_0",
+        "__default__",
+    ]
+
+
+def test_modules_importing_each_other(tmpdir):
+    make_files_and_cd(
+        tmpdir,
+        [
+            slow_module(0, 0.1),
+            File(
+                "pipelines/pipeline.py",
+                """\
+                from kedro.pipeline import Pipeline, node
+
+                from .nodes_0 import nodes as imported
+
+                pipeline = Pipeline([node(imported[0].func, "out_0", "out", name="p")])
+                """,
+            ),
+        ],
+    )
+    for _ in range(5):
+        results = dict(asyncio.run(collect(directory=".")))
+        assert [n.name for n in results["pipelines.pipeline"].nodes] == ["p"]
+        assert len(results["__default__"].nodes) == 2
+
+
+def test_event_loop_is_not_blocked(tmpdir):
+    make_files_and_cd(tmpdir, [slow_module(index, 0.1) for index in range(3)])
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        await collect(directory=".", jobs=1)
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(main()) >= 10
+
+
+def test_closing_early_cancels_remaining_imports(tmpdir):
+    make_files_and_cd(tmpdir, [slow_module(index, 0.1) for index in range(10)])
+
+    async def first():
+        async for item in find_kedro_async(directory=".", jobs=1):
+            return item
+
+    asyncio.run(first())
+    imported = tmpdir.join("pipelines/imported.txt").read().split()
+    assert len(imported) <= 3
@@ -0,0 +1,116 @@
+"""
+tests import budgets, timeouts, and the slow module quarantine
+"""
+import json
+import time
+
+import pytest
+
+from find_kedro import Profile, find_kedro
+from find_kedro.budget import _Worker
+from find_kedro.manifest import build_manifest, write_manifest
+from find_kedro.parallel import _get_context
+from util import File, make_file, make_files_and_cd
+
+
+def module(name, sleep=0.0):
+    return File(
+        f"{name}.py",
+        f"""\
+        import time
+
+        from kedro.pipeline import node
+
+        time.sleep({sleep})
+
+        nodes = [node(lambda x: x, "{name}_in", "{name}_out", name="{name}")]
+        """,
+    )
+
+
+def test_slow_modules_are_reported(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes"), module("slow_nodes", 0.3)])
+    report = Profile()
+    pipelines = find_kedro(import_budget=0.2, profile=report)
+    assert "slow_nodes" in pipelines
+    assert [slow["module"] for slow in report.slow] == ["slow_nodes"]
+    assert report.slow[0]["import_time"] > 0.2
+    assert not report.slow[0]["skipped"]
+    assert "1 slow modules" in report.format()
+
+
+def test_slow_modules_are_skipped(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes"), module("slow_nodes", 0.3)])
+    pipelines = find_kedro(import_budget=0.2, skip_slow=True)
+    assert sorted(pipelines) == ["__default__", "fast_nodes"]
+    assert [n.name for n in pipelines["__default__"].nodes] == ["fast_nodes"]
+
+
+def test_quarantined_modules_are_skipped_until_they_change(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes"), module("slow_nodes", 0.3)])
+    find_kedro(import_budget=0.2, quarantine="quarantine.json")
+    assert list(json.loads(tmpdir.join("quarantine.json").read())["modules"]) == [
+        "slow_nodes.py"
+    ]
+
+    report = Profile()
+    start = time.perf_counter()
+    pipelines = find_kedro(quarantine="quarantine.json", profile=report)
+    assert time.perf_counter() - start < 0.3
+    assert "slow_nodes" not in pipelines
+    assert report.slow[0]["quarantined"]
+
+    make_file(tmpdir, module("slow_nodes"))
+    pipelines = find_kedro(quarantine="quarantine.json")
+    assert "slow_nodes" in pipelines
+
+
+def test_hung_modules_are_killed(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes"), module("hung_nodes", 600)])
+    report = Profile()
+    start = time.perf_counter()
+    pipelines = find_kedro(
+        import_timeout=2, quarantine="quarantine.json", profile=report
+    )
+    assert time.perf_counter() - start < 60
+    assert sorted(pipelines) == ["__default__", "fast_nodes"]
+    assert pipelines["fast_nodes"].nodes[0].func(1) == 1
+    assert report.slow[0]["timed_out"] and report.slow[0]["quarantined"]
+
+    pipelines = find_kedro(import_timeout=2, quarantine="quarantine.json")
+    assert sorted(pipelines) == ["__default__", "fast_nodes"]
+
+
+def test_slow_manifest_modules_are_skipped(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes"), module("slow_nodes", 0.3)])
+    write_manifest(build_manifest(), "manifest.json")
+    report = Profile()
+    pipelines = find_kedro(
+        manifest="manifest.json", import_budget=0.2, skip_slow=True, profile=report
+    )
+    assert sorted(pipelines) == ["__default__", "fast_nodes"]
+    assert [slow["module"] for slow in report.slow] == ["slow_nodes"]
+
+
+@pytest.mark.parametrize(
+    "options", [{"import_timeout": 1}, {"quarantine": "quarantine.json"}]
+)
+def test_manifest_rejects_options_importing_in_workers(tmpdir, options):
+    with pytest.raises(ValueError):
+        find_kedro(directory=tmpdir, manifest="manifest.json", **options)
+
+
+def test_dead_workers_raise_runtime_errors(tmpdir):
+    make_files_and_cd(tmpdir, [module("fast_nodes")])
+    task = ("fast_nodes", str(tmpdir.join("fast_nodes.py")), str(tmpdir), ["*"], {})
+    worker = _Worker(_get_context())
+    assert worker.describe(task, timeout=60)[0] == "fast_nodes"
+    worker.process.kill()
+    worker.process.join()
+    with pytest.raises(RuntimeError):
+        worker.describe(task, timeout=60)
+    worker.describe(task, timeout=60)
+    worker.process.kill()
+    worker.process.join()
+    worker.close()
+    assert worker.process is None
@@ -0,0 +1,149 @@
+"""
+tests the on-disk file discovery cache
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import find_kedro.core
+from find_kedro import find_kedro as find_kedro_func
+from find_kedro import invalidate_cache
+from find_kedro.cli import cli
+from util import File, make_file, make_files_and_cd
+
+files = [
+    File(
+        "pipelines/de/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "a", "b", name="a_b")]
+        """,
+    ),
+    File(
+        "pipelines/ds/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "b", "c", name="b_c")]
+        """,
+    ),
+]
+
+new_file = File(
+    "pipelines/ds/more_nodes.py",
+    """\
+    from kedro.pipeline import node
+
+    nodes = [node(lambda x: x, "c", "d", name="c_d")]
+    """,
+)
+
+
+def age_tree(directory):
+    """pushes mtimes into the past so the walk is not considered racy"""
+    for root, dirs, _ in os.walk(str(directory)):
+        for d in [root, *[os.path.join(root, d) for d in dirs]]:
+            os.utime(d, (0, 0))
+
+
+def no_walk(monkeypatch):
+    """makes any further directory walk fail the test"""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("directory was walked")
+
+    monkeypatch.setattr(find_kedro.core, "_walk_files", fail)
+
+
+def test_cache_hit_skips_walk(tmpdir, monkeypatch):
+    make_files_and_cd(tmpdir, files)
+    age_tree(tmpdir)
+    cache_dir = tmpdir.join(".cache")
+    first = find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert len(os.listdir(str(cache_dir))) == 1
+
+    no_walk(monkeypatch)
+    second = find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert list(first) == list(second)
+    assert len(second["__default__"].nodes) == 2
+
+
+def test_cache_dir_inside_the_walked_directory(tmpdir, monkeypatch):
+    make_files_and_cd(tmpdir, files)
+    find_kedro_func(directory=".", cache_dir=".fkcache")
+    age_tree(tmpdir)
+    first = find_kedro_func(directory=".", cache_dir=".fkcache")
+    assert len(os.listdir(str(tmpdir.join(".fkcache")))) == 1
+
+    no_walk(monkeypatch)
+    second = find_kedro_func(directory=".", cache_dir=".fkcache")
+    assert list(first) == list(second)
+
+
+def test_cache_miss_on_new_file(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    age_tree(tmpdir)
+    cache_dir = tmpdir.join(".cache")
+    find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+
+    make_file(tmpdir, new_file)
+    pipelines = find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert "ds.more_nodes" in pipelines
+    assert len(pipelines["__default__"].nodes) == 3
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        [],
+        {"version": 1},
+        {"version": 1, "directories": [], "files": []},
+        {"version": 1, "directories": {}, "files": None},
+    ],
+)
+def test_malformed_entries_are_misses(tmpdir, entry):
+    make_files_and_cd(tmpdir, files)
+    age_tree(tmpdir)
+    cache_dir = tmpdir.join(".cache")
+    find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    (cached,) = os.listdir(str(cache_dir))
+    cache_dir.join(cached).write(json.dumps(entry))
+    pipelines = find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert len(pipelines["__default__"].nodes) == 2
+
+
+def test_racy_walk_is_not_cached(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    cache_dir = tmpdir.join(".cache")
+    find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert not Path(str(cache_dir)).exists() or os.listdir(str(cache_dir)) == []
+
+
+def test_invalidate_cache(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    age_tree(tmpdir)
+    cache_dir = tmpdir.join(".cache")
+    find_kedro_func(directory="pipelines", cache_dir=cache_dir)
+    assert invalidate_cache(cache_dir, directory="elsewhere") == 0
+    assert invalidate_cache(cache_dir, directory="pipelines") == 1
+    assert os.listdir(str(cache_dir)) == []
+
+
+def test_cli_no_cache(tmpdir, monkeypatch):
+    make_files_and_cd(tmpdir, files)
+    age_tree(tmpdir)
+    runner = CliRunner()
+    result = runner.invoke(cli, ["-d", "pipelines", "--cache-dir", ".cache"])
+    assert result.exit_code == 0
+
+    no_walk(monkeypatch)
+    result = runner.invoke(cli, ["-d", "pipelines", "--cache-dir", ".cache"])
+    assert result.exit_code == 0
+    result = runner.invoke(
+        cli, ["-d", "pipelines", "--cache-dir", ".cache", "--no-cache"]
+    )
+    assert result.exit_code != 0
@@ -3,6 +3,8 @@ tests cli functionality.
 
 Ensure other tests function properly through the cli as well by reusing their content
 """
+import json
+
 import pytest
 from click.testing import CliRunner
 from more_itertools import roundrobin
@@ -11,7 +13,7 @@ from find_kedro.cli import cli
 from test_discover_py import content as discover_content
 from test_file_pattern import content as file_pattern_content
 from test_pattern import content as pattern_content
-from util import make_files_and_cd
+from util import File, make_files_and_cd
 
 __version__ = "0.1.1"
 
@@ -99,4 +101,137 @@ def test_file_patterns(tmpdir, name, num_nodes, files):
     assert len(pipeline["__default__"]) == num_nodes
 
 
+format_files = [
+    File(
+        "de/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "a", "b", name="a_b")]
+        """,
+    ),
+    File(
+        "ds/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [
+            node(lambda x: x, "b", "c", name="b_c"),
+            node(lambda x: x, "c", "d", name="c_d"),
+        ]
+        """,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "output_format, expected",
+    [
+        (
+            "json",
+            json.dumps(
+                {
+                    "__default__": ["a_b", "b_c", "c_d"],
+                    "de.nodes": ["a_b"],
+                    "ds.nodes": ["b_c", "c_d"],
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+        ),
+        (
+            "ndjson",
+            '{"pipeline": "__default__", "nodes": ["a_b", "b_c", "c_d"]}\n'
+            '{"pipeline": "de.nodes", "nodes": ["a_b"]}\n'
+            '{"pipeline": "ds.nodes", "nodes": ["b_c", "c_d"]}\n',
+        ),
+        (
+            "names",
+            "__default__\ta_b\n__default__\tb_c\n__default__\tc_d\n"
+            "de.nodes\ta_b\nds.nodes\tb_c\nds.nodes\tc_d\n",
+        ),
+        ("counts", "__default__\t3\nde.nodes\t1\nds.nodes\t2\n"),
+    ],
+)
+def test_output_format(tmpdir, output_format, expected):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--format", output_format])
+    assert result.exit_code == 0
+    assert result.output == expected
+
+
+def test_color_is_off_unless_asked_for(tmpdir):
+    make_files_and_cd(tmpdir, format_files)
+    assert "\x1b[" not in CliRunner().invoke(cli).output
+    assert "\x1b[" in CliRunner().invoke(cli, ["--color"]).output
+
+
+@pytest.mark.parametrize(
+    "output_format, expected",
+    [
+        ("names", "de.nodes\ta_b\nds.nodes\tb_c\nds.nodes\tc_d\n"),
+        ("counts", "de.nodes\t1\nds.nodes\t2\n"),
+    ],
+)
+def test_metadata_output_format(tmpdir, output_format, expected):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--metadata", "--format", output_format])
+    assert result.exit_code == 0
+    assert result.output == expected
+
+
+def test_metadata_json(tmpdir):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--metadata"])
+    assert result.exit_code == 0
+    records = json.loads(result.output)
+    assert [(r["module"], r["name"]) for r in records] == [
+        ("de.nodes", "a_b"),
+        ("ds.nodes", "b_c"),
+        ("ds.nodes", "c_d"),
+    ]
+    assert records[1]["inputs"] == ["b"]
+    assert records[1]["line"] == 4
+    assert records[1]["file"].endswith("nodes.py")
+
+
+def test_fingerprints(tmpdir):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--fingerprints", "--format", "names"])
+    assert result.exit_code == 0
+    lines = [line.split("\t") for line in result.output.splitlines()]
+    assert [key for key, _ in lines] == ["__default__", "de.nodes", "ds.nodes"]
+    assert all(len(fingerprint) == 64 for _, fingerprint in lines)
+    result = CliRunner().invoke(cli, ["--fingerprints"])
+    assert json.loads(result.output) == {key: value for key, value in lines}
+
+
+def test_fingerprints_and_metadata_can_not_be_combined(tmpdir):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--fingerprints", "--metadata"])
+    assert result.exit_code != 0
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--jobs", "2"],
+        ["--cache-dir", ".cache"],
+        ["--manifest", "manifest.json"],
+        ["--package", "json"],
+        ["--profile"],
+        ["--import-budget", "1"],
+        ["--import-timeout", "1"],
+        ["--skip-slow"],
+        ["--quarantine", "quarantine.json"],
+    ],
+)
+def test_watch_rejects_options_it_ignores(tmpdir, options):
+    make_files_and_cd(tmpdir, format_files)
+    result = CliRunner().invoke(cli, ["--watch", *options])
+    assert result.exit_code == 2
+    assert options[0] in result.output
+
+
 # def test_main()
@@ -0,0 +1,62 @@
+"""
+tests the single pass file walker used to discover node modules
+"""
+from pathlib import Path
+
+from find_kedro.core import _cleanse_inputs, _discover_files
+from util import File, make_files_and_cd
+
+files = [
+    File("pipelines/de/nodes.py", "x = 1"),
+    File("pipelines/de/pipeline.py", "x = 1"),
+    File("pipelines/ds/nodes.py", "x = 1"),
+    File("pipelines/ds/helpers.py", "x = 1"),
+    File("pipelines/ds/nodes.txt", "x = 1"),
+    File("pipelines/__pycache__/nodes.py", "x = 1"),
+    File(".git/hooks/pipeline.py", "x = 1"),
+]
+
+
+def test_discover_files_matches_all_patterns(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    patterns = _cleanse_inputs(["*node*", "*pipeline*"])
+    found = _discover_files(Path("."), patterns)
+    assert found == [
+        Path("pipelines/de/nodes.py"),
+        Path("pipelines/de/pipeline.py"),
+        Path("pipelines/ds/nodes.py"),
+    ]
+
+
+def test_discover_files_is_deterministic(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    patterns = _cleanse_inputs(["*pipeline*", "*node*"])
+    assert _discover_files(Path(tmpdir), patterns) == sorted(
+        _discover_files(Path(tmpdir), patterns)
+    )
+
+
+def test_discover_files_generator_patterns(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    patterns = _cleanse_inputs(pattern for pattern in ["*node*", "*pipeline*"])
+    assert patterns == ["**/*node*", "**/*pipeline*"]
+    assert _discover_files(Path("."), patterns) == _discover_files(
+        Path("."), _cleanse_inputs(["*node*", "*pipeline*"])
+    )
+
+
+def test_discover_files_no_patterns(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    assert _discover_files(Path("."), []) == []
+
+
+def test_discover_files_follows_symlinked_directories(tmpdir):
+    make_files_and_cd(tmpdir, [File("shared/ml/nodes.py", "x = 1")])
+    Path("pipelines").mkdir()
+    Path("pipelines/ml").symlink_to(Path("shared/ml").resolve())
+    # a loop back to the top of the tree is entered only once
+    Path("shared/ml/loop").symlink_to(Path("shared").resolve())
+    patterns = _cleanse_inputs(["*node*"])
+    assert _discover_files(Path("pipelines"), patterns) == [
+        Path("pipelines/ml/nodes.py")
+    ]
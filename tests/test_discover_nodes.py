@@ -0,0 +1,84 @@
+"""
+tests matching module variables against patterns in _discover_nodes
+"""
+import sys
+import types
+
+from kedro.pipeline import Pipeline, node
+
+from find_kedro.discovery import _compile_patterns, _discover_nodes, _flatten
+
+
+def identity(x):
+    return x
+
+
+def make_module(**variables):
+    module = types.ModuleType("nodes")
+    module.__dict__.update(variables)
+    return module
+
+
+def test_matches_in_definition_order():
+    module = make_module(
+        pipeline_z=[node(identity, "a", "b", name="z")],
+        node_a=node(identity, "b", "c", name="a"),
+        nodes_m=Pipeline([node(identity, "c", "d", name="m")]),
+    )
+    nodes = _discover_nodes(module, ["*node*", "*pipeline*"])
+    assert [n.name for n in nodes] == ["z", "a", "m"]
+
+
+def test_variable_matching_several_patterns_is_used_once():
+    calls = []
+
+    def create_pipeline():
+        calls.append(1)
+        return Pipeline([node(identity, "a", "b", name="a_b")])
+
+    module = make_module(create_pipeline=create_pipeline)
+    nodes = _discover_nodes(module, ["*pipeline*", "create_*", "*"])
+    assert [n.name for n in nodes] == ["a_b"]
+    assert calls == [1]
+
+
+def test_kedro_node_function_is_never_matched():
+    module = make_module(node=node)
+    assert _discover_nodes(module, ["*"]) == []
+
+
+def test_compiled_patterns_are_cached():
+    assert _compile_patterns(("a*", "b?")) is _compile_patterns(("a*", "b?"))
+    matcher = _compile_patterns(("a*", "b?"))
+    assert matcher("abc")
+    assert matcher("bc")
+    assert not matcher("bcd")
+    assert not _compile_patterns(())("a")
+
+
+def test_verbose_reports_match_time(capsys):
+    _discover_nodes(make_module(), ["*node*"], verbose=True)
+    assert "match_time" in capsys.readouterr().out
+
+
+def test_flatten_descends_into_any_iterable_but_strings():
+    generator = (n for n in [4, 5])
+    items = [[1, (2, "ab")], frozenset([3]), {"a": 1}, generator, b"cd", range(6, 8)]
+    assert list(_flatten(items)) == [1, 2, "ab", 3, "a", 4, 5, b"cd", 6, 7]
+
+
+def test_flatten_descends_into_pipelines():
+    a = node(identity, "a", "b", name="a")
+    b = node(identity, "b", "c", name="b")
+    assert list(_flatten([[Pipeline([b, a])]])) == [a, b]
+
+
+def test_flatten_deep_and_cyclic_nesting():
+    deep = [1]
+    for _ in range(sys.getrecursionlimit() * 2):
+        deep = [deep]
+    assert list(_flatten(deep)) == [1]
+
+    cyclic: list = [1]
+    cyclic.append(cyclic)
+    assert list(_flatten([cyclic, 2])) == [1, 2]
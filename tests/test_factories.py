@@ -0,0 +1,205 @@
+"""
+tests that create_pipeline factories run once per discovery, and are cached
+until their sources change with cache_factories
+"""
+import os
+
+from find_kedro import Profile, find_kedro
+from find_kedro.factories import FACTORIES
+from util import File, make_file, make_files_and_cd
+
+
+def pipeline_file(name="train", extra=""):
+    return File(
+        "pipeline.py",
+        f"""\
+        from kedro.pipeline import Pipeline, node
+
+        from .functions import identity
+
+
+        def create_pipeline(**kwargs):
+            with open("runs.txt", "a") as runs:
+                runs.write(repr(kwargs) + "\\n")
+            return Pipeline([node(identity, "a", "b", name="{name}")])
+        {extra}
+        """,
+    )
+
+
+def functions_file(body="return x"):
+    return File(
+        "functions.py",
+        f"""\
+        def identity(x):
+            {body}
+        """,
+    )
+
+
+def runs(tmpdir):
+    if not tmpdir.join("runs.txt").check():
+        return []
+    return tmpdir.join("runs.txt").read().splitlines()
+
+
+def touch(tmpdir, file):
+    """rewrites file with a later modification time"""
+    make_file(tmpdir, file)
+    stat = os.stat(tmpdir.join(file.name))
+    os.utime(tmpdir.join(file.name), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_factories_run_once_across_calls(tmpdir):
+    make_files_and_cd(
+        tmpdir, [pipeline_file(extra="pipeline = create_pipeline"), functions_file()]
+    )
+    first = find_kedro(cache_factories=True)
+    report = Profile()
+    second = find_kedro(profile=report, cache_factories=True)
+    assert runs(tmpdir) == ["{}"]
+    assert [n.name for n in first["pipeline"].nodes] == ["train"]
+    assert second["pipeline"].nodes == first["pipeline"].nodes
+    (factory,) = report.factories.values()
+    assert factory["calls"] == 2 and factory["hits"] == 2
+    assert "pipeline factories" in report.format()
+
+
+def test_factories_run_once_per_discovery_by_default(tmpdir):
+    make_files_and_cd(
+        tmpdir, [pipeline_file(extra="pipeline = create_pipeline"), functions_file()]
+    )
+    find_kedro()
+    report = Profile()
+    find_kedro(profile=report)
+    assert runs(tmpdir) == ["{}", "{}"]
+    (factory,) = report.factories.values()
+    assert factory["calls"] == 2 and factory["hits"] == 1
+
+
+def test_factories_depending_on_the_environment(tmpdir, monkeypatch):
+    make_files_and_cd(
+        tmpdir,
+        [
+            File(
+                "pipeline.py",
+                """\
+                import os
+
+                from kedro.pipeline import Pipeline, node
+
+
+                def create_pipeline():
+                    return Pipeline(
+                        [node(lambda x: x, "a", "b", name=os.environ["OUT"])]
+                    )
+                """,
+            )
+        ],
+    )
+    for cache_factories in (False, True):
+        monkeypatch.setenv("OUT", "b")
+        pipelines = find_kedro(cache_factories=cache_factories)
+        assert [n.name for n in pipelines["pipeline"].nodes] == ["b"]
+        monkeypatch.setenv("OUT", "c")
+        pipelines = find_kedro(cache_factories=cache_factories)
+        assert [n.name for n in pipelines["pipeline"].nodes] == ["c"]
+
+
+def test_factory_kwargs_are_part_of_the_key(tmpdir):
+    make_files_and_cd(tmpdir, [pipeline_file(), functions_file()])
+    find_kedro(factory_kwargs={"env": "dev"}, cache_factories=True)
+    find_kedro(factory_kwargs={"env": "dev"}, cache_factories=True)
+    find_kedro(factory_kwargs={"env": "prod"}, cache_factories=True)
+    assert runs(tmpdir) == ["{'env': 'dev'}", "{'env': 'prod'}"]
+
+
+def test_factories_only_get_kwargs_they_accept(tmpdir):
+    make_files_and_cd(
+        tmpdir,
+        [
+            File(
+                "pipeline.py",
+                """\
+                from kedro.pipeline import Pipeline, node
+
+
+                def create_pipeline(env="dev"):
+                    return Pipeline([node(lambda x: x, "a", "b", name=env)])
+                """,
+            ),
+            File(
+                "nodes.py",
+                """\
+                from kedro.pipeline import Pipeline, node
+
+
+                def create_pipeline():
+                    return Pipeline([node(lambda x: x, "c", "d", name="plain")])
+                """,
+            ),
+        ],
+    )
+    pipelines = find_kedro(factory_kwargs={"env": "prod"})
+    assert [n.name for n in pipelines["pipeline"].nodes] == ["prod"]
+    assert [n.name for n in pipelines["nodes"].nodes] == ["plain"]
+
+
+def test_factories_run_again_when_their_file_changes(tmpdir):
+    make_files_and_cd(tmpdir, [pipeline_file(), functions_file()])
+    find_kedro(cache_factories=True)
+    touch(tmpdir, pipeline_file(name="retrain"))
+    pipelines = find_kedro(cache_factories=True)
+    assert len(runs(tmpdir)) == 2
+    assert [n.name for n in pipelines["pipeline"].nodes] == ["retrain"]
+
+
+def test_factories_run_again_when_a_node_function_changes(tmpdir):
+    make_files_and_cd(tmpdir, [pipeline_file(), functions_file()])
+    find_kedro(cache_factories=True)
+    touch(tmpdir, functions_file("return x + 1"))
+    find_kedro(cache_factories=True)
+    assert len(runs(tmpdir)) == 2
+
+
+def test_factory_kwargs_reach_worker_processes(tmpdir):
+    make_files_and_cd(
+        tmpdir,
+        [
+            File(
+                "pipeline.py",
+                """\
+                from kedro.pipeline import Pipeline, node
+
+
+                def create_pipeline(env="dev"):
+                    return Pipeline([node(str.upper, "a", "b", name=env)])
+                """,
+            ),
+            File("nodes.py", "nodes = []"),
+        ],
+    )
+    pipelines = find_kedro(jobs=2, factory_kwargs={"env": "prod"})
+    assert [n.name for n in pipelines["pipeline"].nodes] == ["prod"]
+    assert pipelines["pipeline"].nodes[0].func("x") == "X"
+
+
+def test_factory_kwargs_reach_lazy_pipelines(tmpdir):
+    make_files_and_cd(tmpdir, [pipeline_file(), functions_file()])
+    pipelines = find_kedro(lazy=True, factory_kwargs={"env": "lazy"})
+    assert runs(tmpdir) == []
+    assert [n.name for n in pipelines["pipeline"].nodes] == ["train"]
+    assert runs(tmpdir) == ["{'env': 'lazy'}"]
+
+
+def test_only_the_latest_result_of_a_factory_is_kept(tmpdir):
+    make_files_and_cd(tmpdir, [pipeline_file(), functions_file()])
+    find_kedro(factory_kwargs={"env": "dev"}, cache_factories=True)
+    find_kedro(factory_kwargs={"env": "prod"}, cache_factories=True)
+    touch(tmpdir, pipeline_file(name="retrain"))
+    find_kedro(factory_kwargs={"env": "prod"}, cache_factories=True)
+    file = str(tmpdir.join("pipeline.py"))
+    assert [key for key in FACTORIES._results if key[0] == file] == [
+        key for key in FACTORIES._running if key[0] == file
+    ]
+    assert len([key for key in FACTORIES._results if key[0] == file]) == 1
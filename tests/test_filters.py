@@ -0,0 +1,142 @@
+"""
+tests include and exclude path globs applied while walking for modules
+"""
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from find_kedro import Profile, find_kedro
+from find_kedro.cli import cli
+from find_kedro.filters import compile_path_filter
+from find_kedro.manifest import build_manifest, write_manifest
+from util import File, make_files_and_cd
+
+
+def nodes_file(name):
+    node_name = name.replace("/", "_")
+    return File(
+        f"{name}/nodes.py",
+        f"""\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "a", "{node_name}", name="{node_name}")]
+        """,
+    )
+
+
+files = [
+    nodes_file("pipelines/data_science"),
+    nodes_file("pipelines/data_science/models"),
+    nodes_file("pipelines/data_engineering"),
+    nodes_file("other"),
+    File("pipelines/legacy/nodes.py", "raise ImportError('legacy was imported')\n"),
+]
+
+
+def keys(pipelines):
+    return sorted(key for key in pipelines if key != "__default__")
+
+
+@pytest.mark.parametrize(
+    "include, expected",
+    [
+        (
+            ["pipelines/data_science/**"],
+            ["pipelines.data_science.models.nodes", "pipelines.data_science.nodes"],
+        ),
+        (
+            "pipelines/data_science",
+            ["pipelines.data_science.models.nodes", "pipelines.data_science.nodes"],
+        ),
+        (["*/models/*"], ["pipelines.data_science.models.nodes"]),
+        (
+            ["other/nodes.py", "pipelines/data_e*"],
+            ["other.nodes", "pipelines.data_engineering.nodes"],
+        ),
+    ],
+)
+def test_include(tmpdir, include, expected):
+    make_files_and_cd(tmpdir, files)
+    assert keys(find_kedro(include=include)) == expected
+
+
+@pytest.mark.parametrize(
+    "exclude", [["**/legacy/**"], ["pipelines/legacy"], ["*/legacy/nodes.py"]]
+)
+def test_excluded_files_are_never_imported(tmpdir, exclude):
+    make_files_and_cd(tmpdir, files)
+    assert len(keys(find_kedro(exclude=exclude))) == 4
+
+
+def test_filters_compose_with_file_patterns(tmpdir):
+    make_files_and_cd(tmpdir, files + [nodes_file("pipelines/data_science/extra")])
+    pipelines = find_kedro(
+        file_patterns=["nodes.py"],
+        include=["pipelines/data_science"],
+        exclude=["**/models"],
+    )
+    assert keys(pipelines) == [
+        "pipelines.data_science.extra.nodes",
+        "pipelines.data_science.nodes",
+    ]
+
+
+def test_pruned_directories_are_not_entered(tmpdir, monkeypatch):
+    make_files_and_cd(tmpdir, files)
+    entered = []
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        entered.append(os.path.relpath(path, str(tmpdir)).replace(os.sep, "/"))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    profile = Profile()
+    find_kedro(include=["pipelines/data_science/**"], profile=profile)
+    assert sorted(entered) == [
+        ".",
+        "pipelines",
+        "pipelines/data_science",
+        "pipelines/data_science/models",
+    ]
+    # other, pipelines/data_engineering, and pipelines/legacy
+    assert profile.pruned == {"directories": 3, "modules": 0}
+    assert "pruned 3 directories and 0 modules" in profile.format()
+
+
+def test_cache_is_keyed_by_filters(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    cache_dir = str(tmpdir.join(".cache"))
+    include = ["pipelines/data_science/**"]
+    assert len(keys(find_kedro(include=include, cache_dir=cache_dir))) == 2
+    assert len(keys(find_kedro(include=["other"], cache_dir=cache_dir))) == 1
+    profile = Profile()
+    assert len(keys(find_kedro(include=include, cache_dir=cache_dir, profile=profile)))
+    assert profile.pruned["directories"] == 3
+
+
+def test_manifest_modules_are_filtered(tmpdir):
+    make_files_and_cd(tmpdir, files[:4])
+    write_manifest(build_manifest(), "manifest.json")
+    profile = Profile()
+    pipelines = find_kedro(manifest="manifest.json", exclude=["other"], profile=profile)
+    assert len(keys(pipelines)) == 3
+    assert profile.pruned["modules"] == 1
+
+
+def test_accepts_path():
+    path_filter = compile_path_filter(["pipelines/ds"], ["**/legacy/**"])
+    assert path_filter.accepts_path("pipelines/ds/a/nodes.py")
+    assert not path_filter.accepts_path("pipelines/de/nodes.py")
+    assert not path_filter.accepts_path("pipelines/ds/legacy/nodes.py")
+    assert compile_path_filter(None, []) is None
+
+
+def test_cli(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    result = CliRunner().invoke(
+        cli, ["--include", "pipelines/*", "--exclude", "*legacy*", "--format", "counts"]
+    )
+    assert result.exit_code == 0
+    assert result.output.splitlines()[0] == "__default__\t3"
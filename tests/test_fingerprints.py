@@ -0,0 +1,104 @@
+"""
+tests stable pipeline fingerprints
+"""
+import json
+import os
+import subprocess
+import sys
+
+from kedro.pipeline import Pipeline
+
+from find_kedro import find_kedro, find_kedro_fingerprints
+from find_kedro.fingerprints import pipeline_fingerprint
+from util import File, make_file, make_files_and_cd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def nodes_file(body="return x in {'a', 'b', 'c'}", tags='["x", "y"]'):
+    return File(
+        "de/nodes.py",
+        f"""\
+        from functools import partial
+
+        from kedro.pipeline import node
+
+
+        def check(x, y=0):
+            {body}
+
+
+        nodes = [
+            node(check, "a", "b", name="check", tags={tags}),
+            node(partial(check, y=1), "b", "c", name="partial"),
+            node(lambda x: [i for i in x], "c", "d", name="listed"),
+        ]
+        """,
+    )
+
+
+other_file = File(
+    "ds/nodes.py",
+    """\
+    from kedro.pipeline import node
+
+    nodes = [node(str.upper, "d", "e", name="upper")]
+    """,
+)
+
+
+def test_fingerprints_match_across_checkouts(tmpdir):
+    make_files_and_cd(tmpdir.mkdir("one"), [nodes_file(), other_file])
+    one = find_kedro_fingerprints()
+    make_files_and_cd(tmpdir.mkdir("two"), [nodes_file(), other_file])
+    assert find_kedro_fingerprints() == one
+    assert sorted(one) == ["__default__", "de.nodes", "ds.nodes"]
+
+
+def test_fingerprints_ignore_node_order(tmpdir):
+    make_files_and_cd(tmpdir, [nodes_file()])
+    nodes = find_kedro()["de.nodes"].nodes
+    assert pipeline_fingerprint(Pipeline(nodes)) == pipeline_fingerprint(
+        Pipeline(nodes[::-1])
+    )
+
+
+def test_fingerprints_follow_changes(tmpdir):
+    make_files_and_cd(tmpdir.mkdir("before"), [nodes_file(), other_file])
+    before = find_kedro_fingerprints()
+    make_files_and_cd(tmpdir.mkdir("body"), [nodes_file("return x"), other_file])
+    body = find_kedro_fingerprints()
+    make_files_and_cd(tmpdir.mkdir("tags"), [nodes_file(tags='["x"]'), other_file])
+    tags = find_kedro_fingerprints()
+    for changed in (body, tags):
+        assert changed["de.nodes"] != before["de.nodes"]
+        assert changed["__default__"] != before["__default__"]
+        assert changed["ds.nodes"] == before["ds.nodes"]
+
+
+def test_fingerprints_match_across_processes(tmpdir):
+    make_files_and_cd(tmpdir, [nodes_file(), other_file])
+    script = "import json, find_kedro; print(json.dumps(find_kedro.find_kedro_fingerprints()))"
+    outputs = []
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=ROOT)
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        outputs.append(json.loads(output))
+    assert outputs[0] == outputs[1] == find_kedro_fingerprints()
+
+
+def test_worker_processes_give_the_same_fingerprints(tmpdir):
+    make_files_and_cd(tmpdir, [nodes_file(), other_file])
+    assert find_kedro_fingerprints(jobs=2) == find_kedro_fingerprints()
+
+
+def test_fingerprints_follow_edits_in_the_same_process(tmpdir):
+    make_files_and_cd(tmpdir, [nodes_file(), other_file])
+    before = find_kedro_fingerprints()
+    make_file(tmpdir, nodes_file("return not x"))
+    assert find_kedro_fingerprints()["de.nodes"] != before["de.nodes"]
@@ -0,0 +1,33 @@
+"""
+tests assembling the `__default__` pipeline from module nodes
+"""
+from kedro.pipeline import node
+
+from find_kedro.core import _generate_pipelines
+from find_kedro.discovery import _merge_nodes
+
+
+def identity(x):
+    return x
+
+
+a_b = node(identity, "a", "b", name="a_b")
+b_c = node(identity, "b", "c", name="b_c")
+c_d = node(identity, "c", "d", name="c_d")
+
+
+def test_merge_nodes_keeps_order_and_drops_shared_nodes():
+    assert _merge_nodes([[a_b, b_c], [b_c, c_d]]) == [a_b, b_c, c_d]
+
+
+def test_merge_nodes_drops_equal_copies():
+    copy = node(lambda x: x, "a", "b", name="a_b")
+    merged = _merge_nodes([[a_b], [copy]])
+    assert len(merged) == 1
+    assert merged[0] is a_b
+
+
+def test_generate_pipelines():
+    pipelines = _generate_pipelines({"de": [a_b, b_c], "ds": [b_c, c_d]})
+    assert list(pipelines) == ["de", "ds", "__default__"]
+    assert [n.name for n in pipelines["__default__"].nodes] == ["a_b", "b_c", "c_d"]
@@ -0,0 +1,216 @@
+"""
+tests importing modules safely from several threads and projects at once
+"""
+import gc
+import os
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from find_kedro import Profile, find_kedro
+from find_kedro.discovery import _import, _scoped_sys_path
+from find_kedro.imports import ModuleRegistry
+from find_kedro.manifest import build_manifest
+from util import File, make_files_and_cd
+
+
+def project(name):
+    """a project whose nodes import a sibling module that shares its name"""
+    return [
+        File(
+            f"{name}/pipelines/nodes.py",
+            """\
+            from kedro.pipeline import node
+            from .functions import PROJECT
+
+            nodes = [node(lambda x: x, "a", "b", name=PROJECT)]
+            """,
+        ),
+        File(f"{name}/pipelines/functions.py", f"PROJECT = {name!r}\n"),
+    ]
+
+
+def node_names(directory):
+    pipelines = find_kedro(directory=directory)
+    return [n.name for n in pipelines["__default__"].nodes]
+
+
+def test_projects_do_not_share_modules_across_threads(tmpdir, monkeypatch):
+    make_files_and_cd(tmpdir, project("first") + project("second"))
+
+    def fail(path):
+        raise AssertionError("working directory changed")
+
+    monkeypatch.setattr(os, "chdir", fail)
+    directories = ["first", "second"] * 8
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(node_names, directories))
+    assert results == [[directory] for directory in directories]
+
+
+def relative_project():
+    """a pipeline importing a nodes module that takes a moment to execute"""
+    return [
+        File(
+            "pipelines/nodes.py",
+            """\
+            import time
+
+            from kedro.pipeline import node
+
+            time.sleep(0.01)
+
+
+            def f(x):
+                return x
+
+
+            nodes = [node(f, "a", "b", name="f")]
+            """,
+        ),
+        File(
+            "pipelines/pipeline.py",
+            """\
+            from kedro.pipeline import Pipeline, node
+
+            from .nodes import f
+
+            pipeline = Pipeline([node(f, "b", "c", name="g")])
+            """,
+        ),
+    ]
+
+
+def test_same_project_discovered_from_several_threads(tmpdir):
+    make_files_and_cd(tmpdir, relative_project())
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: node_names("."), range(40)))
+    assert all(sorted(names) == ["f", "g"] for names in results)
+
+
+def test_modules_without_a_package_are_not_registered(tmpdir):
+    make_files_and_cd(tmpdir, [File("dotted.dir/nodes.py", "nodes = []\n")])
+    before = set(sys.modules)
+    find_kedro(directory=".")
+    assert "nodes.py" not in set(sys.modules) - before
+
+
+def test_modules_are_freed_with_the_result(tmpdir):
+    make_files_and_cd(tmpdir, relative_project())
+    before = set(sys.modules)
+    pipelines = find_kedro(directory=".")
+    added = [sys.modules[name] for name in set(sys.modules) - before]
+    assert all(hasattr(module, "__path__") for module in added)
+    function = weakref.ref(pipelines["pipelines.nodes"].nodes[0].func)
+    del pipelines
+    gc.collect()
+    assert function() is None
+
+
+def test_registries_only_release_their_own_modules(tmpdir):
+    make_files_and_cd(tmpdir, project("first"))
+    first, second = ModuleRegistry(), ModuleRegistry()
+    module = _import(Path("first/pipelines/nodes.py"), Path("first"), modules=second)
+    helper = f"{module.__name__.rpartition('.')[0]}.functions"
+    first.release_all()
+    assert sys.modules[module.__name__] is module
+    assert helper in sys.modules
+    second.release_all()
+    assert module.__name__ not in sys.modules
+    assert helper not in sys.modules
+
+
+def test_building_a_manifest_releases_its_modules(tmpdir):
+    make_files_and_cd(tmpdir, relative_project())
+    before = set(sys.modules)
+    build_manifest(directory=".")
+    added = [sys.modules[name] for name in set(sys.modules) - before]
+    assert all(hasattr(module, "__path__") for module in added)
+
+
+def test_sys_path_is_restored(tmpdir):
+    make_files_and_cd(tmpdir, project("first"))
+    before = list(sys.path)
+    node_names("first")
+    node_names("first")
+    assert sys.path == before
+
+
+def test_scoped_sys_path_shares_and_keeps_entries(tmpdir):
+    entry = str(tmpdir)
+    with _scoped_sys_path(entry):
+        with _scoped_sys_path(entry):
+            assert sys.path.count(entry) == 1
+        assert entry in sys.path
+    assert entry not in sys.path
+
+    sys.path.append(entry)
+    try:
+        with _scoped_sys_path(entry):
+            pass
+        assert entry in sys.path
+    finally:
+        sys.path.remove(entry)
+
+
+def counted_project():
+    """a pipeline that imports its nodes module before discovery reaches it"""
+    return [
+        File(
+            "pipelines/nodes.py",
+            """\
+            from pathlib import Path
+            from kedro.pipeline import node
+
+            with open(Path(__file__).with_name("executions.txt"), "a") as log:
+                log.write(__name__ + "\\n")
+
+            nodes = [node(lambda x: x, "a", "b", name="first")]
+            """,
+        ),
+        File(
+            "pipelines/data_pipeline.py",
+            """\
+            from kedro.pipeline import Pipeline
+            from .nodes import nodes
+
+            pipeline = Pipeline(nodes)
+            """,
+        ),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [None, 2])
+def test_each_file_is_executed_once(tmpdir, jobs):
+    make_files_and_cd(tmpdir, counted_project())
+    profile = Profile()
+    pipelines = find_kedro(directory=".", jobs=jobs, backend="thread", profile=profile)
+    assert tmpdir.join("pipelines/executions.txt").read().count("\n") == 1
+    assert [n.name for n in pipelines["__default__"].nodes] == ["first"]
+    assert profile.duplicates == {}
+
+
+def test_files_executed_more_than_once_are_reported(tmpdir):
+    nodes, _ = counted_project()
+    make_files_and_cd(
+        tmpdir,
+        [
+            File("duplicated/__init__.py", ""),
+            File("duplicated/nodes.py", nodes.contents),
+            File("duplicated/data_pipeline.py", "from duplicated.nodes import nodes\n"),
+        ],
+    )
+    profile = Profile()
+    try:
+        find_kedro(directory=".", profile=profile)
+    finally:
+        for name in [name for name in sys.modules if name.startswith("duplicated")]:
+            del sys.modules[name]
+    assert tmpdir.join("duplicated/executions.txt").read().count("\n") == 2
+    ((file, names),) = profile.duplicates.items()
+    assert file == os.path.realpath(str(tmpdir.join("duplicated/nodes.py")))
+    assert "duplicated.nodes" in names
+    assert "executed more than once" in profile.format()
@@ -0,0 +1,108 @@
+"""
+tests the lazy pipeline mapping returned by find_kedro(lazy=True)
+"""
+import gc
+import sys
+
+import pytest
+
+from find_kedro import find_kedro
+from find_kedro.lazy import LazyPipelines
+from util import File, make_files_and_cd
+
+files = [
+    File(
+        "pipelines/de/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "a", "b", name="a_b")]
+        """,
+    ),
+    File(
+        "pipelines/ds/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "b", "c", name="b_c")]
+        raise RuntimeError("ds should only be imported when requested")
+        """,
+    ),
+    File(
+        "pipelines/ds/pipeline.py",
+        """\
+        pipeline_helpers = None
+        """,
+    ),
+]
+
+
+def test_lazy_keys_do_not_import(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    pipelines = find_kedro(directory="pipelines", lazy=True)
+    assert isinstance(pipelines, LazyPipelines)
+    assert list(pipelines) == ["de.nodes", "ds.nodes", "ds.pipeline", "__default__"]
+    assert "ds.nodes" in pipelines
+    assert pipelines.loaded == []
+
+
+def test_lazy_imports_only_requested_module(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    pipelines = find_kedro(directory="pipelines", lazy=True)
+    assert [n.name for n in pipelines["de.nodes"].nodes] == ["a_b"]
+    assert pipelines["de.nodes"] is pipelines["de.nodes"]
+    assert pipelines["ds.pipeline"].nodes == []
+    assert pipelines.loaded == ["de.nodes", "ds.pipeline"]
+    with pytest.raises(KeyError):
+        pipelines["missing"]
+
+
+def test_lazy_default_imports_everything(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    pipelines = find_kedro(directory="pipelines", lazy=True)
+    with pytest.raises(RuntimeError):
+        pipelines["__default__"]
+
+
+def test_lazy_matches_eager(tmpdir):
+    make_files_and_cd(tmpdir, files[:1] + files[2:])
+    eager = find_kedro(directory="pipelines")
+    lazy = find_kedro(directory="pipelines", lazy=True)
+    for key in eager:
+        assert eager[key].nodes == lazy[key].nodes
+
+
+def test_lazy_modules_are_released(tmpdir):
+    make_files_and_cd(tmpdir, files[:1] + files[2:])
+    before = set(sys.modules)
+
+    def added():
+        modules = [sys.modules[name] for name in set(sys.modules) - before]
+        return [module for module in modules if not hasattr(module, "__path__")]
+
+    pipelines = find_kedro(directory="pipelines", lazy=True)
+    pipelines["de.nodes"]
+    assert len(added()) == 1
+    del pipelines
+    gc.collect()
+    assert added() == []
+
+    pipelines = find_kedro(directory="pipelines", lazy=True)
+    pipelines["__default__"]
+    assert added() == []
+
+
+@pytest.mark.parametrize(
+    "option",
+    [{"import_budget": 1.0}, {"import_timeout": 1.0}, {"quarantine": "slow.json"}],
+)
+def test_lazy_rejects_options_that_import_up_front(tmpdir, option):
+    make_files_and_cd(tmpdir, files)
+    with pytest.raises(ValueError):
+        find_kedro(directory="pipelines", lazy=True, **option)
+
+
+def test_lazy_prints_profile(tmpdir, capsys):
+    make_files_and_cd(tmpdir, files)
+    find_kedro(directory="pipelines", lazy=True, profile=True)
+    assert "walk" in capsys.readouterr().err
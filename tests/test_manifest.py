@@ -0,0 +1,168 @@
+"""
+tests building discovery manifests and loading pipelines from them
+"""
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from find_kedro import find_kedro
+from find_kedro.cli import cli
+from find_kedro.manifest import build_manifest, write_manifest
+from util import File, make_files_and_cd
+
+files = [
+    File(
+        "pipelines/de/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [node(lambda x: x, "a", "b", name="a_b")]
+        node_helpers = None
+        """,
+    ),
+    File(
+        "pipelines/ds/pipeline.py",
+        """\
+        from kedro.pipeline import Pipeline, node
+
+        def create_pipeline(**kwargs):
+            return Pipeline([node(lambda x: x, "b", "c", name="b_c")])
+        """,
+    ),
+    File(
+        "pipelines/ds/nodes_helpers.py",
+        """\
+        import json
+        """,
+    ),
+]
+
+
+def names(pipelines):
+    return {key: [n.name for n in p.nodes] for key, p in pipelines.items()}
+
+
+def no_walk(*args, **kwargs):
+    raise AssertionError("the tree was walked")
+
+
+def build(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    write_manifest(build_manifest(directory="pipelines"), "manifest.json")
+    return json.loads(Path("manifest.json").read_text())
+
+
+def test_build_manifest(tmpdir):
+    manifest = build(tmpdir)
+    assert manifest["modules"] == [
+        {"key": "de.nodes", "file": "de/nodes.py", "attributes": ["nodes"]},
+        {
+            "key": "ds.pipeline",
+            "file": "ds/pipeline.py",
+            "attributes": ["create_pipeline"],
+        },
+    ]
+    assert sorted(manifest["hashes"]) == [
+        "de/nodes.py",
+        "ds/nodes_helpers.py",
+        "ds/pipeline.py",
+    ]
+
+
+def test_manifest_only_imports_listed_modules(tmpdir, monkeypatch):
+    build(tmpdir)
+    monkeypatch.setattr("find_kedro.core._walk_files", no_walk)
+    monkeypatch.setattr("find_kedro.discovery._walk_files", no_walk)
+    pipelines = find_kedro(directory="pipelines", manifest="manifest.json")
+    assert names(pipelines) == {
+        "de.nodes": ["a_b"],
+        "ds.pipeline": ["b_c"],
+        "__default__": ["a_b", "b_c"],
+    }
+
+
+def test_stale_manifest_falls_back(tmpdir, caplog):
+    build(tmpdir)
+    Path("pipelines/ds/nodes_helpers.py").write_text(
+        "from kedro.pipeline import node\n"
+        "nodes = [node(lambda x: x, 'c', 'd', name='c_d')]\n"
+    )
+    pipelines = find_kedro(directory="pipelines", manifest="manifest.json")
+    assert names(pipelines)["ds.nodes_helpers"] == ["c_d"]
+    assert "stale" in caplog.text
+
+
+counting_file = File(
+    "pipelines/nodes.py",
+    """\
+    import os
+
+    from kedro.pipeline import node
+
+    with open("runs.txt", "a") as runs:
+        runs.write("run\\n")
+    nodes = [node(lambda x: x, "x", "y", name="x_y")]
+    if os.path.exists("flag"):
+        flagged_nodes = [node(lambda x: x, "y", "z", name="y_z")]
+    """,
+)
+
+
+def runs():
+    return len(Path("runs.txt").read_text().splitlines())
+
+
+def test_missing_attributes_do_not_fall_back(tmpdir, caplog, monkeypatch):
+    make_files_and_cd(tmpdir, [counting_file])
+    Path("flag").write_text("")
+    write_manifest(build_manifest(directory="pipelines"), "manifest.json")
+    Path("flag").unlink()
+    monkeypatch.setattr("find_kedro.core._walk_files", no_walk)
+    pipelines = find_kedro(directory="pipelines", manifest="manifest.json")
+    assert names(pipelines)["nodes"] == ["x_y"]
+    assert runs() == 2
+    assert "flagged_nodes" in caplog.text
+
+
+def test_manifest_is_checked_before_importing(tmpdir, caplog):
+    make_files_and_cd(tmpdir, [counting_file, *files])
+    manifest = build_manifest(directory="pipelines")
+    del manifest["hashes"]["de/nodes.py"]
+    write_manifest(manifest, "manifest.json")
+    pipelines = find_kedro(directory="pipelines", manifest="manifest.json")
+    assert "de.nodes" in pipelines
+    assert runs() == 2
+    assert "no hashes" in caplog.text
+
+    Path("manifest.json").write_text(json.dumps({"version": 1, "modules": [{}]}))
+    find_kedro(directory="pipelines", manifest="manifest.json")
+    assert runs() == 3
+    assert "malformed" in caplog.text
+
+
+def test_missing_manifest_or_other_patterns_fall_back(tmpdir):
+    build(tmpdir)
+    expected = names(find_kedro(directory="pipelines"))
+    assert names(find_kedro(directory="pipelines", manifest="missing.json")) == (
+        expected
+    )
+    assert names(
+        find_kedro(directory="pipelines", patterns=["nodes"], manifest="manifest.json")
+    ) == {"de.nodes": ["a_b"], "__default__": ["a_b"]}
+
+
+def test_cli_manifest_build(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["manifest", "build", "-d", "pipelines", "-o", "manifest.json"]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(json.loads(Path("manifest.json").read_text())["modules"]) == 2
+
+    result = runner.invoke(
+        cli, ["-d", "pipelines", "--manifest", "manifest.json", "--format", "counts"]
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output == "__default__\t2\nde.nodes\t1\nds.pipeline\t1\n"
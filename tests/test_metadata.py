@@ -0,0 +1,93 @@
+"""
+tests the columnar node table returned by find_kedro_metadata
+"""
+import pickle
+
+import pytest
+
+from find_kedro import NodeTable, find_kedro, find_kedro_metadata
+from find_kedro.metadata import FIELDS, node_table
+from util import File, make_files_and_cd
+
+files = [
+    File(
+        "pipelines/nodes.py",
+        """\
+        from functools import partial
+        from kedro.pipeline import node
+
+
+        def add(x, y=1):
+            return x + y
+
+
+        nodes = [
+            node(add, "raw", "clean", name="clean", tags=["b", "a"]),
+            node(partial(add, y=2), "clean", "model", name="model"),
+        ]
+        """,
+    ),
+    File(
+        "pipelines/pipeline.py",
+        """\
+        from kedro.pipeline import Pipeline, node
+
+        pipeline = Pipeline([node(len, "model", "report", name="report")])
+        """,
+    ),
+]
+
+
+def test_records(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    table = find_kedro_metadata(directory=".")
+    assert isinstance(table, NodeTable)
+    assert len(table) == 3
+    clean, model, report = table
+    assert clean.module == "pipelines.nodes"
+    assert (clean.name, clean.inputs, clean.outputs) == ("clean", ("raw",), ("clean",))
+    assert clean.tags == ("a", "b")
+    assert clean.file == str(tmpdir.join("pipelines/nodes.py"))
+    assert clean.line == 5
+    assert (model.file, model.line) == (clean.file, 5)
+    assert report.module == "pipelines.pipeline"
+    assert (report.file, report.line) == (None, None)
+
+
+def test_columns_share_interned_names(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    table = find_kedro_metadata(directory=".")
+    assert table.outputs[0][0] is table.inputs[1][0]
+    assert table.column("module") == [
+        "pipelines.nodes",
+        "pipelines.nodes",
+        "pipelines.pipeline",
+    ]
+    assert table.modules == ["pipelines.nodes", "pipelines.pipeline"]
+    assert len(table.files) == 1
+    for field in FIELDS:
+        assert table.column(field) == [getattr(record, field) for record in table]
+
+
+def test_table_pickles(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    table = find_kedro_metadata(directory=".")
+    loaded = pickle.loads(pickle.dumps(table))
+    assert loaded == table
+    loaded.append("other", find_kedro(directory=".")["pipelines.pipeline"].nodes[0])
+    assert loaded.modules == ["pipelines.nodes", "pipelines.pipeline", "other"]
+
+
+def test_matches_process_backend(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    serial = find_kedro_metadata(directory=".")
+    pipelines = find_kedro(directory=".", jobs=2, backend="process")
+    deferred = node_table(pipelines)
+    assert deferred.column("name") == serial.column("name")
+    assert deferred.column("file")[0] == serial.column("file")[0]
+
+
+def test_lazy_is_rejected(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    with pytest.raises(ValueError):
+        find_kedro_metadata(directory=".", lazy=True)
@@ -0,0 +1,110 @@
+"""
+tests discovering pipelines from installed packages
+"""
+import sys
+import zipfile
+
+import pytest
+
+from find_kedro import find_kedro
+from util import File, make_files_and_cd
+
+
+def package_files(package):
+    return [
+        File(f"{package}/__init__.py", ""),
+        File(f"{package}/pipelines/__init__.py", ""),
+        File(
+            f"{package}/pipelines/data_science/__init__.py",
+            "",
+        ),
+        File(
+            f"{package}/pipelines/data_science/nodes.py",
+            f"""\
+            from kedro.pipeline import node
+
+            from {package}.pipelines.data_science.helpers import identity
+
+            nodes = [node(identity, "a", "b", name="train")]
+            """,
+        ),
+        File(
+            f"{package}/pipelines/data_science/helpers.py",
+            """\
+            def identity(x):
+                return x
+            """,
+        ),
+        File(
+            f"{package}/pipelines/legacy/__init__.py",
+            "raise ImportError('legacy is never imported when excluded')",
+        ),
+        File(
+            f"{package}/pipelines/legacy/nodes.py",
+            """\
+            from kedro.pipeline import node
+
+            nodes = [node(lambda x: x, "c", "d", name="old")]
+            """,
+        ),
+    ]
+
+
+@pytest.fixture
+def installed(tmpdir, monkeypatch):
+    """yields a function that installs a package in tmpdir, zipped or not"""
+
+    def install(package, zipped=False):
+        make_files_and_cd(tmpdir, package_files(package))
+        path = str(tmpdir)
+        if zipped:
+            path = str(tmpdir.join(f"{package}.zip"))
+            with zipfile.ZipFile(path, "w") as archive:
+                for file in package_files(package):
+                    archive.write(str(tmpdir.join(file.name)), file.name)
+            tmpdir.join(package).remove()
+        monkeypatch.syspath_prepend(path)
+        return package
+
+    yield install
+    for name in list(sys.modules):
+        if name.startswith("installed_"):
+            del sys.modules[name]
+
+
+def test_discovers_package_modules(installed):
+    package = installed("installed_plain")
+    pipelines = find_kedro(
+        package=f"{package}.pipelines", exclude=["legacy"], directory="/nowhere"
+    )
+    assert sorted(pipelines) == ["__default__", "data_science.nodes"]
+    assert pipelines["data_science.nodes"].nodes[0].func(1) == 1
+
+
+def test_keys_match_walking_the_source_directory(installed):
+    package = installed("installed_walked")
+    pipelines = find_kedro(package=f"{package}.pipelines", exclude=["legacy"])
+    walked = find_kedro(directory=f"{package}/pipelines", exclude=["legacy"])
+    assert sorted(pipelines) == sorted(walked)
+
+
+def test_discovers_zipped_packages(installed):
+    package = installed("installed_zipped", zipped=True)
+    pipelines = find_kedro(package=f"{package}.pipelines", include=["data_science/**"])
+    assert sorted(pipelines) == ["__default__", "data_science.nodes"]
+    assert ".zip" in pipelines["data_science.nodes"].nodes[0].func.__code__.co_filename
+
+
+def test_rejects_modules(installed):
+    package = installed("installed_module")
+    with pytest.raises(ValueError):
+        find_kedro(package=f"{package}.pipelines.data_science.nodes")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"lazy": True}, {"import_timeout": 1}, {"quarantine": "quarantine.json"}],
+)
+def test_rejects_options_walking_directories(options):
+    with pytest.raises(ValueError):
+        find_kedro(package="json", **options)
@@ -0,0 +1,111 @@
+"""
+tests that discovery with worker processes or threads matches serial discovery
+"""
+import json
+import os
+import textwrap
+
+import pytest
+from click.testing import CliRunner
+
+from find_kedro import find_kedro
+from find_kedro.cli import cli
+from find_kedro.parallel import DeferredFunction
+from test_nodes_types import contents
+
+
+def describe(pipelines):
+    return {
+        key: [(n.name, n.inputs, n.outputs, sorted(n.tags)) for n in p.nodes]
+        for key, p in pipelines.items()
+    }
+
+
+@pytest.mark.parametrize("name, num_nodes, content", contents)
+def test_parallel_matches_serial(tmpdir, name, num_nodes, content):
+    p = tmpdir.mkdir("nodes").join(f"{ name }.py")
+    p.write(textwrap.dedent(content))
+    serial = find_kedro(directory=tmpdir)
+    parallel = find_kedro(directory=tmpdir, jobs=2)
+    assert describe(parallel) == describe(serial)
+    assert len(parallel["__default__"].nodes) == num_nodes
+
+
+@pytest.mark.parametrize("name, num_nodes, content", contents)
+def test_thread_backend_matches_serial(tmpdir, name, num_nodes, content):
+    p = tmpdir.mkdir("nodes").join(f"{ name }.py")
+    p.write(textwrap.dedent(content))
+    serial = find_kedro(directory=tmpdir)
+    threaded = find_kedro(directory=tmpdir, jobs=2, backend="thread")
+    assert describe(threaded) == describe(serial)
+
+
+def test_thread_backend_does_not_chdir(tmpdir, monkeypatch, capsys):
+    tmpdir.mkdir("nodes").join("nodes.py").write(textwrap.dedent(contents[0][2]))
+
+    def fail(path):
+        raise AssertionError("working directory changed")
+
+    monkeypatch.setattr(os, "chdir", fail)
+    pipelines = find_kedro(directory=tmpdir, jobs=2, backend="thread", verbose=True)
+    assert len(pipelines["__default__"].nodes) == 2
+    output = capsys.readouterr().out
+    assert "import time per phase" in output
+    assert "compile" in output
+
+
+def test_unknown_backend(tmpdir):
+    with pytest.raises(ValueError):
+        find_kedro(directory=tmpdir, jobs=2, backend="fibers")
+
+
+def test_deferred_function_runs(tmpdir):
+    tmpdir.mkdir("nodes").join("nodes.py").write(
+        textwrap.dedent(
+            """\
+            from kedro.pipeline import node
+
+            def add_one(x):
+                return x + 1
+
+            nodes = [node(add_one, "a", "b", name="a_b", tags=["t"])]
+            """
+        )
+    )
+    pipelines = find_kedro(directory=tmpdir, jobs=2)
+    (deferred_node,) = pipelines["nodes.nodes"].nodes
+    assert isinstance(deferred_node.func, DeferredFunction)
+    assert deferred_node.func.__name__ == "add_one"
+    assert deferred_node.tags == {"t"}
+    assert deferred_node.run({"a": 1}) == {"b": 2}
+
+
+def test_deferred_functions_run_the_current_source(tmpdir):
+    nodes = tmpdir.mkdir("nodes").join("nodes.py")
+    source = textwrap.dedent(
+        """\
+        from kedro.pipeline import node
+
+        def add(x):
+            return x + {}
+
+        nodes = [node(add, "a", "b", name="a_b")]
+        """
+    )
+    nodes.write(source.format(1))
+    first = find_kedro(directory=tmpdir, jobs=2)
+    assert first["__default__"].nodes[0].run({"a": 1}) == {"b": 2}
+    nodes.write(source.format(100))
+    stat = os.stat(nodes)
+    os.utime(nodes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = find_kedro(directory=tmpdir, jobs=2)
+    assert second["__default__"].nodes[0].run({"a": 1}) == {"b": 101}
+    assert first["__default__"].nodes[0].run({"a": 1}) == {"b": 101}
+
+
+def test_cli_jobs(tmpdir):
+    tmpdir.mkdir("nodes").join("nodes.py").write(textwrap.dedent(contents[0][2]))
+    tmpdir.chdir()
+    result = CliRunner().invoke(cli, ["--jobs", "2", "--preload", "json"])
+    assert result.exit_code == 0
+    assert len(json.loads(result.output)["__default__"]) == 2
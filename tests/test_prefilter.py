@@ -0,0 +1,145 @@
+"""
+tests the ast pre-filter that avoids importing modules without matching names
+"""
+from pathlib import Path
+
+import pytest
+
+from find_kedro import find_kedro
+from find_kedro.prefilter import module_names, prefilter_files
+from util import File, make_files_and_cd
+
+nodes_file = File(
+    "pipelines/nodes.py",
+    """\
+    from kedro.pipeline import node
+
+    nodes = [node(lambda x: x, "a", "b", name="a_b")]
+    """,
+)
+
+content = [
+    (
+        "helper without matching names",
+        False,
+        """\
+        from kedro.pipeline import node, Pipeline
+        import json
+
+        def helper(data):
+            nodes = data
+            return nodes
+        """,
+    ),
+    (
+        "matching assignment",
+        True,
+        """\
+        if True:
+            for nodes_a in range(1):
+                pass
+        """,
+    ),
+    (
+        "create_pipeline function",
+        True,
+        """\
+        def create_pipeline():
+            pass
+        """,
+    ),
+    (
+        "relative import",
+        True,
+        """\
+        from .nodes import nodes_list
+        """,
+    ),
+    (
+        "global declaration",
+        True,
+        """\
+        def build():
+            global nodes_global
+            nodes_global = []
+        """,
+    ),
+    (
+        "__all__",
+        True,
+        """\
+        __all__ = ["nodes_dynamic"]
+        """,
+    ),
+    (
+        "star import",
+        True,
+        """\
+        from json import *
+        """,
+    ),
+    (
+        "globals call",
+        True,
+        """\
+        globals()["nodes_dynamic"] = []
+        """,
+    ),
+    (
+        "syntax error",
+        True,
+        """\
+        def (
+        """,
+    ),
+]
+
+
+@pytest.mark.parametrize("name, imported, source", content)
+def test_prefilter_files(tmpdir, name, imported, source):
+    make_files_and_cd(tmpdir, [File("pipelines/node_helpers.py", source)])
+    keep, skipped = prefilter_files(
+        [Path("pipelines/node_helpers.py")], ["*node*", "*pipeline*"]
+    )
+    assert bool(keep) == imported, f"wrong decision for {name}"
+    assert bool(skipped) != imported
+
+
+def test_module_names(tmpdir):
+    make_files_and_cd(
+        tmpdir,
+        [
+            File(
+                "names.py",
+                """\
+                import os.path
+                import json as j
+                a, (b, c) = 1, (2, 3)
+
+                class D:
+                    e = 1
+                """,
+            )
+        ],
+    )
+    assert module_names(Path("names.py")) == {"os", "j", "a", "b", "c", "D"}
+
+
+def test_skipped_modules_are_not_imported(tmpdir):
+    make_files_and_cd(
+        tmpdir,
+        [
+            nodes_file,
+            File(
+                "pipelines/node_helpers.py",
+                """\
+                raise RuntimeError("helper modules should not be imported")
+                """,
+            ),
+        ],
+    )
+    pipelines = find_kedro(directory="pipelines")
+    assert list(pipelines) == ["nodes", "__default__"]
+
+    with pytest.raises(RuntimeError):
+        find_kedro(directory="pipelines", prefilter=False)
@@ -0,0 +1,92 @@
+"""
+tests the phase by phase report made with find_kedro(profile=...)
+"""
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from find_kedro import Profile, find_kedro
+from find_kedro.cli import cli
+from util import File, make_files_and_cd
+
+files = [
+    File(
+        "pipelines/de/nodes.py",
+        """\
+        import time
+        from kedro.pipeline import node
+
+        time.sleep(0.05)
+        nodes = [node(lambda x: x, "a", "b", name="a_b")]
+        """,
+    ),
+    File(
+        "pipelines/ds/nodes.py",
+        """\
+        from kedro.pipeline import node
+
+        nodes = [
+            node(lambda x: x, "b", "c", name="b_c"),
+            node(lambda x: x, "c", "d", name="c_d"),
+        ]
+        """,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"jobs": 2, "backend": "thread"}, {"jobs": 2}],
+    ids=["serial", "thread", "process"],
+)
+def test_profile_report(tmpdir, options):
+    make_files_and_cd(tmpdir, files)
+    profile = Profile(slowest=1)
+    find_kedro(directory="pipelines", profile=profile, **options)
+    report = profile.report()
+
+    assert {"walk", "prefilter", "import", "generation"} <= set(report["phases"])
+    assert all(set(times) == {"wall", "cpu"} for times in report["phases"].values())
+    assert report["nodes"] == 3
+    assert report["modules"]["de.nodes"]["nodes"] == 1
+    assert report["modules"]["ds.nodes"]["nodes"] == 2
+    assert [module["module"] for module in report["slowest"]] == ["de.nodes"]
+    assert report["slowest"][0]["import_time"] >= 0.05
+    assert report["pipeline_construction"] > 0
+
+
+def test_profile_true_prints_to_stderr(tmpdir, capsys):
+    make_files_and_cd(tmpdir, files)
+    find_kedro(directory="pipelines", profile=True)
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "pipeline construction" in captured.err
+    assert "de.nodes" in captured.err
+
+
+def test_prefiltered_files_are_reported(tmpdir):
+    make_files_and_cd(
+        tmpdir, files + [File("pipelines/de/nodes_helpers.py", "import json\n")]
+    )
+    profile = Profile()
+    find_kedro(directory="pipelines", profile=profile)
+    helpers = str(Path("pipelines", "de", "nodes_helpers.py"))
+    assert profile.report()["prefiltered"] == [helpers]
+    assert "prefilter skipped 1 files" in profile.format()
+    assert helpers in profile.format()
+
+
+def test_cli_profile_json(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    try:
+        runner = CliRunner(mix_stderr=False)
+    except TypeError:  # click 8.2 always keeps stderr separate
+        runner = CliRunner()
+    result = runner.invoke(
+        cli, ["--directory", "pipelines", "--profile", "--profile-format", "json"]
+    )
+    assert result.exit_code == 0
+    assert sorted(json.loads(result.stdout)) == ["__default__", "de.nodes", "ds.nodes"]
+    assert json.loads(result.stderr)["nodes"] == 3
@@ -0,0 +1,206 @@
+"""
+tests incremental re-discovery with PipelineRegistry and the file watchers
+"""
+import os
+import sys
+import time
+
+import pytest
+
+from find_kedro import PipelineRegistry
+from find_kedro.watch import InotifyWatcher, make_watcher
+from util import File, make_file, make_files_and_cd
+
+
+def nodes_file(name, *datasets):
+    nodes = "\n".join(
+        f'    node(lambda x: x, "{a}", "{b}", name="{a}_{b}"),'
+        for a, b in zip(datasets, datasets[1:])
+    )
+    return File(
+        name,
+        f"""\
+from kedro.pipeline import node
+
+nodes = [
+{nodes}
+]
+""",
+    )
+
+
+files = [
+    nodes_file("pipelines/de/nodes.py", "a", "b", "c"),
+    nodes_file("pipelines/ds/nodes.py", "c", "d"),
+]
+
+
+def names(pipeline):
+    return sorted(n.name for n in pipeline.nodes)
+
+
+def bump(tmpdir, file):
+    """rewrites file and moves its mtime forward so the change is always seen"""
+    path = make_file(tmpdir, file)
+    later = time.time() + 10
+    os.utime(str(path), (later, later))
+
+
+def test_initial_discovery(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    assert list(registry.pipelines) == ["de.nodes", "ds.nodes", "__default__"]
+    assert names(registry.pipelines["__default__"]) == ["a_b", "b_c", "c_d"]
+
+
+def test_refresh_reimports_only_changed_modules(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    before = registry.pipelines
+    assert not registry.refresh()
+
+    bump(tmpdir, nodes_file("pipelines/ds/nodes.py", "c", "d", "e"))
+    changes = registry.refresh()
+    assert changes.modified == ["ds.nodes"]
+    assert changes.created == changes.deleted == []
+    assert registry.pipelines["de.nodes"] is before["de.nodes"]
+    assert names(registry.pipelines["ds.nodes"]) == ["c_d", "d_e"]
+    assert names(registry.pipelines["__default__"]) == ["a_b", "b_c", "c_d", "d_e"]
+    # snapshots handed out earlier are never mutated
+    assert names(before["__default__"]) == ["a_b", "b_c", "c_d"]
+
+
+def test_refresh_created_and_deleted(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+
+    make_file(tmpdir, nodes_file("pipelines/ml/nodes.py", "x", "y"))
+    os.remove(str(tmpdir.join("pipelines/ds/nodes.py")))
+    changes = registry.refresh()
+    assert changes.created == ["ml.nodes"]
+    assert changes.deleted == ["ds.nodes"]
+    assert list(registry.pipelines) == ["de.nodes", "ml.nodes", "__default__"]
+    assert names(registry.pipelines["__default__"]) == ["a_b", "b_c", "x_y"]
+
+
+def test_shared_nodes_stay_in_default(tmpdir):
+    make_files_and_cd(
+        tmpdir, files + [nodes_file("pipelines/ds/more_nodes.py", "c", "d")]
+    )
+    registry = PipelineRegistry(directory="pipelines")
+    os.remove(str(tmpdir.join("pipelines/ds/nodes.py")))
+    registry.refresh()
+    assert names(registry.pipelines["__default__"]) == ["a_b", "b_c", "c_d"]
+
+
+def test_modules_importing_a_changed_module_are_reloaded(tmpdir):
+    def functions(step):
+        return File("pipelines/nodes.py", f"def add(x):\n    return x + {step}\n")
+
+    make_files_and_cd(
+        tmpdir,
+        [
+            functions(1),
+            File(
+                "pipelines/pipeline.py",
+                """\
+from kedro.pipeline import Pipeline, node
+
+from .nodes import add
+
+pipeline = Pipeline([node(add, "a", "b", name="add")])
+""",
+            ),
+        ],
+    )
+    registry = PipelineRegistry(directory="pipelines")
+    assert registry.pipelines["pipeline"].nodes[0].func(1) == 2
+
+    bump(tmpdir, functions(100))
+    changes = registry.refresh()
+    assert changes.modified == ["nodes", "pipeline"]
+    assert registry.pipelines["pipeline"].nodes[0].func(1) == 101
+    assert registry.pipelines["__default__"].nodes[0].func(1) == 101
+
+
+def test_default_keeps_the_nodes_of_unchanged_modules(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    kept = registry.pipelines["de.nodes"].nodes
+    bump(tmpdir, nodes_file("pipelines/ds/nodes.py", "c", "d"))
+    registry.refresh()
+    default = registry.pipelines["__default__"].nodes
+    assert [n for n in default if n.name != "c_d"] == kept
+    assert [n for n in default if n.name == "c_d"][0] is (
+        registry.pipelines["ds.nodes"].nodes[0]
+    )
+
+
+def test_failed_refresh_keeps_snapshot(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    before = registry.pipelines
+
+    bump(tmpdir, File("pipelines/ds/nodes.py", "nodes = [\n"))
+    with pytest.raises(SyntaxError):
+        registry.refresh()
+    assert registry.pipelines is before
+
+    bump(tmpdir, nodes_file("pipelines/ds/nodes.py", "c", "e"))
+    assert registry.refresh().modified == ["ds.nodes"]
+
+
+def test_failed_default_keeps_registry(tmpdir):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    before = registry.pipelines
+
+    # a node named like one in de.nodes cannot join `__default__`
+    make_file(
+        tmpdir,
+        File(
+            "pipelines/ml/nodes.py",
+            """\
+from kedro.pipeline import node
+
+nodes = [node(lambda x: x, "x", "y", name="a_b")]
+""",
+        ),
+    )
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            registry.refresh()
+        assert registry.pipelines is before
+
+    bump(tmpdir, nodes_file("pipelines/ml/nodes.py", "x", "y"))
+    assert registry.refresh().created == ["ml.nodes"]
+    assert names(registry.pipelines["__default__"]) == ["a_b", "b_c", "c_d", "x_y"]
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_watch_in_background(tmpdir, polling):
+    make_files_and_cd(tmpdir, files)
+    registry = PipelineRegistry(directory="pipelines")
+    registry.start(interval=0.05, polling=polling)
+    try:
+        time.sleep(0.2)
+        make_file(tmpdir, nodes_file("pipelines/ml/nodes.py", "x", "y"))
+        deadline = time.time() + 5
+        while "ml.nodes" not in registry.pipelines and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        registry.stop()
+    assert "ml.nodes" in registry.pipelines
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+def test_inotify_watcher(tmpdir):
+    watcher = make_watcher()
+    assert isinstance(watcher, InotifyWatcher)
+    try:
+        watcher.update([str(tmpdir)])
+        assert not watcher.wait(timeout=0.01)
+        tmpdir.join("nodes.py").write("")
+        assert watcher.wait(timeout=1)
+    finally:
+        watcher.close()
@@ -0,0 +1,71 @@
+"""
+tests that the cli starts without importing kedro or pygments
+
+Import times come from `python -X importtime`, which reports the time each
+module took to import in microseconds on stderr.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+import find_kedro
+
+HEAVY_PACKAGES = {"kedro", "pygments", "colorama"}
+
+# microseconds find_kedro.cli may take to import on top of click
+STARTUP_BUDGET = 50_000
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """cumulative import time in microseconds of every module code imports"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(find_kedro.__file__).parents[1]), env.get("PYTHONPATH", "")]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import find_kedro",
+        "from find_kedro.cli import cli; cli(['--version'])",
+        "from find_kedro.cli import cli; cli(['--help'])",
+    ],
+    ids=["import", "version", "help"],
+)
+def test_startup_does_not_import_heavy_packages(code):
+    imported = {module.split(".")[0] for module in import_times(code)}
+    assert imported & HEAVY_PACKAGES == set()
+
+
+def test_startup_budget():
+    times = import_times("import find_kedro.cli")
+    startup = times["find_kedro.cli"] - times.get("click", 0)
+    assert startup < STARTUP_BUDGET, f"find_kedro.cli took {startup}us to import"
+
+
+def test_names_are_imported_on_access():
+    from find_kedro.core import find_kedro as core_find_kedro
+
+    assert find_kedro.find_kedro is core_find_kedro
+    assert "PipelineRegistry" in dir(find_kedro)
+    with pytest.raises(AttributeError):
+        find_kedro.missing
@@ -0,0 +1,81 @@
+"""
+tests streaming discovery with iter_find_kedro
+"""
+import gc
+import sys
+import tracemalloc
+
+from find_kedro import find_kedro, iter_find_kedro
+from util import File, make_files_and_cd
+
+MODULES = 20
+PAYLOAD = 2_000_000
+
+
+def heavy_module(index):
+    """a module whose node function keeps a large module global alive"""
+    return File(
+        f"pipelines/nodes_{index}.py",
+        f"""\
+        from kedro.pipeline import node
+
+        payload = bytearray({PAYLOAD})
+
+
+        def f(x):
+            return len(payload)
+
+
+        nodes = [node(f, "in_{index}", "out_{index}", name="n{index}")]
+        """,
+    )
+
+
+def peak_memory(run):
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def test_yields_module_pipelines_in_file_order(tmpdir):
+    make_files_and_cd(tmpdir, [heavy_module(index) for index in range(3)])
+    streamed = list(iter_find_kedro(directory="."))
+    pipelines = find_kedro(directory=".")
+    assert [key for key, _ in streamed] == sorted(pipelines)[1:]
+    for key, pipeline in streamed:
+        assert pipeline.nodes == pipelines[key].nodes
+        assert pipeline.nodes[0].func(None) == PAYLOAD
+
+
+def test_released_modules_leave_sys_modules(tmpdir):
+    make_files_and_cd(tmpdir, [heavy_module(0)])
+    before = set(sys.modules)
+    list(iter_find_kedro(directory="."))
+    assert not [name for name in set(sys.modules) - before if "nodes_0" in name]
+    list(iter_find_kedro(directory=".", keep_modules=True))
+    assert [name for name in set(sys.modules) - before if "nodes_0" in name]
+
+
+def test_peak_memory_is_bounded(tmpdir):
+    make_files_and_cd(tmpdir, [heavy_module(index) for index in range(MODULES)])
+    before = set(sys.modules)
+
+    def stream():
+        for key, pipeline in iter_find_kedro(directory="."):
+            assert pipeline.nodes[0].func(None) == PAYLOAD
+            # module globals reference themselves through their functions
+            del pipeline
+            gc.collect()
+
+    try:
+        streamed = peak_memory(stream)
+        whole = peak_memory(lambda: find_kedro(directory="."))
+    finally:
+        for name in set(sys.modules) - before:
+            del sys.modules[name]
+    assert whole > MODULES * PAYLOAD
+    assert streamed < 3 * PAYLOAD